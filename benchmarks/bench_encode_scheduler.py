@@ -0,0 +1,76 @@
+"""
+Durchsatz-Benchmark für den EncodeScheduler.
+
+Simuliert N gleichzeitige Sessions, die jeweils einzelne Texte encoden
+(wie verb_to_command / match_entities bei Cache-Misses). Verglichen wird
+ein model.encode() pro Text mit dem Micro-Batching über den Scheduler.
+Die Texte sind eindeutig, der EmbeddingCache spielt keine Rolle.
+
+Aufruf (aus dem Repo-Root):
+    python benchmarks/bench_encode_scheduler.py [--sessions 1,2,4,8,16]
+        [--per-session 64] [--max-batch-size 64] [--max-wait-ms 2]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+os.environ.setdefault('HF_HUB_OFFLINE', '1')
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.embedding_utils import EmbeddingUtils
+from utils.encode_scheduler import EncodeScheduler
+
+WORDS = ['Fackel', 'Taverne', 'Schlüssel', 'Truhe', 'Buch', 'Wirt', 'Hammer', 'Schwert', 'Beutel', 'Markt']
+
+
+def session_texts(session, count):
+    """Eindeutige kurze Texte pro Session."""
+    return [f"{WORDS[i % len(WORDS)]} {session}-{i}" for i in range(count)]
+
+
+def run_sessions(encode_one, sessions, per_session):
+    """Startet `sessions` Threads, die je `per_session` Texte einzeln encoden → Texte/s."""
+    def session(n):
+        for text in session_texts(n, per_session):
+            encode_one(text)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        list(pool.map(session, range(sessions)))
+    return sessions * per_session / (time.perf_counter() - start)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--sessions', default='1,2,4,8,16')
+    arg_parser.add_argument('--per-session', type=int, default=64)
+    arg_parser.add_argument('--max-batch-size', type=int, default=64)
+    arg_parser.add_argument('--max-wait-ms', type=float, default=2)
+    args = arg_parser.parse_args()
+
+    utils = EmbeddingUtils()
+    utils.warm_up()
+
+    print(f"max_batch_size: {args.max_batch_size}  max_wait_ms: {args.max_wait_ms}  Texte/Session: {args.per_session}")
+    print(f"{'Sessions':>8}{'einzeln/s':>12}{'Batch/s':>12}{'Faktor':>8}{'Ø Batch':>9}{'max Queue':>11}")
+
+    for sessions in (int(s) for s in args.sessions.split(',')):
+        single = run_sessions(lambda text: utils._encode_batch([text]), sessions, args.per_session)
+
+        scheduler = EncodeScheduler(utils._encode_batch, args.max_batch_size, args.max_wait_ms)
+        batched = run_sessions(lambda text: scheduler.encode([text]), sessions, args.per_session)
+        scheduler.close()
+
+        stats = scheduler.stats()
+        print(
+            f"{sessions:>8}{single:>12.1f}{batched:>12.1f}{batched / single:>7.1f}x"
+            f"{stats['avg_batch_size']:>9.1f}{stats['max_queue_depth']:>11}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,239 @@
+"""
+Genauigkeit, Latenz und Speicher der Encoder-Backends (torch/onnx/int8).
+
+Jedes Backend läuft in einem eigenen Prozess (EMBEDDING_BACKEND, eigener
+leerer Embedding-Cache), damit RSS und Ladezeit nicht vermischt werden.
+Auf einem festen Korpus wird geprüft, ob die Entscheidungen des Spiels
+gleich bleiben:
+    - Verb → Command: Commands mit sim >= 0.95 (GameController._good_commands)
+    - Noun → Entity: Entities mit sim >= 0.75 (GameController._handle_match)
+Nouns werden zweimal gematcht: gegen Entity-Vektoren des Backends selbst
+(Welt-Datei ohne Embeddings) und gegen die Vektoren des Referenz-Backends
+(wie in Neo4j gespeicherte torch-Embeddings). Exit-Code 1, wenn ein
+Backend eine Entscheidung der Referenz ändert.
+
+Aufruf (aus dem Repo-Root):
+    python benchmarks/bench_encoder_backends.py [--backends torch,onnx,int8]
+        [--repeat 200] [--out backends.json]
+"""
+
+import os
+
+os.environ.setdefault('HF_HUB_OFFLINE', '1')
+os.environ.setdefault('TRANSFORMERS_OFFLINE', '1')
+os.environ.setdefault('CUDA_VISIBLE_DEVICES', '')
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+WORLD_FILE = os.path.join(os.path.dirname(__file__), '..', 'worlds', 'example.json')
+
+COMMAND_THRESHOLD = 0.95
+TARGET_THRESHOLD = 0.75
+
+# Verben aus dem Parser: Template-Formen, freie Formen und Verben ohne Command
+VERB_CORPUS = [
+    'nehmen', 'nimm', 'geh', 'gehe', 'lauf', 'heb auf', 'leg ab', 'lass fallen',
+    'schnapp', 'nimmt', 'gehst', 'rennt', 'hebt auf', 'wirf weg', 'pack ein', 'steck ein',
+    'untersuche', 'lies', 'rede', 'schau', 'benutze',
+    'essen', 'schlafen', 'springen', 'kaufen', 'singen',
+]
+
+# Zusätzliche Nouns ohne passende Entity
+NOUN_MISSES = ['Apfel', 'Pferd', 'Brunnen', 'Laterne', 'Stuhl']
+
+
+def world_entities():
+    """Locations, Items und NPCs der Beispielwelt mit Namen und Synonymen."""
+    with open(WORLD_FILE, encoding='utf-8') as f:
+        world = json.load(f)
+    return [
+        {'id': node['id'], 'name': node['properties']['name'], 'synonyms': node['properties'].get('synonyms') or []}
+        for node in world['nodes']
+        if 'Player' not in node['labels']
+    ]
+
+
+def noun_corpus(entities):
+    """Namen, Synonyme, IDs und ein paar Nouns ohne Treffer."""
+    nouns = []
+    for entity in entities:
+        nouns.extend([entity['name'], entity['id'], *entity['synonyms']])
+    nouns.extend(NOUN_MISSES)
+    return list(dict.fromkeys(nouns))
+
+
+def rss_mb():
+    """Peak RSS des Prozesses in MB (Linux: ru_maxrss in KB)."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentiles(times):
+    times = np.array(times)
+    return {'median_ms': float(np.median(times)), 'p95_ms': float(np.percentile(times, 95))}
+
+
+def match_nouns(utils, entities, nouns):
+    """Noun → Entity-IDs mit sim >= TARGET_THRESHOLD, gegen alle Entities als Kandidaten."""
+    ids = [entity['id'] for entity in entities]
+    result = {}
+    for noun in nouns:
+        hits = utils.entity_index.search(utils.encode(noun), ids, fields=('name_emb', 'synonyms_emb'))
+        result[noun] = sorted(entity_id for entity_id, sim in hits if sim >= TARGET_THRESHOLD)
+    return result
+
+
+def worker(backend, workdir, repeat):
+    """Misst ein Backend im aktuellen Prozess und gibt das Ergebnis als JSON aus."""
+    start = time.perf_counter()
+    from utils.embedding_utils import EmbeddingUtils
+
+    utils = EmbeddingUtils()
+    utils.warm_up()
+    load_s = time.perf_counter() - start
+    rss_loaded = rss_mb()
+
+    # Verb → Command
+    verbs = {}
+    for verb in VERB_CORPUS:
+        # am Lexikon vorbei, sonst wären Template-Verben in jedem Backend gleich
+        commands = utils._rank_commands(utils.encode(verb))
+        verbs[verb] = {
+            'good': sorted(c['command'] for c in commands if c['sim'] >= COMMAND_THRESHOLD),
+            'top_sim': commands[0]['sim'] if commands else 0.0,
+        }
+
+    # Noun → Entity, Entity-Vektoren aus diesem Backend
+    entities = world_entities()
+    nouns = noun_corpus(entities)
+    name_embs = utils.encode([entity['name'] for entity in entities])
+    synonym_embs = utils.encode([', '.join(entity['synonyms']) or entity['name'] for entity in entities])
+    for entity, name_emb, synonym_emb in zip(entities, name_embs, synonym_embs):
+        utils.entity_index.upsert(entity['id'], {
+            'name_emb': name_emb,
+            'synonyms_emb': synonym_emb if entity['synonyms'] else None,
+        })
+    noun_matches = match_nouns(utils, entities, nouns)
+
+    # Noun → Entity, Entity-Vektoren der Referenz (wie in der DB gespeichert)
+    reference_path = os.path.join(workdir, 'reference_entities.npz')
+    if os.path.exists(reference_path):
+        reference = np.load(reference_path)
+        for i, entity in enumerate(entities):
+            utils.entity_index.upsert(entity['id'], {
+                'name_emb': reference['names'][i],
+                'synonyms_emb': reference['synonyms'][i] if entity['synonyms'] else None,
+            })
+        noun_matches_db = match_nouns(utils, entities, nouns)
+    else:
+        np.savez(reference_path, names=name_embs, synonyms=synonym_embs)
+        noun_matches_db = noun_matches
+
+    # Latenz am Cache vorbei: einzelne Texte und ein 32er Batch
+    texts = [f"{VERB_CORPUS[i % len(VERB_CORPUS)]} {i}" for i in range(repeat)]
+    single = []
+    for text in texts:
+        t = time.perf_counter()
+        utils._encode_batch([text])
+        single.append((time.perf_counter() - t) * 1000)
+    batch = []
+    for i in range(0, max(len(texts) - 32, 1), 32):
+        t = time.perf_counter()
+        utils._encode_batch(texts[i:i + 32])
+        batch.append((time.perf_counter() - t) * 1000)
+
+    print(json.dumps({
+        'backend': backend,
+        'load_s': load_s,
+        'rss_loaded_mb': rss_loaded,
+        'rss_peak_mb': rss_mb(),
+        'encode_1': percentiles(single),
+        'encode_32': percentiles(batch),
+        'verbs': verbs,
+        'nouns': noun_matches,
+        'nouns_db': noun_matches_db,
+    }))
+
+
+def run_backend(backend, workdir, repeat):
+    """Startet den Worker-Prozess für ein Backend."""
+    env = dict(os.environ, EMBEDDING_BACKEND=backend, EMBEDDING_CACHE_DIR=os.path.join(workdir, backend))
+    completed = subprocess.run(
+        [sys.executable, __file__, '--worker', backend, '--workdir', workdir, '--repeat', str(repeat)],
+        env=env, capture_output=True, text=True,
+    )
+    if completed.returncode != 0:
+        print(f"{backend}: fehlgeschlagen\n{completed.stderr.strip().splitlines()[-1] if completed.stderr else ''}")
+        return None
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def diff_decisions(reference, result):
+    """Anzahl geänderter Entscheidungen pro Stufe + Beispiele."""
+    verbs = [v for v in reference['verbs'] if reference['verbs'][v]['good'] != result['verbs'][v]['good']]
+    nouns = [n for n in reference['nouns'] if reference['nouns'][n] != result['nouns'][n]]
+    nouns_db = [n for n in reference['nouns'] if reference['nouns'][n] != result['nouns_db'][n]]
+    max_sim_diff = max(
+        abs(reference['verbs'][v]['top_sim'] - result['verbs'][v]['top_sim']) for v in reference['verbs']
+    )
+    return {'verbs': verbs, 'nouns': nouns, 'nouns_db': nouns_db, 'max_verb_sim_diff': max_sim_diff}
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--backends', default='torch,onnx,int8', help='Erstes Backend ist die Referenz')
+    arg_parser.add_argument('--repeat', type=int, default=200)
+    arg_parser.add_argument('--out', default=None, help='Ergebnisse als JSON speichern')
+    arg_parser.add_argument('--worker', default=None, help=argparse.SUPPRESS)
+    arg_parser.add_argument('--workdir', default=None, help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.worker:
+        worker(args.worker, args.workdir, args.repeat)
+        return
+
+    with tempfile.TemporaryDirectory(prefix='ragventure-backends-') as workdir:
+        results = [run_backend(backend, workdir, args.repeat) for backend in args.backends.split(',')]
+    results = [r for r in results if r is not None]
+    if not results:
+        sys.exit(1)
+
+    reference = results[0]
+    print(f"Referenz: {reference['backend']}  Verben: {len(reference['verbs'])}  Nouns: {len(reference['nouns'])}")
+    print(f"{'Backend':<8}{'Laden s':>9}{'RSS MB':>9}{'Peak MB':>9}{'1er ms':>9}{'p95':>8}{'32er ms':>9}"
+          f"{'Verben Δ':>10}{'Nouns Δ':>9}{'DB Δ':>6}{'max Δsim':>10}")
+
+    changed = False
+    for result in results:
+        diff = diff_decisions(reference, result)
+        result['diff'] = diff
+        changed |= bool(diff['verbs'] or diff['nouns'] or diff['nouns_db'])
+        print(
+            f"{result['backend']:<8}{result['load_s']:>9.2f}{result['rss_loaded_mb']:>9.0f}{result['rss_peak_mb']:>9.0f}"
+            f"{result['encode_1']['median_ms']:>9.2f}{result['encode_1']['p95_ms']:>8.2f}{result['encode_32']['median_ms']:>9.2f}"
+            f"{len(diff['verbs']):>10}{len(diff['nouns']):>9}{len(diff['nouns_db']):>6}{diff['max_verb_sim_diff']:>10.4f}"
+        )
+        for label in ('verbs', 'nouns', 'nouns_db'):
+            for text in diff[label]:
+                print(f"    {label}: '{text}'")
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+
+    if changed:
+        print('Entscheidungen geändert!')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Durchsatz-Benchmark für SmartParserUtils.parse / parse_many.
+
+Misst Dokumente pro Sekunde für einzelnes Parsen (ein parse() pro Input)
+und für parse_many über nlp.pipe mit verschiedenen Batch-Größen. Mit
+--tiers lässt sich eine einzelne Stufe messen (z.B. nur den Transformer).
+
+Aufruf (aus dem Repo-Root):
+    python benchmarks/bench_parser.py [--tiers trf] [--file commands.txt]
+        [--batch-sizes 1,8,32,128] [--n-process 1] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from utils.smart_parser import SmartParserUtils
+
+COMMANDS = [
+    'nimm die Fackel', 'geh zur Taverne', 'leg den Schlüssel ab', 'untersuche die Truhe',
+    'lies das Buch', 'rede mit dem Wirt', 'schau dir den Hammer an', 'heb das Schwert auf',
+    'benutze den Schlüssel', 'lass die Fackel fallen', 'gehe zum Marktplatz', 'schnapp dir den Beutel',
+]
+
+
+def load_texts(path, size):
+    """Liest Inputs aus einer Datei (eine Zeile = ein Input) oder nimmt COMMANDS."""
+    if path:
+        with open(path, encoding='utf-8') as f:
+            texts = [line.strip() for line in f if line.strip()]
+    else:
+        texts = COMMANDS
+    return (texts * (size // len(texts) + 1))[:size]
+
+
+def throughput(fn, texts, repeat):
+    """Beste Laufzeit aus `repeat` Läufen → Dokumente pro Sekunde."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(texts)
+        best = min(best, time.perf_counter() - start)
+    return len(texts) / best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--tiers', default=None, help='z.B. "trf" oder "rule,sm,trf" (Default: PARSER_TIERS)')
+    arg_parser.add_argument('--file', default=None, help='Datei mit einem Input pro Zeile')
+    arg_parser.add_argument('--size', type=int, default=512, help='Anzahl Dokumente pro Lauf')
+    arg_parser.add_argument('--batch-sizes', default='1,8,32,128')
+    arg_parser.add_argument('--n-process', type=int, default=1)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    parser = SmartParserUtils(tiers=args.tiers.split(',') if args.tiers else None)
+    parser.warm_up()
+    texts = load_texts(args.file, args.size)
+
+    # Im Spiel kommt das Noun-Lexikon aus der DB - hier aus den Inputs
+    parser.set_entity_names([w for t in texts for w in t.split() if w[:1].isupper()])
+
+    print(f"Stufen: {','.join(parser.tiers)}  Dokumente: {len(texts)}  n_process: {args.n_process}")
+    print(f"{'Modus':<24}{'Docs/s':>12}{'ms/Doc':>10}")
+
+    single = throughput(lambda t: [parser.parse(x) for x in t], texts, args.repeat)
+    print(f"{'parse() einzeln':<24}{single:>12.1f}{1000 / single:>10.3f}")
+
+    for batch_size in (int(b) for b in args.batch_sizes.split(',')):
+        batched = throughput(
+            lambda t: parser.parse_many(t, batch_size=batch_size, n_process=args.n_process),
+            texts, args.repeat
+        )
+        label = f'parse_many(batch={batch_size})'
+        print(f"{label:<24}{batched:>12.1f}{1000 / batched:>10.3f}  ({batched / single:.1f}x)")
+
+    print()
+    print(f"{'Stufe':<8}{'Docs':>10}{'Treffer':>10}{'Quote':>8}{'Anteil':>8}{'ms/Doc':>10}")
+    for tier, stats in parser.tier_stats().items():
+        print(f"{tier:<8}{stats['docs']:>10}{stats['hits']:>10}{stats['hit_rate']:>8.1%}"
+              f"{stats['share']:>8.1%}{stats['avg_ms']:>10.3f}")
+
+
+if __name__ == '__main__':
+    main()
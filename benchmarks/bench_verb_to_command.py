@@ -0,0 +1,84 @@
+"""
+Micro-Benchmark für EmbeddingUtils.verb_to_command.
+
+Vergleicht die alte Schleife (ein util.cos_sim pro Command + sort) mit
+der gestapelten Command-Matrix (ein Matrix-Vektor-Produkt + Segment-Max).
+Gemessen wird nur das Matching (Verb-Embedding vorberechnet), der Aufruf
+über das Verb-Lexikon und der Embedding-Pfad inklusive encode.
+
+Aufruf (aus dem Repo-Root):
+    python benchmarks/bench_verb_to_command.py [--repeat 2000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from sentence_transformers import util
+
+from utils.embedding_utils import EmbeddingUtils
+
+VERBS = ['nehmen', 'geh', 'ab legen', 'schnappen', 'untersuchen', 'lesen', 'reden', 'schauen']
+
+
+def legacy_verb_to_command(emb, command_emb, verb):
+    """Alte Implementierung: ein cos_sim pro Command, danach voller sort."""
+    verb_emb = emb.model.encode(verb)
+    return legacy_rank(emb, command_emb, verb_emb)
+
+
+def legacy_rank(emb, command_emb, verb_emb):
+    result = []
+    for command, c_emb in command_emb.items():
+        max_sim = util.cos_sim(verb_emb, c_emb).max().item()
+        result.append({'command': command, 'sim': max_sim})
+    result.sort(key=lambda x: x['sim'], reverse=True)
+    return result
+
+
+def timeit(fn, repeat):
+    """Gibt die mittlere Laufzeit pro Aufruf in Mikrosekunden zurück."""
+    for _ in range(min(50, repeat)):
+        fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--repeat', type=int, default=2000)
+    args = arg_parser.parse_args()
+
+    emb = EmbeddingUtils()
+
+    # Alte Datenstruktur aus der gestapelten Matrix rekonstruieren
+    bounds = list(emb.command_offsets) + [len(emb.command_matrix)]
+    command_emb = {
+        name: emb.command_matrix[bounds[i]:bounds[i + 1]]
+        for i, name in enumerate(emb.command_names)
+    }
+
+    verb_embs = [emb.model.encode(v, normalize_embeddings=True) for v in VERBS]
+
+    print(f"{'Messung':<28}{'vorher (us)':>14}{'nachher (us)':>14}{'Faktor':>9}")
+
+    before = timeit(lambda: [legacy_rank(emb, command_emb, v) for v in verb_embs], args.repeat) / len(VERBS)
+    after = timeit(lambda: [emb._rank_commands(v) for v in verb_embs], args.repeat) / len(VERBS)
+    print(f"{'nur Matching':<28}{before:>14.1f}{after:>14.1f}{before / after:>8.1f}x")
+
+    repeat = max(1, args.repeat // 20)
+    before = timeit(lambda: [legacy_verb_to_command(emb, command_emb, v) for v in VERBS], repeat) / len(VERBS)
+    after = timeit(lambda: [emb.verb_to_command(v) for v in VERBS], repeat) / len(VERBS)
+    print(f"{'verb_to_command (Lexikon)':<28}{before:>14.1f}{after:>14.1f}{before / after:>8.1f}x")
+
+    after = timeit(lambda: [emb._rank_commands(emb.encode(v)) for v in VERBS], repeat) / len(VERBS)
+    print(f"{'verb_to_command inkl. encode':<28}{before:>14.1f}{after:>14.1f}{before / after:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Erzeugt prozedurale Welten für Skalierungs- und Lasttests.
+
+Schreibt die Welt als Welt-Datei (für GAME_BACKEND=memory bzw.
+suite.py --world) oder importiert sie per WorldImporter nach Neo4j.
+Optional entsteht ein passendes Replay-Skript für main.py --replay, um
+die Turn-Latenz bei unterschiedlicher Weltgröße zu messen.
+
+Aufruf (aus dem Repo-Root):
+    python benchmarks/generate_world.py --locations 10000 --items-per-location 5
+        [--exit-fanout 3] [--inventory-size 2] [--npcs-per-location 0.2] [--seed 42]
+        [--out worlds/gen_10k.json] [--neo4j [--prune]] [--replay replay_10k.txt --turns 200]
+
+Beispiel Turn-Latenz bei ~10k Nodes:
+    python benchmarks/generate_world.py --locations 2000 --items-per-location 4 \\
+        --out /tmp/gen.json --replay /tmp/gen.txt
+    GAME_BACKEND=memory GAME_WORLD_FILE=/tmp/gen.json python src/main.py --replay /tmp/gen.txt
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from model.world_generator import WorldGenerator
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument('--locations', type=int, default=10)
+    arg_parser.add_argument('--items-per-location', type=int, default=3)
+    arg_parser.add_argument('--exit-fanout', type=int, default=3)
+    arg_parser.add_argument('--inventory-size', type=int, default=2)
+    arg_parser.add_argument('--npcs-per-location', type=float, default=0.2)
+    arg_parser.add_argument('--seed', type=int, default=42)
+    arg_parser.add_argument('--out', default=None, help='Welt-Datei schreiben')
+    arg_parser.add_argument('--neo4j', action='store_true', help='Per WorldImporter nach Neo4j (.env) importieren')
+    arg_parser.add_argument('--prune', action='store_true', help='Mit --neo4j: Entities außerhalb der Welt löschen')
+    arg_parser.add_argument('--batch-size', type=int, default=1000)
+    arg_parser.add_argument('--replay', default=None, help='Replay-Skript für main.py --replay schreiben')
+    arg_parser.add_argument('--turns', type=int, default=200)
+    args = arg_parser.parse_args()
+
+    if not args.out and not args.neo4j:
+        arg_parser.error('--out und/oder --neo4j angeben')
+
+    generator = WorldGenerator(
+        locations=args.locations,
+        items_per_location=args.items_per_location,
+        exit_fanout=args.exit_fanout,
+        inventory_size=args.inventory_size,
+        npcs_per_location=args.npcs_per_location,
+        seed=args.seed,
+    )
+    start = time.perf_counter()
+    world = generator.generate()
+    print(f"{len(world['nodes'])} Nodes, {len(world['relationships'])} Relationships "
+          f"in {time.perf_counter() - start:.1f} s generiert")
+
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            json.dump(world, f, ensure_ascii=False)
+        print(f"→ {args.out}")
+
+    if args.replay:
+        commands = WorldGenerator.replay_commands(world, args.turns, args.seed)
+        with open(args.replay, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(commands) + '\n')
+        print(f"{len(commands)} Eingaben → {args.replay}")
+
+    if args.neo4j:
+        from model.neo4j_backend import Neo4jBackend
+        from model.world_importer import WorldImporter
+        from utils.embedding_utils import EmbeddingUtils
+
+        backend = Neo4jBackend()
+        try:
+            stats = WorldImporter(backend, EmbeddingUtils(), batch_size=args.batch_size).run(world, prune=args.prune)
+        finally:
+            backend.close()
+        print(f"Neo4j: {stats['embedded']} Entities embeddet, {stats['pruned']} gelöscht in {stats['seconds']:.1f} s")
+
+
+if __name__ == '__main__':
+    main()
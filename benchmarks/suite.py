@@ -0,0 +1,309 @@
+"""
+Benchmark-Suite für Parser, Embedding-Matching und GameModel-Queries.
+
+Misst pro Benchmark Median, p95 und Speicher (tracemalloc-Peak) und
+speichert das Ergebnis als JSON-Baseline. `compare` vergleicht zwei
+Läufe und meldet Regressionen über einer Toleranz (Exit-Code 1).
+
+Läuft offline auf CPU: Models kommen aus dem lokalen Cache
+(HF_HUB_OFFLINE), die Welt aus dem In-Memory Backend (--backend neo4j
+misst stattdessen die Neo4j-Instanz aus .env).
+
+Aufruf (aus dem Repo-Root):
+    python benchmarks/suite.py run [--only parse,match] [--backend memory|neo4j] [--world FILE]
+        [--out benchmarks/baselines/current.json]
+    python benchmarks/suite.py compare benchmarks/baselines/main.json current.json [--tolerance 0.15]
+"""
+
+import os
+
+# Keine Netzwerk-Zugriffe - nur lokaler Model-Cache
+os.environ.setdefault('HF_HUB_OFFLINE', '1')
+os.environ.setdefault('TRANSFORMERS_OFFLINE', '1')
+os.environ.setdefault('CUDA_VISIBLE_DEVICES', '')
+
+import argparse
+import gc
+import json
+import itertools
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), 'baselines')
+MATCH_SIZES = (10, 100, 1_000, 10_000, 100_000)
+EMBEDDING_DIM = 384
+
+
+def measure(fn, repeat, warmup=3):
+    """
+    Führt fn() `repeat` mal aus.
+
+    Zeit und Speicher werden getrennt gemessen, weil tracemalloc die
+    Laufzeit selbst deutlich verlangsamt.
+
+    Returns:
+        dict: {n, median_ms, p95_ms, mean_ms, peak_kb}
+    """
+    for _ in range(warmup):
+        fn()
+
+    gc.collect()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - start) * 1000)
+
+    # Speicher-Peak über ein paar extra Aufrufe
+    tracemalloc.start()
+    try:
+        for _ in range(min(repeat, 5)):
+            fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    times = np.array(times)
+    return {
+        'n': repeat,
+        'median_ms': float(np.median(times)),
+        'p95_ms': float(np.percentile(times, 95)),
+        'mean_ms': float(times.mean()),
+        'peak_kb': peak / 1024,
+    }
+
+
+def bench_parse(results, repeat):
+    from bench_parser import COMMANDS
+    from utils.smart_parser import SmartParserUtils
+
+    parser = SmartParserUtils()
+    parser.warm_up()
+    parser.set_entity_names([w for t in COMMANDS for w in t.split() if w[:1].isupper()])
+    commands = iter(COMMANDS * (repeat // len(COMMANDS) + 4))
+
+    results['parse'] = measure(lambda: parser.parse(next(commands)), repeat)
+    for tier in parser.tiers:
+        # Eine Stufe allein (ohne Kaskade)
+        single = SmartParserUtils(tiers=[tier])
+        single.set_entity_names(parser.rule_parser.entity_words)
+        commands = iter(COMMANDS * (repeat // len(COMMANDS) + 4))
+        results[f'parse[tier={tier}]'] = measure(lambda: single.parse(next(commands)), repeat)
+
+
+def bench_verb_to_command(results, repeat):
+    from bench_verb_to_command import VERBS
+    from utils.embedding_utils import EmbeddingUtils
+
+    emb = EmbeddingUtils()
+    emb.warm_up()
+    verbs = itertools.cycle(VERBS)
+    results['verb_to_command'] = measure(lambda: emb.verb_to_command(next(verbs)), repeat)
+    # Unbekannte Verben: Forward-Pass + Ranking statt Lexikon, am EmbeddingCache vorbei
+    # (die wenigen VERBS wären sonst ab der zweiten Runde reine Cache-Hits)
+    results['verb_to_command[embedding]'] = measure(
+        lambda: emb._rank_commands(emb._encode_batch([next(verbs)])[0]), repeat
+    )
+    # Dasselbe mit Cache-Hit (wiederholte Verben im Spiel)
+    results['verb_to_command[embedding-cached]'] = measure(
+        lambda: emb._rank_commands(emb.encode(next(verbs))), repeat
+    )
+
+    verb_emb = emb.encode(VERBS[0])
+    results['verb_to_command[rank]'] = measure(lambda: emb._rank_commands(verb_emb), repeat)
+
+
+def synthetic_candidates(n, rng):
+    """n Kandidaten mit zufälligen, normierten Embeddings (wie aus der DB)."""
+    vectors = rng.standard_normal((n, 2, EMBEDDING_DIM)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=2, keepdims=True)
+    return [
+        {
+            'id': f'entity_{i}',
+            'name': f'Entity {i}',
+            'name_emb': vectors[i, 0],
+            'synonyms_emb': vectors[i, 1],
+        }
+        for i in range(n)
+    ]
+
+
+def bench_match_entities(results, repeat):
+    from utils.embedding_utils import EmbeddingUtils
+    from utils.entity_index import EntityIndex
+
+    emb = EmbeddingUtils()
+    emb.warm_up()
+    rng = np.random.default_rng(42)
+
+    for n in MATCH_SIZES:
+        emb.entity_index = EntityIndex()
+        candidates = synthetic_candidates(n, rng)
+        emb.match_entities('Fackel', candidates)  # Index befüllen
+
+        # Große Kandidatenlisten: weniger Wiederholungen
+        runs = max(5, min(repeat, repeat * 1000 // n))
+        results[f'match_entities[n={n}]'] = measure(
+            lambda: emb.match_entities('Fackel', candidates, top_k=5), runs
+        )
+    emb.entity_index = EntityIndex()
+
+
+def bench_model(results, repeat, backend='memory', world=None):
+    from model.world_model import GameModel, create_backend
+
+    model = GameModel(create_backend(backend, world))
+    try:
+        model.warm_up()
+        scene = model.scene()
+        location = scene['location'][0]['id']
+
+        reads = {
+            'current_location': model.current_location,
+            'location_items': model.location_items,
+            'location_exits': model.location_exits,
+            'player_inventory': model.player_inventory,
+            'scene': model.scene,
+            'entity_embeddings': model.entity_embeddings,
+            'neighbourhood': lambda: model.neighbourhood(location),
+        }
+        for name, fn in reads.items():
+            results[f'model.{name}'] = measure(fn, repeat)
+
+        # Writes als Hin-und-Zurück, damit die Welt danach unverändert ist
+        if scene['exits']:
+            target = scene['exits'][0]['id']
+
+            def go_and_back():
+                model.move_player(target)
+                model.move_player(location)
+
+            results['model.move_player[x2]'] = measure(go_and_back, max(5, repeat // 2))
+
+        # Erstes Item das sich aufheben lässt (items enthält auch NPCs)
+        item = next((i['id'] for i in scene['items'] if model.take_item(i['id'])), None)
+        if item is not None:
+            model.drop_item(item)
+
+            def take_and_drop():
+                model.take_item(item)
+                model.drop_item(item)
+
+            results['model.take_item+drop_item'] = measure(take_and_drop, max(5, repeat // 2))
+    finally:
+        model.close()
+
+
+BENCHMARKS = {
+    'parse': bench_parse,
+    'verb': bench_verb_to_command,
+    'match': bench_match_entities,
+    'model': bench_model,
+}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    only = args.only.split(',') if args.only else list(BENCHMARKS)
+    results = {}
+    for name in only:
+        print(f'=== {name} ===', file=sys.stderr)
+        if name == 'model':
+            bench_model(results, args.repeat, args.backend, args.world)
+        else:
+            BENCHMARKS[name](results, args.repeat)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'cpus': os.cpu_count(),
+            'backend': args.backend,
+        },
+        'results': results,
+    }
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    print(f"{'Benchmark':<36}{'Median (ms)':>13}{'p95 (ms)':>11}{'Peak (KB)':>12}")
+    for name, r in results.items():
+        print(f"{name:<36}{r['median_ms']:>13.3f}{r['p95_ms']:>11.3f}{r['peak_kb']:>12.1f}")
+    print(f'→ {args.out}')
+
+
+def compare(args):
+    """Vergleicht Median und p95 gegen die Baseline; Regression wenn > (1 + tolerance)."""
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)['results']
+    with open(args.current, encoding='utf-8') as f:
+        current = json.load(f)['results']
+
+    regressions = []
+    print(f"{'Benchmark':<36}{'Baseline':>11}{'Aktuell':>11}{'Faktor':>9}")
+    for name, base in baseline.items():
+        if name not in current:
+            print(f'{name:<36}{"fehlt":>31}')
+            continue
+        now = current[name]
+        ratio = now['median_ms'] / base['median_ms'] if base['median_ms'] else 1.0
+        p95_ratio = now['p95_ms'] / base['p95_ms'] if base['p95_ms'] else 1.0
+        flag = ''
+        if ratio > 1 + args.tolerance or p95_ratio > 1 + args.tolerance * 2:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        print(f"{name:<36}{base['median_ms']:>11.3f}{now['median_ms']:>11.3f}{ratio:>8.2f}x{flag}")
+
+    if regressions:
+        print(f'{len(regressions)} Regression(en) über {args.tolerance:.0%}: {", ".join(regressions)}')
+        return 1
+    print(f'Keine Regression über {args.tolerance:.0%}')
+    return 0
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = arg_parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='Benchmarks ausführen und als JSON speichern')
+    run_parser.add_argument('--only', default=None, help=f'Auswahl aus {",".join(BENCHMARKS)}')
+    run_parser.add_argument('--repeat', type=int, default=200)
+    run_parser.add_argument('--backend', default='memory', choices=('memory', 'neo4j'))
+    run_parser.add_argument('--world', default=None, help='Welt-Datei für --backend memory')
+    run_parser.add_argument('--out', default=os.path.join(BASELINE_DIR, 'current.json'))
+
+    compare_parser = commands.add_parser('compare', help='Zwei Läufe vergleichen')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--tolerance', type=float, default=0.15,
+                                help='Erlaubte Verlangsamung des Medians (0.15 = 15%%, p95: doppelt)')
+
+    args = arg_parser.parse_args()
+    if args.command == 'run':
+        run(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,318 @@
+"""
+Asyncio-Variante des GameControllers.
+
+Gleiche State-Machine (PARSE → MATCH → REQUEST → ACTION) und gleiche
+LoopState-Semantik wie GameController, aber:
+- DB-Zugriffe laufen über AsyncGameModel (neo4j.AsyncGraphDatabase)
+- spaCy-Parsing und Embedding-Encoding laufen im ThreadPoolExecutor
+- der Szene-Read für das Target-Matching startet sobald der Input da ist
+  und überlappt mit dem Parsing → Turn-Latenz ≈ max(parse, fetch)
+"""
+
+import asyncio
+import functools
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+import model.game_state as gs
+from view.game_view import GameView
+from model.async_world_model import AsyncGameModel
+from model.world_model import entity_matching
+from utils.startup_report import StartupReport
+from utils.pipeline_cache import PipelineCache
+from utils.metrics import METRICS
+from controller.game_controller import GameController, HANDLER_SPANS
+
+
+class AsyncGameController(GameController):
+
+    def __init__(self, report=None):
+
+        self.report = report or StartupReport()
+
+        # init pattern
+        with self.report.phase('View'):
+            self.view = GameView()
+        self.model = AsyncGameModel()
+        self.vector_matching = entity_matching() == 'vector'
+
+        # load utils im Hintergrund (Index kommt async aus der DB)
+        self.parser_utils = None
+        self.embedding_utils = None
+        self.loader = ThreadPoolExecutor(max_workers=2, thread_name_prefix='loader')
+        self._parser_future = self.loader.submit(self._load_parser)
+        self._embedding_future = self.loader.submit(self._load_embeddings, False)
+
+        # CPU-lastige Arbeit (spaCy, encode) + blockierende Eingabe
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='ragventure')
+        self._scene_task = None
+        self.pipeline_cache = PipelineCache()
+
+        # init states
+        self.state = gs.GameState()
+
+    async def _run_blocking(self, fn, *args):
+        """Führt eine blockierende Funktion im Executor aus (mit den offenen Metrics-Spans)."""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, fn, *args)
+        return await loop.run_in_executor(self.executor, call)
+
+    async def close(self):
+        """Schließt Driver und Executor."""
+        await self.model.close()
+        self.executor.shutdown(wait=False)
+
+    async def run_game(self):
+        """
+        Haupt-Game-Loop mit State-Machine Dispatcher (async).
+
+        Siehe GameController.run_game.
+        """
+        self.state.running = True
+
+        # Intro :) - DB warm-up, Index und Models laden während der Welcome-Screen steht
+        self.view.show_welcome()
+        entities = self.model.entity_names() if self.vector_matching else self.model.entity_embeddings()
+        warm_up = asyncio.gather(self.model.warm_up(), entities)
+        with self.report.phase('Welcome-Screen', waiting=True):
+            await self._run_blocking(input)
+
+        with self.report.phase('Warten auf Neo4j'):
+            _, entities = await warm_up
+        with self.report.phase('Warten auf Models'):
+            self.parser_utils = await asyncio.wrap_future(self._parser_future)
+            self.embedding_utils = await asyncio.wrap_future(self._embedding_future)
+        self.loader.shutdown(wait=False)
+        if self.vector_matching:
+            with self.report.phase('Vector Indexes prüfen'):
+                await self.model.ensure_vector_indexes(self.embedding_utils.dimensions)
+        else:
+            with self.report.phase('Entity-Index laden'):
+                self.embedding_utils.entity_index.load(entities)
+        self.parser_utils.set_entity_names(self._entity_names(entities))
+
+        with self.report.phase('Erste Szene'):
+            self._update_scene(await self.model.scene())
+            self.view.update_dialog()
+
+        self.view.refresh()
+
+        while self.state.running:
+
+            with METRICS.span(HANDLER_SPANS[self.state.loop_state]):
+                if self.state.loop_state == gs.LoopState.PARSE:
+                    await self._handle_parse()
+
+                elif self.state.loop_state == gs.LoopState.MATCH:
+                    await self._handle_match()
+
+                elif self.state.loop_state == gs.LoopState.REQUEST:
+                    await self._handle_request()
+
+                elif self.state.loop_state == gs.LoopState.ACTION:
+                    await self._handle_action()
+
+        self._cancel_scene_fetch()
+
+    def _cancel_scene_fetch(self):
+        if self._scene_task is not None:
+            self._scene_task.cancel()
+            self._scene_task = None
+
+    async def _handle_parse(self):
+        """
+        PARSE State Handler (async).
+
+        Startet direkt nach dem Input den Szene-Read für MATCH und parst
+        parallel dazu im Executor. Siehe GameController._handle_parse.
+        """
+
+        # get input (Wartezeit zählt nicht zum Handler)
+        with METRICS.span('view.input', exclusive=True):
+            self.state.parse.input = await self._run_blocking(self.view.get_input)
+
+        # quit
+        if self.state.parse.input in ['quit','exit',':q']:
+            self.state.running = False
+            return
+
+        # empty inputs
+        if not self.state.parse.input.strip():
+            return
+
+        if self._resolve_cached():
+            return
+
+        # Kandidaten schon mal holen, während spaCy parst
+        self._cancel_scene_fetch()
+        self._scene_task = asyncio.create_task(self.model.scene())
+
+        # Parsing
+        parsed = await self._run_blocking(self.parser_utils.parse, self.state.parse.input)
+        self.state.parse.verb = parsed[0]['verb']
+        self.state.parse.noun = parsed[0]['noun']
+
+        # validierung
+        if not self.state.parse.verb or not self.state.parse.noun:
+            self._cancel_scene_fetch()
+            self.state.dialog = gs.Dialog(
+                type=gs.DialogState.MESSAGE,
+                message="Das habe ich nicht verstanden."
+            )
+            self.state.parse = gs.Parse()
+            self.view.update_dialog(self.state.dialog)
+            self.view.refresh()
+            return
+        else:
+            self.state.set_state(gs.LoopState.MATCH)
+
+    async def _handle_match(self):
+        """
+        MATCH State Handler (async).
+
+        Verb-Encoding läuft im Executor während der Szene-Read aus PARSE
+        fertig wird. Siehe GameController._handle_match.
+        """
+        # der Szenen-Read läuft seit PARSE, bis dahin gab es keine eigene Mutation
+        scene_version = self.model.scene_version
+
+        # Command matching
+        commands = await self._run_blocking(self.embedding_utils.verb_to_command, self.state.parse.verb)
+        good_commands = self._good_commands(commands)
+
+        if len(good_commands) == 0:
+            self._cancel_scene_fetch()
+            self.state.dialog = gs.Dialog(
+                type = gs.DialogState.MESSAGE,
+                message = 'Es wurde kein passendes Verb gefunden.'
+            )
+            self.view.update_dialog(self.state.dialog)
+            self.view.refresh()
+            self.state.set_state(gs.LoopState.PARSE)
+            self.state.parse = gs.Parse()
+            return
+
+        elif len(good_commands) == 1:
+            # Eindeutig
+            self.state.action.command = gs.ActionCommands(good_commands[0]['command'])
+        else:
+            # Mehrdeutig/unklar
+            self.state.parse.good_commands = good_commands
+
+        # Target matching
+        scene_task, self._scene_task = self._scene_task, None
+        scene = await scene_task if scene_task is not None else await self.model.scene()
+        all_targets = self._get_target_candidates(
+            scene['exits'],
+            scene['items'],
+            scene['inventory']
+        )
+        if self.vector_matching:
+            noun_emb = await self._run_blocking(self.embedding_utils.encode, self.state.parse.noun)
+            sim_targets = await self.model.match_entities(noun_emb, all_targets)
+        else:
+            # Szenen-Queries liefern keine Vektoren mehr, fehlende gezielt nachladen
+            missing = [t['id'] for t in all_targets if t['id'] not in self.embedding_utils.entity_index]
+            if missing:
+                self.embedding_utils.entity_index.load(await self.model.entity_embeddings(missing))
+            sim_targets = await self._run_blocking(
+                self.embedding_utils.match_entities, self.state.parse.noun, all_targets
+            )
+        good_targets = [t for t in sim_targets if t['sim'] >= .75]
+
+        if len(good_targets) == 0:
+            self.state.dialog = gs.Dialog(
+                type = gs.DialogState.MESSAGE,
+                message = 'Es wurde kein passendes Substantiv gefunden.'
+            )
+            self.view.update_dialog(self.state.dialog)
+            self.state.parse = gs.Parse()
+            self.state.set_state(gs.LoopState.PARSE)
+            self.view.refresh()
+            return
+
+        elif len(good_targets) == 1:
+            self.state.action.target = good_targets[0]['target']
+        else:
+            self.state.parse.good_targets = good_targets
+
+        self.pipeline_cache.put(self.state.parse.input, scene_version, self.state.parse, self.state.action)
+
+        # Action komplett?
+        if self.state.action.command and self.state.action.target:
+            self.state.set_state(gs.LoopState.ACTION)
+        else:
+            self.state.set_state(gs.LoopState.REQUEST)
+
+    async def _handle_request(self):
+        """
+        REQUEST State Handler (async).
+
+        Die Auswahl-Logik ist identisch zum synchronen Controller, nur die
+        blockierende Eingabe läuft im Executor.
+        """
+        await self._run_blocking(super()._handle_request)
+
+    async def _handle_action(self):
+        """
+        ACTION State Handler (async).
+
+        Siehe GameController._handle_action - ein Write-Round-Trip, die View
+        wird aus dem zurückgegebenen Szene-Delta aktualisiert.
+        """
+        if self.state.action.command == gs.ActionCommands.GO:
+
+            delta = await self.model.move_player(self.state.action.target)
+
+            if delta:
+                self.state.dialog = gs.Dialog(
+                    type=gs.DialogState.MESSAGE,
+                    message=f'Du bist jetzt in {delta['location'][0]['name']}'
+                )
+            else:
+                self.state.dialog = gs.Dialog(
+                    type=gs.DialogState.MESSAGE,
+                    message='Ups, gestolpert?'
+                )
+
+        elif self.state.action.command == gs.ActionCommands.TAKE:
+
+            delta = await self.model.take_item(self.state.action.target)
+
+            if delta:
+                self.state.dialog = gs.Dialog(
+                    type=gs.DialogState.MESSAGE,
+                    message=f'Du trägst jetzt {delta['item'][0]['name']}'
+                )
+            else:
+                self.state.dialog = gs.Dialog(
+                    type=gs.DialogState.MESSAGE,
+                    message='Ups, fallengelassen?'
+                )
+
+        elif self.state.action.command == gs.ActionCommands.DROP:
+            delta = await self.model.drop_item(self.state.action.target)
+
+            if delta:
+                self.state.dialog = gs.Dialog(
+                    type=gs.DialogState.MESSAGE,
+                    message=f'Du hast {delta['item'][0]['name']} abgelegt.'
+                )
+            else:
+                self.state.dialog = gs.Dialog(
+                    type=gs.DialogState.MESSAGE,
+                    message='Ups, nicht da?'
+                )
+
+        else:
+            delta = {}
+
+        # view updates (nur was die Action geändert hat)
+        self._update_scene(delta)
+        self.view.update_dialog(self.state.dialog)
+
+        self.state.action = gs.Action()
+        self.state.dialog = gs.Dialog()
+        self.state.parse = gs.Parse()
+        self.state.set_state(gs.LoopState.PARSE)
+        self.view.refresh()
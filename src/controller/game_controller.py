@@ -1,25 +1,118 @@
+from concurrent.futures import ThreadPoolExecutor
+
 import model.game_state as gs
 from view.game_view import GameView
-from model.world_model import GameModel
+from model.world_model import GameModel, entity_matching
+from model.scene_prefetcher import ScenePrefetcher
 from utils.smart_parser import SmartParserUtils
 from utils.embedding_utils import EmbeddingUtils
+from utils.startup_report import StartupReport
+from utils.pipeline_cache import PipelineCache
+from utils.metrics import METRICS
+
+# Span-Namen der State-Handler
+HANDLER_SPANS = {
+    gs.LoopState.PARSE: 'controller.parse',
+    gs.LoopState.MATCH: 'controller.match',
+    gs.LoopState.REQUEST: 'controller.request',
+    gs.LoopState.ACTION: 'controller.action',
+}
 
 
 class GameController:
 
-    def __init__(self):
-        
+    def __init__(self, report=None, view=None, model=None,
+                 parser_utils=None, embedding_utils=None, prefetcher=None, pipeline_cache=None):
+        """
+        Args:
+            report (StartupReport | None): Sammelt die Startup-Phasen
+            view: GameView oder kompatible View
+            model (GameModel | None): Bestehendes Model (z.B. pro Session im GameServer)
+            parser_utils (SmartParserUtils | None): Geteilter, bereits geladener Parser
+            embedding_utils (EmbeddingUtils | None): Geteiltes, bereits geladenes Embedding-Model
+            prefetcher (ScenePrefetcher | None): Geteilter Szenen-Cache
+            pipeline_cache (PipelineCache | None): Ergebnis-Cache für Parse + Match
+        """
+
+        self.report = report or StartupReport()
+
         # init pattern
-        self.view = GameView()
-        self.model = GameModel()
+        with self.report.phase('View'):
+            self.view = view or GameView()
+        if model is None:
+            with self.report.phase('Neo4j Connect + Warm-up'):
+                model = GameModel()
+                model.warm_up()
+        self.model = model
+
+        # Noun-Matching lokal (EntityIndex) oder über die Neo4j Vector Indexes
+        self.vector_matching = entity_matching() == 'vector'
+        if self.vector_matching and not self.model.supports_vector_matching:
+            raise ValueError('ENTITY_MATCHING=vector braucht GAME_BACKEND=neo4j')
+
+        # load utils im Hintergrund, während der Welcome-Screen steht
+        self.parser_utils = parser_utils
+        self.embedding_utils = embedding_utils
+        self.entities = []
+        self.loader = None
+        if parser_utils is None or embedding_utils is None:
+            self.loader = ThreadPoolExecutor(max_workers=2, thread_name_prefix='loader')
+            self._parser_future = self.loader.submit(self._load_parser)
+            self._embedding_future = self.loader.submit(self._load_embeddings, True)
+
+        # Szene der aktuellen Location + Nachbarn im Speicher
+        self.prefetcher = prefetcher or ScenePrefetcher(self.model)
+        self.scene = {}
+
+        # Wiederholte Eingaben ohne Parse + Match (pro Spieler, Key mit Szenen-Version)
+        self.pipeline_cache = pipeline_cache or PipelineCache()
 
-        # load utils
-        self.parser_utils = SmartParserUtils()        
-        self.embedding_utils = EmbeddingUtils()
-        
         # init states
         self.state = gs.GameState()
 
+    def _load_parser(self):
+        """Lädt spaCy und macht einen Warm-up Parse (Hintergrund-Thread)."""
+        with self.report.phase('spaCy laden'):
+            parser_utils = SmartParserUtils()
+        with self.report.phase('spaCy Warm-up'):
+            parser_utils.warm_up()
+        return parser_utils
+
+    def _load_embeddings(self, load_index):
+        """Lädt EmbeddingUtils, Warm-up und optional den EntityIndex (Hintergrund-Thread)."""
+        with self.report.phase('Embeddings laden'):
+            embedding_utils = EmbeddingUtils()
+        with self.report.phase('Embeddings Warm-up'):
+            embedding_utils.warm_up()
+        if load_index and self.vector_matching:
+            # Embeddings bleiben in der DB, nur Namen für das Noun-Lexikon
+            with self.report.phase('Vector Indexes prüfen'):
+                self.model.ensure_vector_indexes(embedding_utils.dimensions)
+                self.entities = self.model.entity_names()
+        elif load_index:
+            with self.report.phase('Entity-Index laden'):
+                self.entities = self.model.entity_embeddings()
+                embedding_utils.entity_index.load(self.entities)
+        return embedding_utils
+
+    def _wait_for_models(self):
+        """Blockiert bis Parser und Embeddings geladen sind."""
+        if self.loader is None:
+            # Models wurden fertig geladen übergeben (Lexikon setzt der Besitzer)
+            return
+
+        with self.report.phase('Warten auf Models'):
+            self.parser_utils = self._parser_future.result()
+            self.embedding_utils = self._embedding_future.result()
+        self.loader.shutdown(wait=False)
+
+        # Noun-Lexikon für den Regel-Parser
+        self.parser_utils.set_entity_names(self._entity_names(self.entities))
+
+    def _entity_names(self, entities):
+        """Namen und IDs aller Entities für das Noun-Lexikon."""
+        return [e[key] for e in entities for key in ('name', 'id') if e.get(key)]
+
     def run_game(self):
         """
         Haupt-Game-Loop mit State-Machine Dispatcher.
@@ -29,25 +122,29 @@ class GameController:
         """
         self.state.running = True
 
-        # Intro :)
+        # Intro :) - Models laden derweil im Hintergrund
         self.view.show_welcome()
-        input()
+        with self.report.phase('Welcome-Screen', waiting=True):
+            input()
+        self._wait_for_models()
+        self._show_first_scene()
 
-        location = self.model.current_location()
-        items = self.model.location_items()
-        exits = self.model.location_exits()
-        inventory = self.model.player_inventory()
+        while self.state.running:
+            self._step()
 
-        self.view.update_location(location)
-        self.view.update_items(items)
-        self.view.update_exits(exits)
-        self.view.update_inventory(inventory)
-        self.view.update_dialog()
+    def _show_first_scene(self):
+        """Lädt die Start-Szene und zeichnet alle Panels."""
+        with self.report.phase('Erste Szene'):
+            self._apply_scene(self.model.scene())
+            self._update_scene(self.scene)
+            self.view.update_dialog()
+            self.prefetcher.prefetch(self._location_id())
 
         self.view.refresh()
 
-        while self.state.running:
-
+    def _step(self):
+        """Dispatched einen State-Handler anhand von loop_state."""
+        with METRICS.span(HANDLER_SPANS[self.state.loop_state]):
             if self.state.loop_state == gs.LoopState.PARSE:
                 self._handle_parse()
 
@@ -72,8 +169,9 @@ class GameController:
         - Bleibt in PARSE: Empty input oder nichts gefunden
         """
 
-        # get input
-        self.state.parse.input = self.view.get_input()
+        # get input (Wartezeit zählt nicht zum Handler)
+        with METRICS.span('view.input', exclusive=True):
+            self.state.parse.input = self.view.get_input()
 
         # quit
         if self.state.parse.input in ['quit','exit',':q']:
@@ -84,6 +182,9 @@ class GameController:
         if not self.state.parse.input.strip():
             return
 
+        if self._resolve_cached():
+            return
+
         # Parsing
         parsed = self.parser_utils.parse(self.state.parse.input)
         self.state.parse.verb = parsed[0]['verb']
@@ -115,16 +216,19 @@ class GameController:
         - → ACTION: Command + Target eindeutig gefunden
         - → REQUEST: Mehrdeutige Matches (User muss wählen)
         """
+        # vor dem Szenen-Read, spätere Mutationen entwerten den Eintrag
+        scene_version = self.model.scene_version
 
         # Command matching
         commands = self.embedding_utils.verb_to_command(self.state.parse.verb)
-        good_commands = [c for c in commands if c['sim'] >= .95]
+        good_commands = self._good_commands(commands)
 
         if len(good_commands) == 0:
             self.state.dialog = gs.Dialog(
                 type = gs.DialogState.MESSAGE,
                 message = 'Es wurde kein passendes Verb gefunden.'
             )
+            self.view.update_dialog(self.state.dialog)
             self.view.refresh()
             self.state.set_state(gs.LoopState.PARSE)
             self.state.parse = gs.Parse()
@@ -139,12 +243,13 @@ class GameController:
 
 
         # Target matching
+        scene = self._scene_for_match()
         all_targets = self._get_target_candidates(
-            self.model.location_exits(),
-            self.model.location_items(), 
-            self.model.player_inventory()
+            scene['exits'],
+            scene['items'],
+            scene['inventory']
         )
-        sim_targets = self.embedding_utils.match_entities(self.state.parse.noun, all_targets)
+        sim_targets = self._match_targets(self.state.parse.noun, all_targets)
         good_targets = [t for t in sim_targets if t['sim'] >= .75]
 
         if len(good_targets) == 0:
@@ -163,6 +268,7 @@ class GameController:
         else:
             self.state.parse.good_targets = good_targets
 
+        self.pipeline_cache.put(self.state.parse.input, scene_version, self.state.parse, self.state.action)
 
         # Action komplett?
         if self.state.action.command and self.state.action.target:
@@ -171,6 +277,27 @@ class GameController:
             self.state.set_state(gs.LoopState.REQUEST)
 
 
+    def _resolve_cached(self):
+        """
+        Übernimmt Parse + Match aus dem PipelineCache.
+
+        Transitions:
+        - → ACTION / REQUEST: Eingabe in dieser Szenen-Version schon aufgelöst
+
+        Returns:
+            bool: True bei Cache-Hit
+        """
+        cached = self.pipeline_cache.get(self.state.parse.input, self.model.scene_version)
+        if cached is None:
+            return False
+
+        self.state.parse, self.state.action = cached
+        if self.state.action.command and self.state.action.target:
+            self.state.set_state(gs.LoopState.ACTION)
+        else:
+            self.state.set_state(gs.LoopState.REQUEST)
+        return True
+
     def _handle_request(self):
         """
         REQUEST State Handler - zeigt Dialog für mehrdeutige Auswahl.
@@ -180,11 +307,11 @@ class GameController:
 
         Transitions:
         - → ACTION: Action komplett (command + target gesetzt)
-        - → PARSE: User bricht ab (Choice 0)
+        - → PARSE: User bricht ab (Choice 0) oder beendet (quit)
         - Bleibt in REQUEST: Ungültige Eingabe oder noch nicht komplett
         """
         # verb/command request
-        if len(self.state.parse.good_commands) > 1:
+        if len(self.state.parse.good_commands) > 1 and not self.state.action.command:
 
             # Dialog updaten
             self.state.dialog = gs.Dialog(
@@ -205,7 +332,7 @@ class GameController:
             )
 
         # noun/action request
-        if len(self.state.parse.good_targets) > 1:
+        if len(self.state.parse.good_targets) > 1 and not self.state.action.target:
 
             # Dialog updaten
             self.state.dialog = gs.Dialog(
@@ -218,11 +345,11 @@ class GameController:
             self.view.refresh()
 
             # target to action
-            choice = self._get_choice(self.state.dialog)
+            choice = self._get_choice()
             if choice is None:
                 return
             
-            self.state.action.target = self.state.parse.good_targets[choice - 1]['id']
+            self.state.action.target = self.state.parse.good_targets[choice - 1]['target']
         
         if self.state.action.command and self.state.action.target:
             self.state.set_state(gs.LoopState.ACTION)
@@ -240,19 +367,26 @@ class GameController:
         ACTION State Handler - führt validierte Action aus.
 
         Verarbeitet GO, TAKE, DROP Commands, updated DB via Model,
-        aktualisiert View und setzt Feedback-Dialog.
+        aktualisiert View aus dem zurückgegebenen Szene-Delta (ein
+        Round-Trip pro Action) und setzt Feedback-Dialog.
 
         Transitions:
         - → PARSE: Nach erfolgreicher Ausführung (State wird resettet)
         """
         if self.state.action.command == gs.ActionCommands.GO:
 
-            result = self.model.move_player(self.state.action.target)
+            old_location = self._location_id()
+            cached = self.prefetcher.get(self.state.action.target)
+            delta = self.model.move_player(self.state.action.target, with_scene=cached is None)
 
-            if result:
+            if delta:
+                # Items/Exits der neuen Location kommen aus dem Prefetch
+                if cached is not None:
+                    delta = {**cached, 'location': delta['location']}
+                self.prefetcher.invalidate(old_location, self.state.action.target)
                 self.state.dialog = gs.Dialog(
                     type=gs.DialogState.MESSAGE,
-                    message=f'Du bist jetzt in {result[0]['name']}'
+                    message=f'Du bist jetzt in {delta['location'][0]['name']}'
                 )
             else:
                 self.state.dialog = gs.Dialog(
@@ -260,20 +394,15 @@ class GameController:
                     message='Ups, gestolpert?'
                 ) 
 
-            # view updates
-            self.view.update_location(self.model.current_location())
-            self.view.update_exits(self.model.location_exits())
-            self.view.update_items(self.model.location_items())
-            self.view.update_dialog(self.state.dialog)
-
         elif self.state.action.command == gs.ActionCommands.TAKE:
 
-            result = self.model.take_item(self.state.action.target)
+            delta = self.model.take_item(self.state.action.target)
             
-            if result:
+            if delta:
+                self.prefetcher.invalidate(self._location_id())
                 self.state.dialog = gs.Dialog(
                     type=gs.DialogState.MESSAGE,
-                    message=f'Du trägst jetzt {result[0]['name']}'
+                    message=f'Du trägst jetzt {delta['item'][0]['name']}'
                 )
             else:
                 self.state.dialog = gs.Dialog(
@@ -281,17 +410,14 @@ class GameController:
                     message='Ups, fallengelassen?'
                 )
 
-            self.view.update_items(self.model.location_items())
-            self.view.update_inventory(self.model.player_inventory())
-            self.view.update_dialog(self.state.dialog)
-
         elif self.state.action.command == gs.ActionCommands.DROP:
-            result = self.model.drop_item(self.state.action.target)
+            delta = self.model.drop_item(self.state.action.target)
             
-            if result:
+            if delta:
+                self.prefetcher.invalidate(self._location_id())
                 self.state.dialog = gs.Dialog(
                     type=gs.DialogState.MESSAGE,
-                    message=f'Du hast {result[0]['name']} abgelegt.'
+                    message=f'Du hast {delta['item'][0]['name']} abgelegt.'
                 )
             else:
                 self.state.dialog = gs.Dialog(
@@ -299,9 +425,14 @@ class GameController:
                     message='Ups, nicht da?'
                 )
 
-            self.view.update_items(self.model.location_items())
-            self.view.update_inventory(self.model.player_inventory())
-            self.view.update_dialog(self.state.dialog)
+        else:
+            delta = {}
+
+        # view updates (nur was die Action geändert hat)
+        self._apply_scene(delta)
+        self._update_scene(delta)
+        self.view.update_dialog(self.state.dialog)
+        self.prefetcher.prefetch(self._location_id())
 
         self.state.action = gs.Action()
         self.state.dialog = gs.Dialog()
@@ -310,6 +441,74 @@ class GameController:
         self.view.refresh()
 
 
+    def _location_id(self):
+        """ID der aktuellen Location (aus der gemerkten Szene)."""
+        location = self.scene.get('location')
+        return location[0]['id'] if location else None
+
+    def _apply_scene(self, delta):
+        """
+        Übernimmt ein (Teil-)Szene-Delta in self.scene.
+
+        Die Szene der aktuellen Location (ohne Inventar) wird zusätzlich
+        im Prefetch-Cache abgelegt.
+        """
+        for key in ('location', 'items', 'exits', 'inventory'):
+            if key in delta:
+                self.scene[key] = delta[key]
+
+        location_id = self._location_id()
+        if location_id and all(k in self.scene for k in ('items', 'exits')):
+            self.prefetcher.put(location_id, {
+                'location': self.scene['location'],
+                'items': self.scene['items'],
+                'exits': self.scene['exits'],
+            })
+
+    def _scene_for_match(self):
+        """
+        Szene für das Target-Matching, bevorzugt aus dem Prefetch-Cache.
+
+        Nur wenn die aktuelle Location nicht (mehr) gecacht ist, wird
+        einmal model.scene() gelesen.
+        """
+        cached = self.prefetcher.get(self._location_id())
+        if cached is None or 'inventory' not in self.scene:
+            self._apply_scene(self.model.scene())
+            return self.scene
+        return {**cached, 'inventory': self.scene['inventory']}
+
+    def _update_scene(self, scene):
+        """
+        Updated die Szene-Panels aus einem (Teil-)Szene-Dict.
+
+        Nur vorhandene Keys (location, items, exits, inventory) werden
+        neu gezeichnet.
+        """
+        if 'location' in scene:
+            self.view.update_location(scene['location'])
+        if 'items' in scene:
+            self.view.update_items(scene['items'])
+        if 'exits' in scene:
+            self.view.update_exits(scene['exits'])
+        if 'inventory' in scene:
+            self.view.update_inventory(scene['inventory'])
+
+    def _good_commands(self, commands):
+        """Commands über dem Verb-Threshold, die der Controller auch ausführen kann."""
+        supported = {c.value for c in gs.ActionCommands}
+        return [c for c in commands if c['sim'] >= .95 and c['command'] in supported]
+
+    def _match_targets(self, noun, candidates):
+        """Noun → Targets, lokal über den EntityIndex oder per Top-k in Neo4j."""
+        if self.vector_matching:
+            return self.model.match_entities(self.embedding_utils.encode(noun), candidates)
+        # Szenen-Queries liefern keine Vektoren mehr, fehlende gezielt nachladen
+        missing = [c['id'] for c in candidates if c['id'] not in self.embedding_utils.entity_index]
+        if missing:
+            self.embedding_utils.entity_index.load(self.model.entity_embeddings(missing))
+        return self.embedding_utils.match_entities(noun, candidates)
+
     def _get_target_candidates(self, exits, items, inventory):
         """
         Sammelt alle möglichen Targets für Entity-Matching.
@@ -330,13 +529,27 @@ class GameController:
 
     def _get_choice(self):
 
-        self.state.parse.input = self.view.get_input()
+        with METRICS.span('view.input', exclusive=True):
+            self.state.parse.input = self.view.get_input()
+
+        # quit (im GameServer auch bei getrennter Verbindung) verlässt REQUEST
+        if self.state.parse.input in ['quit','exit',':q']:
+            self.state.running = False
+            self.state.dialog = gs.Dialog()
+            self.state.action = gs.Action()
+            self.state.parse = gs.Parse()
+            self.state.set_state(gs.LoopState.PARSE)
+            return None
 
         if self.state.dialog.type  == gs.DialogState.REQUEST:
             # validierung
             try:
                 choice = int(self.state.parse.input)
             except ValueError:
+                choice = None
+
+            # nur 0 (abbrechen) bis Anzahl der Auswahlen, z.B. nicht 9 oder -1 vom Client
+            if choice is None or not 0 <= choice <= len(self.state.dialog.choices):
                 self.state.dialog.message = "Bitte Zahl eingeben"
                 self.view.update_dialog(self.state.dialog)
                 self.view.refresh()
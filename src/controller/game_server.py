@@ -0,0 +1,227 @@
+"""
+Multi-Session Game Server.
+
+Mehrere Spieler spielen gleichzeitig über TCP (z.B. mit netcat oder
+telnet) in derselben Welt. Parser, Embedding-Model, EntityIndex, Szenen-
+Cache und Backend (inkl. Neo4j Connection-Pool) werden einmal geladen und
+von allen Sessions geteilt. Pro Session gibt es nur GameState, View,
+Controller und einen Player-Node, zusätzliche Spieler kosten damit
+Kilobytes statt einer eigenen Model-Instanz.
+
+Protokoll: Die erste Zeile des Clients ist der Spielername, danach ist
+jede Zeile eine Eingabe wie im Terminal ('quit' beendet die Session).
+
+Mit SERVER_METRICS_PORT liefert ein zweiter Port die Latenz-Histogramme
+per HTTP GET: /metrics im Prometheus-Textformat, /metrics.json als JSON.
+"""
+
+import os
+import re
+import asyncio
+import logging
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dotenv import load_dotenv
+
+from model.backend import DEFAULT_PLAYER_ID
+from model.world_model import GameModel, create_backend, entity_matching
+from model.scene_prefetcher import ScenePrefetcher
+from model.neo4j_backend import env_number
+from view.remote_view import RemoteView
+from controller.game_controller import GameController
+from utils.smart_parser import SmartParserUtils
+from utils.embedding_utils import EmbeddingUtils
+from utils.startup_report import StartupReport
+from utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+PLAYER_NAME_PATTERN = re.compile(r'[\w-]{1,32}')
+
+
+class GameServer:
+    """
+    asyncio TCP-Server mit einem Game Loop pro Session.
+
+    Socket-I/O läuft im Event Loop, die (blockierende) State-Machine des
+    GameControllers in einem Thread-Pool mit SERVER_MAX_SESSIONS Workern.
+    Die Worker-Threads werden wiederverwendet, damit auch die
+    thread-lokalen Neo4j Sessions begrenzt bleiben.
+    """
+
+    def __init__(self, host='127.0.0.1', port=4711, report=None):
+        load_dotenv()
+
+        self.host = host
+        self.port = port
+        self.report = report or StartupReport()
+        self.max_sessions = env_number('SERVER_MAX_SESSIONS', 64, int)
+        self.metrics_port = env_number('SERVER_METRICS_PORT', 0, int)
+
+        # Geteilter Stack, einmal geladen
+        with self.report.phase('Backend Connect + Warm-up'):
+            self.backend = create_backend()
+            self.backend.warm_up()
+            self.model = GameModel(self.backend)
+        with self.report.phase('spaCy laden + Warm-up'):
+            self.parser_utils = SmartParserUtils()
+            self.parser_utils.warm_up()
+        with self.report.phase('Embeddings laden + Warm-up'):
+            self.embedding_utils = EmbeddingUtils()
+            self.embedding_utils.warm_up()
+        with self.report.phase('Entity-Index laden'):
+            if entity_matching() == 'vector':
+                self.model.ensure_vector_indexes(self.embedding_utils.dimensions)
+                entities = self.model.entity_names()
+            else:
+                entities = self.model.entity_embeddings()
+                self.embedding_utils.entity_index.load(entities)
+            self.parser_utils.set_entity_names(
+                [e[key] for e in entities for key in ('name', 'id') if e.get(key)]
+            )
+        self.prefetcher = ScenePrefetcher(self.model)
+
+        self.start_location = os.getenv('GAME_START_LOCATION') or self._default_start_location()
+
+        self.sessions = {}
+        self._sessions_lock = threading.Lock()
+        self._guest_ids = itertools.count(1)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_sessions, thread_name_prefix='session')
+
+    def _default_start_location(self):
+        """Start-Location neuer Spieler: dort wo der Default-Player steht."""
+        location = self.model.current_location()
+        if not location:
+            raise ValueError(
+                f"Player '{DEFAULT_PLAYER_ID}' hat keine Location, GAME_START_LOCATION setzen"
+            )
+        return location[0]['id']
+
+    def close(self):
+        logger.info("=== EncodeScheduler: %s ===", self.embedding_utils.scheduler.stats())
+        logger.info("=== Latenzen:\n%s ===", METRICS.format())
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.prefetcher.close()
+        self.model.close()
+
+    async def serve(self):
+        """Nimmt Verbindungen an, bis der Task abgebrochen wird."""
+        server = await asyncio.start_server(self._handle_client, self.host, self.port)
+        logger.info("=== GameServer auf %s:%s (max %s Sessions) ===", self.host, self.port, self.max_sessions)
+        print(f"RagVenture Server auf {self.host}:{self.port}")
+        if self.metrics_port:
+            metrics_server = await asyncio.start_server(self._handle_metrics, self.host, self.metrics_port)
+            logger.info("=== Metrics auf http://%s:%s/metrics ===", self.host, self.metrics_port)
+            await metrics_server.start_serving()
+        async with server:
+            await server.serve_forever()
+
+    async def _handle_metrics(self, reader, writer):
+        """Minimaler HTTP-Endpoint für die Latenz-Histogramme (ein GET pro Verbindung)."""
+        try:
+            request_line = (await reader.readline()).decode('latin-1').split()
+            path = request_line[1] if len(request_line) > 1 else '/'
+            if path == '/metrics':
+                status, content_type, body = '200 OK', 'text/plain; version=0.0.4', METRICS.to_prometheus()
+            elif path == '/metrics.json':
+                status, content_type, body = '200 OK', 'application/json', METRICS.to_json()
+            else:
+                status, content_type, body = '404 Not Found', 'text/plain', 'nicht gefunden\n'
+            body = body.encode('utf-8')
+            writer.write(
+                f"HTTP/1.0 {status}\r\nContent-Type: {content_type}; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n".encode('latin-1') + body
+            )
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _player_id(self, name):
+        """
+        Prüft den Spielernamen und bildet die Player ID.
+
+        Returns:
+            str | None: Player ID oder None bei ungültigem Namen
+        """
+        name = name.strip() or f"gast{next(self._guest_ids)}"
+        if not PLAYER_NAME_PATTERN.fullmatch(name):
+            return None
+        # Präfix, damit Spielernamen nicht mit Location/Item IDs kollidieren
+        return f"player-{name}"
+
+    def _register(self, player_id):
+        with self._sessions_lock:
+            if player_id in self.sessions:
+                return 'Dieser Name ist schon im Spiel.'
+            if len(self.sessions) >= self.max_sessions:
+                return 'Der Server ist voll, bitte später nochmal versuchen.'
+            self.sessions[player_id] = None
+        return None
+
+    async def _handle_client(self, reader, writer):
+        """Eine TCP-Verbindung = eine Session."""
+        loop = asyncio.get_running_loop()
+
+        writer.write('Name: '.encode('utf-8'))
+        name = (await reader.readline()).decode('utf-8', errors='replace')
+        player_id = self._player_id(name)
+        error = 'Ungültiger Name (Buchstaben, Ziffern, _ und -, max 32).' if player_id is None \
+            else self._register(player_id)
+        if error:
+            writer.write(f"{error}\n".encode('utf-8'))
+            await writer.drain()
+            writer.close()
+            return
+
+        view = RemoteView(loop, writer)
+        with self._sessions_lock:
+            self.sessions[player_id] = view
+        logger.info("=== Session %s verbunden (%s aktiv) ===", player_id, len(self.sessions))
+
+        game = loop.run_in_executor(self._executor, self._run_session, player_id, view)
+        try:
+            while not game.done():
+                read = asyncio.ensure_future(reader.readline())
+                done, _ = await asyncio.wait({read, game}, return_when=asyncio.FIRST_COMPLETED)
+                if read not in done:
+                    read.cancel()
+                    break
+                line = read.result()
+                if not line:
+                    break
+                view.feed(line.decode('utf-8', errors='replace').rstrip('\r\n'))
+        finally:
+            # Session-Thread beenden lassen, falls der Client einfach weg ist
+            view.feed(None)
+            try:
+                await game
+            except Exception:
+                logger.exception("=== Session %s abgebrochen ===", player_id)
+            with self._sessions_lock:
+                self.sessions.pop(player_id, None)
+            if not writer.is_closing():
+                writer.write('Bis bald!\n'.encode('utf-8'))
+                writer.close()
+            logger.info("=== Session %s getrennt (%s aktiv) ===", player_id, len(self.sessions))
+
+    def _run_session(self, player_id, view):
+        """Game Loop einer Session (läuft im Session-Thread)."""
+        model = self.model.for_player(player_id)
+        model.ensure_player(self.start_location)
+
+        controller = GameController(
+            report=StartupReport(),
+            view=view,
+            model=model,
+            parser_utils=self.parser_utils,
+            embedding_utils=self.embedding_utils,
+            prefetcher=self.prefetcher,
+        )
+        controller.state.running = True
+        view.show_welcome()
+        controller._show_first_scene()
+        while controller.state.running:
+            controller._step()
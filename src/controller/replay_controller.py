@@ -0,0 +1,118 @@
+"""
+Headless Replay eines Spielprotokolls.
+
+Schickt die Zeilen einer Replay-Datei durch die echte State-Machine
+(PARSE → MATCH → REQUEST → ACTION) des GameControllers und schreibt pro
+Turn eine JSONL-Zeile mit Ergebnis und Dauer pro Stage. Auswahlen für
+REQUEST-Rückfragen stehen als eigene Zeile direkt nach dem Befehl.
+"""
+
+import json
+import time
+
+import model.game_state as gs
+from view.headless_view import HeadlessView
+from controller.game_controller import GameController
+
+STAGES = {
+    gs.LoopState.PARSE: 'parse',
+    gs.LoopState.MATCH: 'match',
+    gs.LoopState.REQUEST: 'request',
+    gs.LoopState.ACTION: 'action',
+}
+
+
+class ReplayController(GameController):
+    """
+    GameController mit HeadlessView und Turn-Protokoll.
+
+    Ein Turn beginnt mit jeder Eingabe im PARSE-State und endet, sobald
+    die State-Machine wieder in PARSE steht.
+    """
+
+    def __init__(self, replay_path, report=None):
+        super().__init__(report=report, view=HeadlessView.from_file(replay_path))
+        self.turns = []
+
+    def run_game(self, out=None):
+        """
+        Spielt alle Inputs ab.
+
+        Args:
+            out (file): Offene Datei für die JSONL-Turns (optional)
+
+        Returns:
+            list[dict]: Ein Eintrag pro Turn
+        """
+        self.state.running = True
+        self._wait_for_models()
+        self._show_first_scene()
+
+        turn = None
+        while self.state.running and not (self.view.exhausted and turn is None):
+            stage = STAGES[self.state.loop_state]
+            if stage == 'parse':
+                turn = self._new_turn()
+
+            self._record(turn)
+            start = time.perf_counter()
+            self._step()
+            turn['timings_ms'][stage] += (time.perf_counter() - start) * 1000
+            self._record(turn)
+
+            if stage == 'request' and not self.view.exhausted:
+                turn['choices'].append(self.view.last_input)
+
+            # Turn fertig (oder Replay zu Ende mitten in einer Rückfrage)
+            if self.state.loop_state == gs.LoopState.PARSE or self.view.exhausted:
+                if turn['input'] and self.state.running:
+                    self._finish_turn(turn, out)
+                turn = None
+
+        return self.turns
+
+    def _new_turn(self):
+        self.view.messages = []
+        return {
+            'turn': len(self.turns) + 1,
+            'input': None,
+            'verb': None,
+            'noun': None,
+            'command': None,
+            'target': None,
+            'choices': [],
+            'messages': [],
+            'location': None,
+            'inventory': [],
+            'timings_ms': {stage: 0.0 for stage in STAGES.values()},
+        }
+
+    def _record(self, turn):
+        """Übernimmt Parse-/Action-Werte, bevor der nächste Handler sie zurücksetzt."""
+        parse, action = self.state.parse, self.state.action
+        if turn['input'] is None and parse.input and parse.input.strip():
+            turn['input'] = parse.input
+        turn['verb'] = turn['verb'] or parse.verb
+        turn['noun'] = turn['noun'] or parse.noun
+        if action.command:
+            turn['command'] = action.command.value
+        turn['target'] = action.target or turn['target']
+
+    def _finish_turn(self, turn, out):
+        turn['messages'] = list(self.view.messages)
+        turn['location'] = self._location_id()
+        turn['inventory'] = [i['id'] for i in self.scene.get('inventory', [])]
+        turn['total_ms'] = sum(turn['timings_ms'].values())
+        self.turns.append(turn)
+        if out is not None:
+            out.write(json.dumps(turn, ensure_ascii=False) + '\n')
+            out.flush()
+
+    def summary(self):
+        """Kurze Zusammenfassung (Turns, Median/p95/Max der Turn-Dauer)."""
+        totals = sorted(t['total_ms'] for t in self.turns)
+        if not totals:
+            return 'Replay: 0 Turns'
+        p50 = totals[len(totals) // 2]
+        p95 = totals[min(len(totals) - 1, int(len(totals) * .95))]
+        return f'Replay: {len(totals)} Turns, Median {p50:.1f} ms, p95 {p95:.1f} ms, Max {totals[-1]:.1f} ms'
@@ -3,9 +3,28 @@ RagVenture - NLP Text Adventure Game
 
 Entry Point für das Spiel. Initialisiert GameController und startet
 den Main Game Loop mit State-Machine.
+
+Optionen:
+    --async             asyncio Game Loop mit async Neo4j Driver
+    --startup-report    Dauer der Startup-Phasen nach Spielende ausgeben
+    --replay FILE       Inputs aus FILE headless abspielen (ohne Terminal-UI)
+    --out FILE          JSONL-Ergebnis pro Turn für --replay
+    --server            Multi-Session TCP-Server statt lokalem Spiel
+    --host HOST         Adresse für --server (Default: 127.0.0.1)
+    --port PORT         Port für --server (Default: 4711)
+    --import-world FILE Welt-Datei nach Neo4j importieren (inkrementell)
+    --prune             Beim Import Entities löschen, die nicht in FILE stehen
+    --batch-size N      Zeilen pro Transaction beim Import (Default: 1000)
+    --metrics FILE      Latenz-Histogramme bei Spielende schreiben (.json oder Prometheus-Text)
 """
 
-from controller.game_controller import GameController
+import argparse
+import asyncio
+
+from utils.startup_report import StartupReport
+from utils.metrics import METRICS
+from utils.logging_setup import setup_logging
+
 
 def main():
     """
@@ -14,11 +33,148 @@ def main():
     Initialisiert den GameController, startet den Game Loop und
     schließt die DB-Verbindung sauber nach Beendigung.
     """
-    controller = GameController()
+    arg_parser = argparse.ArgumentParser(description='RagVenture - NLP Text Adventure')
+    arg_parser.add_argument(
+        '--async', dest='use_async', action='store_true',
+        help='asyncio Game Loop (Parsing und DB-Reads überlappen)'
+    )
+    arg_parser.add_argument(
+        '--startup-report', action='store_true',
+        help='Zeit pro Startup-Phase ausgeben'
+    )
+    arg_parser.add_argument(
+        '--replay', metavar='FILE',
+        help='Befehle aus FILE headless abspielen (eine Zeile pro Input, Auswahlen als eigene Zeile)'
+    )
+    arg_parser.add_argument(
+        '--out', metavar='FILE', default='results.jsonl',
+        help='JSONL-Ausgabe für --replay (Default: results.jsonl)'
+    )
+    arg_parser.add_argument(
+        '--server', action='store_true',
+        help='Multi-Session TCP-Server (ein Spieler pro Verbindung, geteilte Models)'
+    )
+    arg_parser.add_argument(
+        '--host', default='127.0.0.1',
+        help='Adresse für --server (Default: 127.0.0.1)'
+    )
+    arg_parser.add_argument(
+        '--port', type=int, default=4711,
+        help='Port für --server (Default: 4711)'
+    )
+    arg_parser.add_argument(
+        '--import-world', metavar='FILE',
+        help='Welt-Datei nach Neo4j importieren (Embeddings nur für geänderte Texte)'
+    )
+    arg_parser.add_argument(
+        '--prune', action='store_true',
+        help='Beim Import Locations, Items und NPCs löschen, die nicht in FILE stehen'
+    )
+    arg_parser.add_argument(
+        '--batch-size', type=int, default=1000,
+        help='Zeilen pro Transaction beim Import (Default: 1000)'
+    )
+    arg_parser.add_argument(
+        '--metrics', metavar='FILE',
+        help='Latenz-Histogramme pro Span bei Spielende nach FILE (.json als JSON, sonst Prometheus-Text)'
+    )
+    args = arg_parser.parse_args()
+
+    setup_logging()
+    report = StartupReport()
+
+    try:
+        if args.import_world:
+            run_import(report, args.import_world, args.prune, args.batch_size)
+        elif args.replay:
+            run_replay(report, args.replay, args.out)
+        elif args.server:
+            run_server(report, args.host, args.port)
+        elif args.use_async:
+            asyncio.run(run_async(report))
+        else:
+            run_sync(report)
+    finally:
+        if args.startup_report:
+            print(report.format())
+        if args.metrics:
+            METRICS.write(args.metrics)
+
+
+def run_sync(report):
+    """Startet den GameController und schließt ihn sauber."""
+    with report.phase('Imports'):
+        from controller.game_controller import GameController
+
+    controller = GameController(report=report)
     try:
         controller.run_game()
     finally:
+        controller.prefetcher.close()
+        controller.model.close()
+
+
+def run_replay(report, replay_path, out_path):
+    """Spielt eine Replay-Datei headless ab und schreibt die Turns als JSONL."""
+    with report.phase('Imports'):
+        from controller.replay_controller import ReplayController
+
+    controller = ReplayController(replay_path, report=report)
+    try:
+        with open(out_path, 'w', encoding='utf-8') as out:
+            controller.run_game(out)
+        print(controller.summary())
+    finally:
+        controller.prefetcher.close()
         controller.model.close()
 
+
+def run_import(report, world_path, prune, batch_size):
+    """Importiert eine Welt-Datei nach Neo4j."""
+    with report.phase('Imports'):
+        from model.neo4j_backend import Neo4jBackend
+        from model.world_importer import WorldImporter, load_world
+        from utils.embedding_utils import EmbeddingUtils
+
+    backend = Neo4jBackend()
+    try:
+        importer = WorldImporter(backend, EmbeddingUtils(), batch_size=batch_size)
+        with report.phase('Welt importieren'):
+            stats = importer.run(load_world(world_path), prune=prune)
+        print(
+            f"{stats['nodes']} Nodes ({stats['embedded']} neu embeddet), "
+            f"{stats['relationships']} Relationships, {stats['pruned']} gelöscht "
+            f"in {stats['seconds']:.1f} s"
+        )
+    finally:
+        backend.close()
+
+
+def run_server(report, host, port):
+    """Startet den GameServer bis Ctrl+C."""
+    with report.phase('Imports'):
+        from controller.game_server import GameServer
+
+    server = GameServer(host, port, report=report)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+
+
+async def run_async(report):
+    """Startet den AsyncGameController und schließt ihn sauber."""
+    with report.phase('Imports'):
+        from controller.async_game_controller import AsyncGameController
+
+    controller = AsyncGameController(report=report)
+    try:
+        await controller.run_game()
+    finally:
+        await controller.close()
+
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
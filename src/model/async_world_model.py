@@ -0,0 +1,208 @@
+"""
+Async Neo4j Game Model - asyncio-Variante von GameModel.
+
+Gleiche Queries (model.queries) und gleiche Rückgabeformate wie GameModel,
+aber auf neo4j.AsyncGraphDatabase. Damit kann der AsyncGameController
+DB-Reads starten und parallel parsen/encoden.
+"""
+
+import asyncio
+import logging
+from dotenv import load_dotenv
+from neo4j import AsyncGraphDatabase
+
+from model import queries
+from model.backend import DEFAULT_PLAYER_ID
+from model.embedding_codec import decode_embedding_row
+from model.world_model import MutationCounter
+from model.neo4j_backend import (
+    neo4j_settings, env_number, vector_match_params, missing_candidates, merge_vector_hits
+)
+from utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncGameModel:
+    """
+    Async Model-Komponente im MVC-Pattern.
+
+    Jeder Aufruf nutzt eine eigene kurzlebige AsyncSession (Sessions sind
+    nicht concurrency-safe), die Connections kommen aus dem gemeinsamen
+    Pool. Reads/Writes laufen als Managed Transactions mit Retry.
+    """
+    def __init__(self, player_id=DEFAULT_PLAYER_ID):
+        # .env laden
+        load_dotenv()
+
+        self.player_id = player_id
+        self._mutations = MutationCounter()
+        self._location = None
+
+        driver_config, self.session_config = neo4j_settings()
+        self.driver = AsyncGraphDatabase.driver(**driver_config)
+
+    @property
+    def scene_version(self):
+        """Siehe GameModel.scene_version."""
+        return self._location, self._mutations.value
+
+    def _remember_location(self, rows):
+        """Siehe GameModel._remember_location."""
+        if rows:
+            self._location = rows[0]['id']
+
+    async def close(self):
+        """Schließt Neo4j Driver Connection sauber."""
+        await self.driver.close()
+
+    async def warm_up(self, connections=None):
+        """
+        Öffnet Pool-Connections vor dem ersten Prompt.
+
+        Args:
+            connections (int | None): Anzahl Connections, Default aus
+                NEO4J_WARMUP_CONNECTIONS (2)
+        """
+        connections = connections or env_number('NEO4J_WARMUP_CONNECTIONS', 2, int)
+
+        await self.driver.verify_connectivity()
+        # Gleichzeitige Reads zwingen den Pool, mehrere Connections aufzubauen
+        await asyncio.gather(*[self._read_query('RETURN 1') for _ in range(connections)])
+        logger.info("=== Neo4j warm-up (async): %s Connections ===", connections)
+
+    @staticmethod
+    async def _fetch(tx, query, params):
+        result = await tx.run(query, params)
+        return [record.data() async for record in result]
+
+    async def _read_query(self, query, params=None):
+        """
+        führt eine lesende Query als Managed Transaction aus
+
+        returns:
+            list: liste von dicts mit den ergebnissen
+        """
+        async with self.driver.session(**self.session_config) as session:
+            return await session.execute_read(self._fetch, query, params or {})
+
+    async def _write_query(self, query, params=None):
+        """
+        führt eine schreibende Query als Managed Transaction aus
+
+        returns:
+            list: liste von dicts mit den ergebnissen
+        """
+        async with self.driver.session(**self.session_config) as session:
+            return await session.execute_write(self._fetch, query, params or {})
+
+    @METRICS.timed('model.current_location')
+    async def current_location(self):
+        """Siehe GameModel.current_location."""
+        location = await self._read_query(queries.CURRENT_LOCATION, {'player_id': self.player_id})
+        self._remember_location(location)
+        return location
+
+    @METRICS.timed('model.location_items')
+    async def location_items(self):
+        """Siehe GameModel.location_items."""
+        return await self._read_query(queries.LOCATION_ITEMS, {'player_id': self.player_id})
+
+    @METRICS.timed('model.location_exits')
+    async def location_exits(self):
+        """Siehe GameModel.location_exits."""
+        return await self._read_query(queries.LOCATION_EXITS, {'player_id': self.player_id})
+
+    @METRICS.timed('model.player_inventory')
+    async def player_inventory(self):
+        """Siehe GameModel.player_inventory."""
+        return await self._read_query(queries.PLAYER_INVENTORY, {'player_id': self.player_id})
+
+    @METRICS.timed('model.scene')
+    async def scene(self):
+        """Siehe GameModel.scene."""
+        result = await self._read_query(queries.SCENE, {'player_id': self.player_id})
+        if not result:
+            return {'location': [], 'items': [], 'exits': [], 'inventory': []}
+        self._remember_location(result[0]['location'])
+        return result[0]
+
+    @METRICS.timed('model.entity_embeddings')
+    async def entity_embeddings(self, ids=None):
+        """Siehe GameModel.entity_embeddings."""
+        if ids is None:
+            rows = await self._read_query(queries.ENTITY_EMBEDDINGS)
+        else:
+            rows = await self._read_query(queries.ENTITY_EMBEDDINGS_BY_ID, {'ids': list(ids)})
+        return [decode_embedding_row(row) for row in rows]
+
+    @METRICS.timed('model.entity_names')
+    async def entity_names(self):
+        """Siehe GameModel.entity_names."""
+        return await self._read_query(queries.ENTITY_NAMES)
+
+    async def ensure_vector_indexes(self, dimensions):
+        """Siehe GameModel.ensure_vector_indexes."""
+        rows = await self._read_query(queries.VECTOR_INDEX_DIMENSIONS)
+        existing = {row['name']: row['dimensions'] for row in rows}
+
+        for name, (label, prop) in queries.VECTOR_INDEXES.items():
+            if name in existing and existing[name] == dimensions:
+                continue
+            if name in existing:
+                await self._write_query(queries.DROP_INDEX.format(name=name))
+            await self._write_query(queries.CREATE_VECTOR_INDEX.format(
+                name=name, label=label, property=prop, dimensions=dimensions
+            ))
+        await self._read_query(queries.AWAIT_INDEXES, {'timeout': env_number('NEO4J_INDEX_TIMEOUT', 300, int)})
+
+    @METRICS.timed('model.match_entities')
+    async def match_entities(self, query_emb, candidates, top_k=5):
+        """Siehe GameModel.match_entities."""
+        names = {candidate['id']: candidate['name'] for candidate in candidates}
+        if not names:
+            return []
+
+        params = vector_match_params(query_emb, list(names), top_k)
+        hits = await self._read_query(queries.VECTOR_MATCH, params)
+        extra = []
+        missing = missing_candidates(hits, params)
+        if missing:
+            extra = await self._read_query(queries.VECTOR_SCORE, {**params, 'candidates': missing})
+
+        return [
+            {'target': entity_id, 'name': names[entity_id], 'sim': sim}
+            for entity_id, sim in merge_vector_hits(hits, extra, top_k)
+        ]
+
+    @METRICS.timed('model.neighbourhood')
+    async def neighbourhood(self, location_id):
+        """Siehe GameModel.neighbourhood."""
+        return await self._read_query(queries.NEIGHBOURHOOD, {'location_id': location_id})
+
+    @METRICS.timed('model.move_player')
+    async def move_player(self, to_location, with_scene=True):
+        """Siehe GameModel.move_player."""
+        query = queries.MOVE_PLAYER if with_scene else queries.MOVE_PLAYER_LOCATION
+        result = await self._write_query(query, {'player_id': self.player_id, 'to_location': to_location})
+        delta = result[0] if result else {}
+        self._remember_location(delta.get('location'))
+        return delta
+
+    @METRICS.timed('model.take_item')
+    async def take_item(self, item):
+        """Siehe GameModel.take_item."""
+        try:
+            result = await self._write_query(queries.TAKE_ITEM, {'player_id': self.player_id, 'item': item})
+        finally:
+            self._mutations.bump()
+        return result[0] if result else {}
+
+    @METRICS.timed('model.drop_item')
+    async def drop_item(self, item):
+        """Siehe GameModel.drop_item."""
+        try:
+            result = await self._write_query(queries.DROP_ITEM, {'player_id': self.player_id, 'item': item})
+        finally:
+            self._mutations.bump()
+        return result[0] if result else {}
@@ -0,0 +1,89 @@
+"""
+Backend-Schnittstelle der Spielwelt.
+
+GameModel delegiert alle Reads/Writes an ein GameBackend. Implementiert
+von Neo4jBackend (Cypher über den Driver) und MemoryBackend (Graph im
+Prozess). Alle Backends liefern die gleichen Rückgabeformate, siehe die
+Docstrings in GameModel.
+"""
+
+from abc import ABC, abstractmethod
+
+# Player-Node der Single-Player Welt (siehe notebooks/01-neo4j_dbsetup.ipynb)
+DEFAULT_PLAYER_ID = 'player'
+
+
+class GameBackend(ABC):
+    """
+    Abstrakte Basis für Spielwelt-Backends.
+
+    Lesende Methoden geben Listen von Dicts zurück (wie Neo4j record.data()),
+    schreibende Methoden ein Szene-Delta-Dict oder {} wenn die Action nicht
+    möglich war. Spieler-bezogene Methoden bekommen die player_id, damit
+    ein Backend von mehreren Sessions geteilt werden kann.
+    """
+
+    # Server-seitiges Top-k Matching über Vector Indexes (ENTITY_MATCHING=vector)
+    supports_vector_matching = False
+
+    def warm_up(self, connections=None):
+        """Baut Verbindungen/Caches vor dem ersten Prompt auf (optional)."""
+
+    def close(self):
+        """Gibt Verbindungen frei (optional)."""
+
+    @abstractmethod
+    def current_location(self, player_id):
+        """Siehe GameModel.current_location."""
+
+    @abstractmethod
+    def location_items(self, player_id):
+        """Siehe GameModel.location_items."""
+
+    @abstractmethod
+    def location_exits(self, player_id):
+        """Siehe GameModel.location_exits."""
+
+    @abstractmethod
+    def player_inventory(self, player_id):
+        """Siehe GameModel.player_inventory."""
+
+    @abstractmethod
+    def scene(self, player_id):
+        """Siehe GameModel.scene."""
+
+    @abstractmethod
+    def entity_embeddings(self, ids=None):
+        """Siehe GameModel.entity_embeddings."""
+
+    @abstractmethod
+    def entity_names(self):
+        """Siehe GameModel.entity_names."""
+
+    @abstractmethod
+    def neighbourhood(self, location_id):
+        """Siehe GameModel.neighbourhood."""
+
+    @abstractmethod
+    def move_player(self, player_id, to_location, with_scene=True):
+        """Siehe GameModel.move_player."""
+
+    @abstractmethod
+    def take_item(self, player_id, item):
+        """Siehe GameModel.take_item."""
+
+    @abstractmethod
+    def drop_item(self, player_id, item):
+        """Siehe GameModel.drop_item."""
+
+    @abstractmethod
+    def ensure_player(self, player_id, start_location):
+        """Siehe GameModel.ensure_player."""
+
+    def ensure_vector_indexes(self, dimensions):
+        """Siehe GameModel.ensure_vector_indexes."""
+        raise NotImplementedError(f"{type(self).__name__} hat keine Vector Indexes")
+
+    def match_entities(self, query_emb, candidate_ids, top_k):
+        """Siehe GameModel.match_entities."""
+        raise NotImplementedError(f"{type(self).__name__} hat keine Vector Indexes")
@@ -15,7 +15,7 @@ class CommandTemplate:
     Attributes:
         command (str): Command-Name (go/take/drop/use/examine/read/talk/look)
         verbs (list[str]): Synonym-Liste (Infinitiv + konjugierte Formen)
-        threshold (float): Similarity-Threshold (aktuell unused)
+        threshold (float): Mindest-Similarity damit der Command als Match zählt
     """
     command: str
     verbs:  list[str]  # Liste von Verben (Infinitiv + wichtige Formen)
@@ -0,0 +1,69 @@
+"""
+Kompakter Transport von Embeddings zwischen DB und Prozess.
+
+Als Float-Liste kostet ein 384er Vektor über Bolt ~3,5 KB (9 Byte pro
+Float) und wird in Python zu 384 float-Objekten. Als Byte-Array
+(float16: 768 Byte) kommt er in einem Stück und wird ohne Kopie per
+numpy.frombuffer gelesen.
+"""
+
+import os
+
+import numpy as np
+
+EMBEDDING_DTYPES = ('float16', 'float32')
+EMBEDDING_FIELDS = ('name_emb', 'description_emb', 'synonyms_emb')
+# Labels mit Embeddings (Player haben keine)
+EMBEDDED_LABELS = ('Location', 'Item', 'NPC')
+
+
+def transport_dtype():
+    """Datentyp für neu geschriebene _bin Properties (EMBEDDING_TRANSPORT_DTYPE, Default float16)."""
+    dtype = os.getenv('EMBEDDING_TRANSPORT_DTYPE') or 'float16'
+    if dtype not in EMBEDDING_DTYPES:
+        raise ValueError(f"Unbekannter EMBEDDING_TRANSPORT_DTYPE: '{dtype}' ({', '.join(EMBEDDING_DTYPES)})")
+    return dtype
+
+
+def encode_embedding(vector, dtype='float16'):
+    """
+    Vektor → Byte-Array.
+
+    Args:
+        vector (list | np.ndarray | None): Embedding
+        dtype (str): float16 oder float32
+
+    Returns:
+        bytes | None
+    """
+    if vector is None:
+        return None
+    return np.asarray(vector, dtype=dtype).tobytes()
+
+
+def decode_embedding(value, dtype=None):
+    """
+    Byte-Array oder Float-Liste → np.ndarray.
+
+    Byte-Arrays werden ohne Kopie gelesen (read-only View auf die Bytes).
+
+    Args:
+        value (bytes | list | None): Wert aus der DB
+        dtype (str | None): Datentyp der Bytes (emb_dtype), Default float16
+
+    Returns:
+        np.ndarray | None
+    """
+    if value is None:
+        return None
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return np.frombuffer(value, dtype=dtype or 'float16')
+    return np.asarray(value, dtype=np.float32)
+
+
+def decode_embedding_row(row, fields=EMBEDDING_FIELDS):
+    """Dekodiert die Embedding-Felder einer ENTITY_EMBEDDINGS-Row (in place)."""
+    dtype = row.pop('emb_dtype', None)
+    for field in fields:
+        row[field] = decode_embedding(row.get(field), dtype)
+    return row
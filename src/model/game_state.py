@@ -9,12 +9,8 @@ import logging
 from enum import Enum
 from dataclasses import dataclass, field
 
+logger = logging.getLogger(__name__)
 
-logging.basicConfig(
-    filename='parser_debug.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(message)s'
-)
 
 class LoopState(Enum):
     """State-Machine States für den Game Loop."""
@@ -97,4 +93,4 @@ class GameState:
         """
         old_state = self.loop_state
         self.loop_state = new_state
-        logging.info(f"### {old_state} >>> {new_state}")
\ No newline at end of file
+        logger.debug("### %s >>> %s", old_state, new_state)
\ No newline at end of file
@@ -0,0 +1,357 @@
+"""
+In-Memory Backend - die Spielwelt als Graph im Prozess.
+
+Gleiche Rückgabeformate wie Neo4jBackend, aber ohne Netzwerk-Round-Trip:
+Nodes und Relationships liegen in Dicts mit Adjazenz-Indexen in beide
+Richtungen. Gedacht für Single-Player ohne Docker, Offline-Tests und als
+lokaler Ersatz für die Benchmarks.
+
+Laden aus:
+- Welt-Datei (JSON): {"nodes": [{id, labels, properties}],
+  "relationships": [{from, type, to}]}
+- APOC-Export (JSON Lines), z.B.
+  CALL apoc.export.json.all('world.jsonl', {useTypes: true})
+- einer laufenden Neo4j-Instanz: MemoryBackend.from_neo4j()
+"""
+
+import json
+import logging
+import threading
+
+from model.backend import GameBackend
+from model.embedding_codec import EMBEDDING_FIELDS
+
+logger = logging.getLogger(__name__)
+
+# Projektionen wie in model.queries
+ENTITY_FIELDS = ('id', 'name', 'description')
+INVENTORY_FIELDS = ('id', 'name')
+ITEM_FIELDS = ('id', 'name')
+
+
+class MemoryBackend(GameBackend):
+    """
+    GameBackend auf einem Property-Graph im Speicher.
+
+    Indexe:
+        nodes: id → Properties
+        labels: id → Labels
+        by_label: Label → {id}
+        out / inc: Relationship-Type → {Start-ID → {End-ID}} bzw. umgekehrt
+
+    Die {id: None}-Dicts dienen als geordnete Sets, damit die Reihenfolge
+    der Ergebnisse stabil der Einfüge-Reihenfolge folgt. Alle Zugriffe
+    laufen unter einem Lock (der ScenePrefetcher liest aus einem Thread).
+    """
+
+    def __init__(self, path=None):
+        self.nodes = {}
+        self.labels = {}
+        self.by_label = {}
+        self.out = {}
+        self.inc = {}
+        self._lock = threading.RLock()
+
+        if path:
+            self.load(path)
+
+    # === Graph-Aufbau ===
+
+    def add_node(self, node_id, labels, properties=None):
+        """Fügt einen Node ein oder ersetzt seine Labels/Properties."""
+        with self._lock:
+            for label in self.labels.get(node_id, ()):
+                self.by_label[label].pop(node_id, None)
+            self.nodes[node_id] = {**(properties or {}), 'id': node_id}
+            self.labels[node_id] = frozenset(labels)
+            for label in labels:
+                self.by_label.setdefault(label, {})[node_id] = None
+
+    def add_relationship(self, start, rel_type, end):
+        """Legt eine gerichtete Relationship an (doppelte werden zusammengefasst)."""
+        with self._lock:
+            self.out.setdefault(rel_type, {}).setdefault(start, {})[end] = None
+            self.inc.setdefault(rel_type, {}).setdefault(end, {})[start] = None
+
+    def remove_relationship(self, start, rel_type, end):
+        with self._lock:
+            self.out.get(rel_type, {}).get(start, {}).pop(end, None)
+            self.inc.get(rel_type, {}).get(end, {}).pop(start, None)
+
+    def _targets(self, start, rel_type):
+        return list(self.out.get(rel_type, {}).get(start, ()))
+
+    def _sources(self, end, rel_type):
+        return list(self.inc.get(rel_type, {}).get(end, ()))
+
+    def _has_label(self, node_id, label):
+        return label in self.labels.get(node_id, ())
+
+    def _project(self, node_id, fields):
+        """Map-Projektion wie in Cypher: fehlende Properties → None."""
+        node = self.nodes[node_id]
+        return {field: node.get(field) for field in fields}
+
+    # === Laden / Speichern ===
+
+    def load(self, path):
+        """
+        Lädt eine Welt-Datei oder einen APOC JSON-Lines Export.
+
+        Args:
+            path (str): Pfad zur Datei
+        """
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+
+        try:
+            world = json.loads(text)
+        except json.JSONDecodeError:
+            world = None
+
+        if isinstance(world, dict) and 'nodes' in world:
+            self.load_graph(world['nodes'], world.get('relationships', []))
+        else:
+            self._load_apoc(text)
+        logger.info("=== MemoryBackend: %s Nodes aus %s ===", len(self.nodes), path)
+
+    def load_graph(self, nodes, relationships):
+        """
+        Übernimmt Nodes und Relationships.
+
+        Args:
+            nodes (list[dict]): {id, labels, properties}
+            relationships (list[dict]): {from, type, to}
+        """
+        with self._lock:
+            for node in nodes:
+                self.add_node(node['id'], node['labels'], node.get('properties'))
+            for rel in relationships:
+                self.add_relationship(rel['from'], rel['type'], rel['to'])
+
+    def _load_apoc(self, text):
+        """APOC-Export: interne Neo4j-IDs werden auf die id-Property gemappt."""
+        internal = {}
+        relationships = []
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            if row['type'] == 'node':
+                properties = row.get('properties', {})
+                internal[row['id']] = properties.get('id', row['id'])
+                self.add_node(internal[row['id']], row.get('labels', []), properties)
+            elif row['type'] == 'relationship':
+                relationships.append(row)
+
+        for row in relationships:
+            self.add_relationship(internal[row['start']['id']], row['label'], internal[row['end']['id']])
+
+    def save(self, path):
+        """Schreibt die Welt (inkl. aktuellem Spielstand) als Welt-Datei."""
+        with self._lock:
+            world = {
+                'nodes': [
+                    {
+                        'id': node_id,
+                        'labels': sorted(self.labels[node_id]),
+                        # Byte-Arrays (_bin) sind aus den Float-Listen ableitbar
+                        'properties': {
+                            k: v for k, v in props.items()
+                            if k not in ('id', 'emb_dtype') and not isinstance(v, (bytes, bytearray))
+                        },
+                    }
+                    for node_id, props in self.nodes.items()
+                ],
+                'relationships': [
+                    {'from': start, 'type': rel_type, 'to': end}
+                    for rel_type, starts in self.out.items()
+                    for start, ends in starts.items()
+                    for end in ends
+                ],
+            }
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(world, f, ensure_ascii=False)
+
+    @classmethod
+    def from_neo4j(cls, backend=None):
+        """
+        Snapshot einer laufenden Neo4j-Instanz.
+
+        Args:
+            backend (Neo4jBackend | None): Bestehendes Backend, sonst aus .env
+
+        Returns:
+            MemoryBackend
+        """
+        from model.neo4j_backend import Neo4jBackend
+
+        source = backend or Neo4jBackend()
+        try:
+            nodes, relationships = source.export_graph()
+        finally:
+            if backend is None:
+                source.close()
+
+        memory = cls()
+        memory.load_graph(nodes, relationships)
+        return memory
+
+    # === Szene ===
+
+    def _player_location(self, player_id):
+        for location in self._targets(player_id, 'IST_IN'):
+            if self._has_label(location, 'Location'):
+                return location
+        return None
+
+    def _items_at(self, location):
+        # Alles was IST_IN der Location ist, außer Player (wie LOCATION_ITEMS)
+        return [
+            self._project(node_id, ENTITY_FIELDS)
+            for node_id in self._sources(location, 'IST_IN')
+            if not self._has_label(node_id, 'Player')
+        ]
+
+    def _exits_of(self, location):
+        return [
+            self._project(node_id, ENTITY_FIELDS)
+            for node_id in self._targets(location, 'ERREICHT')
+            if self._has_label(node_id, 'Location')
+        ]
+
+    def _inventory(self, player_id):
+        return [
+            self._project(node_id, INVENTORY_FIELDS)
+            for node_id in self._targets(player_id, 'TRÄGT')
+            if self._has_label(node_id, 'Item')
+        ]
+
+    def current_location(self, player_id):
+        with self._lock:
+            location = self._player_location(player_id)
+            return [self._project(location, ENTITY_FIELDS)] if location else []
+
+    def location_items(self, player_id):
+        with self._lock:
+            location = self._player_location(player_id)
+            return self._items_at(location) if location else []
+
+    def location_exits(self, player_id):
+        with self._lock:
+            location = self._player_location(player_id)
+            return self._exits_of(location) if location else []
+
+    def player_inventory(self, player_id):
+        with self._lock:
+            return self._inventory(player_id)
+
+    def scene(self, player_id):
+        with self._lock:
+            location = self._player_location(player_id)
+            if location is None:
+                return {'location': [], 'items': [], 'exits': [], 'inventory': []}
+            return {
+                'location': [self._project(location, ENTITY_FIELDS)],
+                'items': self._items_at(location),
+                'exits': self._exits_of(location),
+                'inventory': self._inventory(player_id),
+            }
+
+    def _entity_ids(self):
+        ids = {}
+        for label in ('Location', 'Item', 'NPC'):
+            ids.update(self.by_label.get(label, {}))
+        return ids
+
+    def _embedding_row(self, node_id):
+        """Wie ENTITY_EMBEDDING_PROJECTION: _bin Property vor Float-Liste."""
+        node = self.nodes[node_id]
+        row = {'id': node_id, 'name': node.get('name'), 'emb_dtype': node.get('emb_dtype')}
+        for field in EMBEDDING_FIELDS:
+            value = node.get(f'{field}_bin')
+            row[field] = value if value is not None else node.get(field)
+        return row
+
+    def entity_embeddings(self, ids=None):
+        with self._lock:
+            entity_ids = self._entity_ids()
+            if ids is not None:
+                entity_ids = [node_id for node_id in ids if node_id in entity_ids]
+            return [self._embedding_row(node_id) for node_id in entity_ids]
+
+    def entity_names(self):
+        with self._lock:
+            return [self._project(node_id, ITEM_FIELDS) for node_id in self._entity_ids()]
+
+    def neighbourhood(self, location_id):
+        with self._lock:
+            if not self._has_label(location_id, 'Location'):
+                return []
+            locations = {location_id: None}
+            locations.update({exit['id']: None for exit in self._exits_of(location_id)})
+            return [
+                {
+                    'id': location,
+                    'location': [self._project(location, ENTITY_FIELDS)],
+                    'items': self._items_at(location),
+                    'exits': self._exits_of(location),
+                }
+                for location in locations
+            ]
+
+    # === Actions ===
+
+    def move_player(self, player_id, to_location, with_scene=True):
+        with self._lock:
+            current = self._player_location(player_id)
+            if current is None or to_location not in self._targets(current, 'ERREICHT') \
+                    or not self._has_label(to_location, 'Location'):
+                return {}
+
+            self.remove_relationship(player_id, 'IST_IN', current)
+            self.add_relationship(player_id, 'IST_IN', to_location)
+
+            delta = {'location': [self._project(to_location, ENTITY_FIELDS)]}
+            if with_scene:
+                delta['items'] = self._items_at(to_location)
+                delta['exits'] = self._exits_of(to_location)
+            return delta
+
+    def take_item(self, player_id, item):
+        with self._lock:
+            location = self._player_location(player_id)
+            if location is None or not self._has_label(item, 'Item') \
+                    or location not in self._targets(item, 'IST_IN'):
+                return {}
+
+            self.remove_relationship(item, 'IST_IN', location)
+            self.add_relationship(player_id, 'TRÄGT', item)
+            return self._item_delta(player_id, item, location)
+
+    def drop_item(self, player_id, item):
+        with self._lock:
+            location = self._player_location(player_id)
+            if location is None or not self._has_label(item, 'Item') \
+                    or item not in self._targets(player_id, 'TRÄGT'):
+                return {}
+
+            self.remove_relationship(player_id, 'TRÄGT', item)
+            self.add_relationship(item, 'IST_IN', location)
+            return self._item_delta(player_id, item, location)
+
+    def ensure_player(self, player_id, start_location):
+        with self._lock:
+            if player_id not in self.nodes:
+                self.add_node(player_id, ['Player'], {
+                    'name': player_id, 'description': 'Ein weiterer Abenteurer.'
+                })
+            if self._player_location(player_id) is None and self._has_label(start_location, 'Location'):
+                self.add_relationship(player_id, 'IST_IN', start_location)
+
+    def _item_delta(self, player_id, item, location):
+        return {
+            'item': [self._project(item, ITEM_FIELDS)],
+            'items': self._items_at(location),
+            'inventory': self._inventory(player_id),
+        }
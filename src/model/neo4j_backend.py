@@ -0,0 +1,365 @@
+"""
+Neo4j Backend - DB-Zugriff für die Spielwelt über Cypher.
+
+Verwaltet Driver, Pool-Konfiguration und thread-lokale Sessions und
+führt die Queries aus model.queries als Managed Transactions aus.
+"""
+
+import os
+import logging
+import threading
+from dotenv import load_dotenv
+from neo4j import GraphDatabase
+
+from model import queries
+from model.backend import GameBackend
+from model.embedding_codec import EMBEDDED_LABELS, EMBEDDING_FIELDS, encode_embedding, transport_dtype
+
+logger = logging.getLogger(__name__)
+
+
+def env_number(name, default, cast=float):
+    """Liest eine Zahl aus der .env, leere Werte ergeben den Default."""
+    value = os.getenv(name)
+    return cast(value) if value else default
+
+
+def neo4j_settings():
+    """
+    Liest Driver- und Session-Konfiguration aus der .env.
+
+    Returns:
+        tuple[dict, dict]: (Driver-kwargs, Session-kwargs)
+    """
+    driver_config = {
+        'uri': os.getenv('NEO4J_URI'),
+        'auth': (
+            os.getenv('NEO4J_USER'),
+            os.getenv('NEO4J_PASSWORD')
+        ),
+        'max_connection_pool_size': env_number('NEO4J_MAX_POOL_SIZE', 100, int),
+        'connection_acquisition_timeout': env_number('NEO4J_ACQUISITION_TIMEOUT', 60.0),
+        'liveness_check_timeout': env_number('NEO4J_LIVENESS_CHECK_TIMEOUT', None),
+        'max_transaction_retry_time': env_number('NEO4J_MAX_RETRY_TIME', 30.0),
+        # 'notifications_min_severity': 'OFF'
+    }
+    session_config = {
+        'database': os.getenv('NEO4J_DATABASE') or None,
+        'fetch_size': env_number('NEO4J_FETCH_SIZE', 1000, int),
+    }
+    return driver_config, session_config
+
+
+def vector_match_params(query_emb, candidate_ids, top_k):
+    """
+    Parameter für VECTOR_MATCH / VECTOR_SCORE.
+
+    Der Index liefert ein globales Top-k über die ganze Welt, erst danach
+    wird auf die Kandidaten gefiltert. Deshalb wird mit NEO4J_VECTOR_K
+    (Default 100) deutlich mehr als top_k angefragt.
+    """
+    return {
+        'query': [float(x) for x in query_emb],
+        'candidates': list(candidate_ids),
+        'top_k': top_k,
+        'k': max(top_k, env_number('NEO4J_VECTOR_K', 100, int)),
+        'indexes': queries.MATCH_VECTOR_INDEXES,
+    }
+
+
+def missing_candidates(hits, params):
+    """Kandidaten, die exakt nachgerechnet werden müssen (nicht im Index-Top-k)."""
+    if len(hits) >= min(params['top_k'], len(params['candidates'])):
+        return []
+    found = {hit['id'] for hit in hits}
+    return [c for c in params['candidates'] if c not in found]
+
+
+def merge_vector_hits(hits, extra, top_k):
+    """Index-Treffer + exakt nachgerechnete Kandidaten → [(id, sim)] absteigend."""
+    hits = sorted(hits + extra, key=lambda hit: hit['sim'], reverse=True)
+    return [(hit['id'], hit['sim']) for hit in hits[:top_k]]
+
+
+class Neo4jBackend(GameBackend):
+    """
+    GameBackend auf Neo4j.
+
+    Reads laufen über execute_read, Writes über execute_write (Managed
+    Transactions mit Retry bei transienten Fehlern). Jeder Thread nutzt
+    eine eigene, wiederverwendete Session.
+    """
+    supports_vector_matching = True
+
+    def __init__(self):
+        # .env laden
+        load_dotenv()
+
+        # DB driver mit Pool-Konfiguration erstellen
+        driver_config, self.session_config = neo4j_settings()
+        self.driver = GraphDatabase.driver(**driver_config)
+
+        self._local = threading.local()
+        self._sessions = []
+        self._sessions_lock = threading.Lock()
+
+    def close(self):
+        """Schließt alle Sessions und die Neo4j Driver Connection sauber."""
+        with self._sessions_lock:
+            for session in self._sessions:
+                session.close()
+            self._sessions = []
+        self.driver.close()
+
+    def warm_up(self, connections=None):
+        """
+        Öffnet Pool-Connections vor dem ersten Prompt.
+
+        Hält kurz mehrere Transactions gleichzeitig offen, damit der Pool
+        entsprechend viele Connections (inkl. Handshake und Auth) aufbaut.
+
+        Args:
+            connections (int | None): Anzahl Connections, Default aus
+                NEO4J_WARMUP_CONNECTIONS (2)
+        """
+        connections = connections or env_number('NEO4J_WARMUP_CONNECTIONS', 2, int)
+
+        self.driver.verify_connectivity()
+
+        sessions = [self.driver.session(**self.session_config) for _ in range(connections)]
+        transactions = []
+        try:
+            for session in sessions:
+                tx = session.begin_transaction()
+                transactions.append(tx)
+                tx.run('RETURN 1').consume()
+        finally:
+            for tx in transactions:
+                tx.close()
+            for session in sessions:
+                session.close()
+
+        # Session des aktuellen Threads gleich mit anlegen
+        self._read_query('RETURN 1')
+        logger.info("=== Neo4j warm-up: %s Connections ===", connections)
+
+    def _session(self):
+        """Gibt die wiederverwendete Session des aktuellen Threads zurück."""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self.driver.session(**self.session_config)
+            self._local.session = session
+            with self._sessions_lock:
+                self._sessions.append(session)
+        return session
+
+    @staticmethod
+    def _fetch(tx, query, params):
+        result = tx.run(query, params)
+        return [record.data() for record in result]
+
+    def _read_query(self, query, params=None):
+        """
+        führt eine lesende Query als Managed Transaction aus
+
+        args:
+            query (str): cypher query
+            params (dict): queryparameter
+
+        returns:
+            list: liste von dicts mit den ergebnissen
+        """
+        return self._session().execute_read(self._fetch, query, params or {})
+
+    def _write_query(self, query, params=None):
+        """
+        führt eine schreibende Query als Managed Transaction aus
+
+        args:
+            query (str): cypher query
+            params (dict): queryparameter
+
+        returns:
+            list: liste von dicts mit den ergebnissen
+        """
+        return self._session().execute_write(self._fetch, query, params or {})
+
+    def current_location(self, player_id):
+        return self._read_query(queries.CURRENT_LOCATION, {'player_id': player_id})
+
+    def location_items(self, player_id):
+        return self._read_query(queries.LOCATION_ITEMS, {'player_id': player_id})
+
+    def location_exits(self, player_id):
+        return self._read_query(queries.LOCATION_EXITS, {'player_id': player_id})
+
+    def player_inventory(self, player_id):
+        return self._read_query(queries.PLAYER_INVENTORY, {'player_id': player_id})
+
+    def scene(self, player_id):
+        result = self._read_query(queries.SCENE, {'player_id': player_id})
+        if not result:
+            return {'location': [], 'items': [], 'exits': [], 'inventory': []}
+        return result[0]
+
+    def entity_embeddings(self, ids=None):
+        if ids is None:
+            return self._read_query(queries.ENTITY_EMBEDDINGS)
+        return self._read_query(queries.ENTITY_EMBEDDINGS_BY_ID, {'ids': list(ids)})
+
+    def entity_names(self):
+        return self._read_query(queries.ENTITY_NAMES)
+
+    def neighbourhood(self, location_id):
+        return self._read_query(queries.NEIGHBOURHOOD, {'location_id': location_id})
+
+    def move_player(self, player_id, to_location, with_scene=True):
+        query = queries.MOVE_PLAYER if with_scene else queries.MOVE_PLAYER_LOCATION
+        result = self._write_query(query, {'player_id': player_id, 'to_location': to_location})
+        return result[0] if result else {}
+
+    def take_item(self, player_id, item):
+        result = self._write_query(queries.TAKE_ITEM, {'player_id': player_id, 'item': item})
+        return result[0] if result else {}
+
+    def drop_item(self, player_id, item):
+        result = self._write_query(queries.DROP_ITEM, {'player_id': player_id, 'item': item})
+        return result[0] if result else {}
+
+    def ensure_player(self, player_id, start_location):
+        self._write_query(queries.ENSURE_PLAYER, {'player_id': player_id, 'start_location': start_location})
+
+    def ensure_vector_indexes(self, dimensions):
+        existing = {row['name']: row['dimensions'] for row in self._read_query(queries.VECTOR_INDEX_DIMENSIONS)}
+
+        for name, (label, prop) in queries.VECTOR_INDEXES.items():
+            if name in existing and existing[name] == dimensions:
+                continue
+            if name in existing:
+                logger.info("=== Vector Index %s: %s → %s Dimensionen ===", name, existing[name], dimensions)
+                self._write_query(queries.DROP_INDEX.format(name=name))
+            self._write_query(queries.CREATE_VECTOR_INDEX.format(
+                name=name, label=label, property=prop, dimensions=dimensions
+            ))
+        self._read_query(queries.AWAIT_INDEXES, {'timeout': env_number('NEO4J_INDEX_TIMEOUT', 300, int)})
+
+    def match_entities(self, query_emb, candidate_ids, top_k):
+        params = vector_match_params(query_emb, candidate_ids, top_k)
+        hits = self._read_query(queries.VECTOR_MATCH, params)
+
+        extra = []
+        missing = missing_candidates(hits, params)
+        if missing:
+            extra = self._read_query(queries.VECTOR_SCORE, {**params, 'candidates': missing})
+        return merge_vector_hits(hits, extra, top_k)
+
+    def export_graph(self):
+        """
+        Liest den kompletten Graph (für MemoryBackend.from_neo4j).
+
+        Returns:
+            tuple[list[dict], list[dict]]: (Nodes mit id, labels, properties;
+                Relationships mit from, type, to)
+        """
+        nodes = [
+            {**row, 'properties': dict(row['properties'])}
+            for row in self._read_query(queries.ALL_NODES)
+        ]
+        return nodes, self._read_query(queries.ALL_RELATIONSHIPS)
+
+    def store_compact_embeddings(self, dtype=None, batch_size=500):
+        """
+        Schreibt die Embeddings zusätzlich als Byte-Arrays (<feld>_bin).
+
+        Die Float-Listen bleiben für die Vector Indexes erhalten. Nötig
+        einmal pro bestehender Welt, danach lesen ENTITY_EMBEDDINGS und
+        ENTITY_EMBEDDINGS_BY_ID die kompakte Variante.
+
+        Args:
+            dtype (str | None): float16 oder float32 (Default: EMBEDDING_TRANSPORT_DTYPE)
+            batch_size (int): Nodes pro Transaction
+
+        Returns:
+            int: Anzahl aktualisierter Nodes
+        """
+        dtype = dtype or transport_dtype()
+        written = 0
+        for label in EMBEDDED_LABELS:
+            rows = [
+                {
+                    'id': row['id'],
+                    **{field: encode_embedding(row[field], dtype) for field in EMBEDDING_FIELDS},
+                }
+                for row in self._read_query(queries.ENTITY_FLOAT_EMBEDDINGS.format(label=label))
+            ]
+            self._write_batches(
+                queries.STORE_COMPACT_EMBEDDINGS.format(label=label), rows, batch_size, {'dtype': dtype}
+            )
+            written += len(rows)
+        logger.info("=== Kompakte Embeddings (%s) für %s Nodes geschrieben ===", dtype, written)
+        return written
+
+    def _write_batches(self, query, rows, batch_size, params=None, key='rows'):
+        """Schreibt rows in Blöcken von batch_size, eine Transaction pro Block."""
+        for start in range(0, len(rows), batch_size):
+            self._write_query(query, {**(params or {}), key: rows[start:start + batch_size]})
+
+    # ------------------------------------------------------------------
+    # Bulk-Import (model.world_importer)
+
+    def ensure_id_constraints(self, labels):
+        """Unique-Constraint (und damit Index) auf id pro Label, Voraussetzung für MERGE."""
+        for label in labels:
+            self._write_query(queries.CREATE_ID_CONSTRAINT.format(name=f'{label.lower()}_id', label=label))
+
+    def text_hashes(self, labels):
+        """
+        Gespeicherte Text-Hashes der Embeddings.
+
+        Returns:
+            dict: Entity ID → text_hash
+        """
+        hashes = {}
+        for label in labels:
+            for row in self._read_query(queries.TEXT_HASHES.format(label=label)):
+                hashes[row['id']] = row['text_hash']
+        return hashes
+
+    def import_nodes(self, label, rows, batch_size=1000):
+        """
+        Legt Nodes an oder aktualisiert ihre Properties (MERGE auf id).
+
+        Args:
+            label (str): Node-Label
+            rows (list[dict]): {id, properties}
+            batch_size (int): Nodes pro Transaction
+        """
+        self._write_batches(queries.IMPORT_NODES.format(label=label), rows, batch_size)
+
+    def reset_positions(self, label, ids, batch_size=1000):
+        """Entfernt IST_IN und eingehende TRÄGT Relationships der Nodes."""
+        self._write_batches(queries.RESET_POSITIONS.format(label=label), list(ids), batch_size, key='ids')
+
+    def import_relationships(self, rel_type, from_label, to_label, rows, batch_size=1000):
+        """
+        Legt Relationships an (MERGE, doppelte Imports erzeugen keine Duplikate).
+
+        Args:
+            rel_type (str): Relationship-Type
+            from_label (str): Label der Start-Nodes
+            to_label (str): Label der End-Nodes
+            rows (list[dict]): {from, to}
+            batch_size (int): Relationships pro Transaction
+        """
+        query = queries.IMPORT_RELATIONSHIPS.format(type=rel_type, from_label=from_label, to_label=to_label)
+        self._write_batches(query, rows, batch_size)
+
+    def prune_nodes(self, label, keep_ids):
+        """
+        Löscht alle Nodes des Labels, die nicht in keep_ids stehen.
+
+        Returns:
+            int: Anzahl gelöschter Nodes
+        """
+        result = self._write_query(queries.PRUNE_NODES.format(label=label), {'ids': list(keep_ids)})
+        return result[0]['deleted'] if result else 0
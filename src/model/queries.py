@@ -0,0 +1,303 @@
+"""
+Cypher Queries der Spielwelt.
+
+Gemeinsame Query-Strings für GameModel und AsyncGameModel, damit beide
+Varianten garantiert die gleichen Statements ausführen. Der Spieler kommt
+immer als $player_id, damit mehrere Sessions eine Welt teilen können.
+"""
+
+CURRENT_LOCATION = """
+    MATCH (p:Player {id: $player_id})-[:IST_IN]->(location:Location)
+    RETURN 
+        location.id AS id, 
+        location.name AS name, 
+        location.description AS description
+    """
+
+LOCATION_ITEMS = """
+    MATCH (p:Player {id: $player_id})-[:IST_IN]->(loc:Location)
+    MATCH (item)-[:IST_IN]->(loc)
+    WHERE NOT item:Player
+    RETURN 
+        item.id AS id, 
+        item.name AS name, 
+        item.description AS description
+    """
+
+LOCATION_EXITS = """
+    MATCH (p:Player {id: $player_id})-[:IST_IN]->(location:Location)
+    MATCH (location)-[:ERREICHT]->(exit:Location)
+    RETURN
+        exit.id AS id, 
+        exit.name AS name, 
+        exit.description AS description
+    """
+
+PLAYER_INVENTORY = """
+    MATCH (p:Player {id: $player_id})-[:TRÄGT]->(inventory:Item)
+    RETURN 
+        inventory.id AS id,
+        inventory.name AS name
+    """
+
+SCENE = """
+    MATCH (p:Player {id: $player_id})-[:IST_IN]->(loc:Location)
+    RETURN
+        [loc {.id, .name, .description}] AS location,
+        [(item)-[:IST_IN]->(loc) WHERE NOT item:Player
+            | item {.id, .name, .description}] AS items,
+        [(loc)-[:ERREICHT]->(exit:Location)
+            | exit {.id, .name, .description}] AS exits,
+        [(p)-[:TRÄGT]->(inventory:Item)
+            | inventory {.id, .name}] AS inventory
+    """
+
+# Matching-Projektion: Embeddings kompakt als Byte-Array (<feld>_bin,
+# Datentyp in emb_dtype), Fallback auf die Float-Listen für Welten ohne
+# _bin Properties. Dekodiert wird in GameModel.entity_embeddings.
+ENTITY_EMBEDDING_PROJECTION = """
+    RETURN
+        n.id AS id,
+        n.name AS name,
+        n.emb_dtype AS emb_dtype,
+        coalesce(n.name_emb_bin, n.name_emb) AS name_emb,
+        coalesce(n.description_emb_bin, n.description_emb) AS description_emb,
+        coalesce(n.synonyms_emb_bin, n.synonyms_emb) AS synonyms_emb
+    """
+
+ENTITY_EMBEDDINGS = """
+    MATCH (n)
+    WHERE n:Location OR n:Item OR n:NPC
+    """ + ENTITY_EMBEDDING_PROJECTION
+
+ENTITY_EMBEDDINGS_BY_ID = """
+    CALL {
+        MATCH (n:Location) WHERE n.id IN $ids RETURN n
+        UNION
+        MATCH (n:Item) WHERE n.id IN $ids RETURN n
+        UNION
+        MATCH (n:NPC) WHERE n.id IN $ids RETURN n
+    }
+    """ + ENTITY_EMBEDDING_PROJECTION
+
+# Float-Listen (Quelle für die _bin Properties und die Vector Indexes), pro Label
+ENTITY_FLOAT_EMBEDDINGS = """
+    MATCH (n:{label})
+    RETURN
+        n.id AS id,
+        n.name_emb AS name_emb,
+        n.description_emb AS description_emb,
+        n.synonyms_emb AS synonyms_emb
+    """
+
+# Label im Pattern, damit Neo4j den id-Index nutzt statt AllNodesScan pro Row
+STORE_COMPACT_EMBEDDINGS = """
+    UNWIND $rows AS row
+    MATCH (n:{label} {{id: row.id}})
+    SET n.emb_dtype = $dtype,
+        n.name_emb_bin = row.name_emb,
+        n.description_emb_bin = row.description_emb,
+        n.synonyms_emb_bin = row.synonyms_emb
+    """
+
+MOVE_PLAYER = """
+    MATCH (p:Player {id: $player_id})-[old:IST_IN]->(current:Location)
+    MATCH (current)-[:ERREICHT]->(target:Location {id: $to_location})
+    DELETE old
+    CREATE (p)-[:IST_IN]->(target)
+    RETURN
+        [target {.id, .name, .description}] AS location,
+        [(item)-[:IST_IN]->(target) WHERE NOT item:Player
+            | item {.id, .name, .description}] AS items,
+        [(target)-[:ERREICHT]->(exit:Location)
+            | exit {.id, .name, .description}] AS exits
+    """
+
+TAKE_ITEM = """
+    MATCH (p:Player {id: $player_id})-[:IST_IN]->(loc:Location)
+    MATCH (i:Item {id: $item})-[old:IST_IN]->(loc)
+    DELETE old
+    CREATE (p)-[:TRÄGT]->(i)
+    RETURN
+        [i {.id, .name}] AS item,
+        [(item)-[:IST_IN]->(loc) WHERE NOT item:Player
+            | item {.id, .name, .description}] AS items,
+        [(p)-[:TRÄGT]->(inventory:Item)
+            | inventory {.id, .name}] AS inventory
+    """
+
+DROP_ITEM = """
+    MATCH (p:Player {id: $player_id})-[old:TRÄGT]->(i:Item {id: $item})
+    MATCH (p)-[:IST_IN]->(loc:Location)
+    DELETE old
+    CREATE (i)-[:IST_IN]->(loc)
+    RETURN
+        [i {.id, .name}] AS item,
+        [(item)-[:IST_IN]->(loc) WHERE NOT item:Player
+            | item {.id, .name, .description}] AS items,
+        [(p)-[:TRÄGT]->(inventory:Item)
+            | inventory {.id, .name}] AS inventory
+    """
+
+MOVE_PLAYER_LOCATION = """
+    MATCH (p:Player {id: $player_id})-[old:IST_IN]->(current:Location)
+    MATCH (current)-[:ERREICHT]->(target:Location {id: $to_location})
+    DELETE old
+    CREATE (p)-[:IST_IN]->(target)
+    RETURN
+        [target {.id, .name, .description}] AS location
+    """
+
+NEIGHBOURHOOD = """
+    MATCH (start:Location {id: $location_id})
+    MATCH (loc:Location)
+    WHERE loc = start OR (start)-[:ERREICHT]->(loc)
+    RETURN
+        loc.id AS id,
+        [loc {.id, .name, .description}] AS location,
+        [(item)-[:IST_IN]->(loc) WHERE NOT item:Player
+            | item {.id, .name, .description}] AS items,
+        [(loc)-[:ERREICHT]->(exit:Location)
+            | exit {.id, .name, .description}] AS exits
+    """
+
+ALL_NODES = """
+    MATCH (n)
+    RETURN
+        n.id AS id,
+        labels(n) AS labels,
+        [key IN keys(n) WHERE NOT key ENDS WITH '_bin' AND key <> 'emb_dtype'
+            | [key, n[key]]] AS properties
+    """
+
+ALL_RELATIONSHIPS = """
+    MATCH (a)-[r]->(b)
+    RETURN
+        a.id AS from,
+        type(r) AS type,
+        b.id AS to
+    """
+
+ENSURE_PLAYER = """
+    MERGE (p:Player {id: $player_id})
+    ON CREATE SET p.name = $player_id, p.description = 'Ein weiterer Abenteurer.'
+    WITH p
+    MATCH (start:Location {id: $start_location})
+    WHERE NOT (p)-[:IST_IN]->(:Location)
+    CREATE (p)-[:IST_IN]->(start)
+    """
+
+ENTITY_NAMES = """
+    MATCH (n)
+    WHERE n:Location OR n:Item OR n:NPC
+    RETURN n.id AS id, n.name AS name
+    """
+
+# Vector Indexes: Name → (Label, Property). Die Dimension muss zum
+# Embedding-Model passen (paraphrase-multilingual-MiniLM-L12-v2: 384).
+VECTOR_INDEXES = {
+    'location_name_index': ('Location', 'name_emb'),
+    'location_description_index': ('Location', 'description_emb'),
+    'item_name_index': ('Item', 'name_emb'),
+    'item_description_index': ('Item', 'description_emb'),
+    'item_synonyms_index': ('Item', 'synonyms_emb'),
+    'npc_name_index': ('NPC', 'name_emb'),
+    'npc_description_index': ('NPC', 'description_emb'),
+}
+
+# Indexe die beim Noun-Matching zählen (wie MATCH_FIELDS in EmbeddingUtils)
+MATCH_VECTOR_INDEXES = ['location_name_index', 'item_name_index', 'item_synonyms_index', 'npc_name_index']
+
+VECTOR_INDEX_DIMENSIONS = """
+    SHOW VECTOR INDEXES YIELD name, options
+    RETURN name, options.indexConfig['vector.dimensions'] AS dimensions
+    """
+
+# Schema-Statements können keine Parameter für Namen nutzen → str.format
+CREATE_VECTOR_INDEX = """
+    CREATE VECTOR INDEX {name} IF NOT EXISTS
+    FOR (n:{label}) ON n.{property}
+    OPTIONS {{indexConfig: {{
+      `vector.dimensions`: {dimensions},
+      `vector.similarity_function`: 'cosine'
+    }}}}
+    """
+
+DROP_INDEX = """
+    DROP INDEX {name} IF EXISTS
+    """
+
+AWAIT_INDEXES = """
+    CALL db.awaitIndexes($timeout)
+    """
+
+# Top-k über die Vector Indexes, gefiltert auf die Kandidaten. Neo4j
+# normalisiert Cosine auf [0, 1] → 2 * score - 1 ergibt die Cosine Similarity.
+VECTOR_MATCH = """
+    UNWIND $indexes AS index
+    CALL db.index.vector.queryNodes(index, $k, $query) YIELD node, score
+    WITH node, score
+    WHERE node.id IN $candidates
+    WITH node.id AS id, max(score) AS score
+    RETURN id, 2 * score - 1 AS sim
+    ORDER BY sim DESC
+    LIMIT $top_k
+    """
+
+# Exakte Similarity für Kandidaten, die nicht im globalen Top-k des Index waren
+VECTOR_SCORE = """
+    CALL {
+        MATCH (e:Location) WHERE e.id IN $candidates RETURN e
+        UNION
+        MATCH (e:Item) WHERE e.id IN $candidates RETURN e
+        UNION
+        MATCH (e:NPC) WHERE e.id IN $candidates RETURN e
+    }
+    WITH e.id AS id, [emb IN [e.name_emb, e.synonyms_emb] WHERE emb IS NOT NULL
+        | vector.similarity.cosine(emb, $query)] AS scores
+    WHERE size(scores) > 0
+    RETURN id, 2 * reduce(best = 0.0, s IN scores | CASE WHEN s > best THEN s ELSE best END) - 1 AS sim
+    ORDER BY sim DESC
+    LIMIT $top_k
+    """
+
+# Bulk-Import (model.world_importer). Labels und Relationship-Types können
+# keine Parameter sein → str.format, die Werte prüft der Importer vorher.
+CREATE_ID_CONSTRAINT = """
+    CREATE CONSTRAINT {name} IF NOT EXISTS FOR (n:{label}) REQUIRE n.id IS UNIQUE
+    """
+
+TEXT_HASHES = """
+    MATCH (n:{label})
+    WHERE n.text_hash IS NOT NULL
+    RETURN n.id AS id, n.text_hash AS text_hash
+    """
+
+# null-Werte in row.properties entfernen die Property (z.B. synonyms_emb)
+IMPORT_NODES = """
+    UNWIND $rows AS row
+    MERGE (n:{label} {{id: row.id}})
+    SET n += row.properties
+    """
+
+# Position aus der Welt-Datei ersetzt die aktuelle (IST_IN / TRÄGT)
+RESET_POSITIONS = """
+    UNWIND $ids AS id
+    MATCH (n:{label} {{id: id}})
+    CALL {{ WITH n MATCH (n)-[r:IST_IN]->() DELETE r }}
+    CALL {{ WITH n MATCH ()-[r:`TRÄGT`]->(n) DELETE r }}
+    """
+
+IMPORT_RELATIONSHIPS = """
+    UNWIND $rows AS row
+    MATCH (a:{from_label} {{id: row.from}})
+    MATCH (b:{to_label} {{id: row.to}})
+    MERGE (a)-[:`{type}`]->(b)
+    """
+
+PRUNE_NODES = """
+    MATCH (n:{label})
+    WHERE NOT n.id IN $ids
+    DETACH DELETE n
+    RETURN count(*) AS deleted
+    """
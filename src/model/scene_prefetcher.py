@@ -0,0 +1,100 @@
+"""
+Hintergrund-Prefetcher für Szenen der Nachbar-Locations.
+
+Nach jeder Action wird die 1-Hop Nachbarschaft über ERREICHT (Location,
+ihre Items und Exits, ohne Embeddings) im Hintergrund geladen und in
+einem begrenzten LRU-Cache gehalten. MATCH und der Refresh nach einem
+GO können dann aus dem Speicher bedient werden. Fehlende Embeddings für
+das Target-Matching lädt der Controller per entity_embeddings(ids) nach.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class ScenePrefetcher:
+    """
+    LRU-Cache location_id → Szene (location, items, exits).
+
+    Mutationen müssen die betroffenen Locations per invalidate() melden.
+    Ein Prefetch der vor einer Invalidierung gestartet wurde, schreibt
+    sein (dann veraltetes) Ergebnis nicht mehr in den Cache.
+    """
+
+    def __init__(self, model, max_scenes=64):
+
+        self.model = model
+        self.max_scenes = max_scenes
+
+        self._scenes = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='prefetch')
+
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def get(self, location_id):
+        """
+        Gibt die gecachte Szene einer Location zurück.
+
+        Returns:
+            dict | None: {location, items, exits} oder None bei Miss
+        """
+        with self._lock:
+            scene = self._scenes.get(location_id)
+            if scene is None:
+                self.misses += 1
+                return None
+            self._scenes.move_to_end(location_id)
+            self.hits += 1
+            return dict(scene)
+
+    def put(self, location_id, scene):
+        """Legt eine frisch gelesene Szene im Cache ab."""
+        with self._lock:
+            self._store(location_id, scene)
+
+    def invalidate(self, *location_ids):
+        """Verwirft die Szenen der Locations und laufende Prefetches dafür."""
+        with self._lock:
+            for location_id in location_ids:
+                self._scenes.pop(location_id, None)
+                self._versions[location_id] = self._versions.get(location_id, 0) + 1
+
+    def prefetch(self, location_id):
+        """Lädt die Nachbarschaft einer Location im Hintergrund."""
+        with self._lock:
+            versions = dict(self._versions)
+        self._executor.submit(self._load, location_id, versions)
+
+    def _load(self, location_id, versions):
+        try:
+            rows = self.model.neighbourhood(location_id)
+        except Exception as e:
+            logger.info("=== Prefetch fehlgeschlagen für '%s': %s ===", location_id, e)
+            return
+
+        with self._lock:
+            for row in rows:
+                # Zwischenzeitlich invalidiert → Ergebnis ist veraltet
+                if self._versions.get(row['id'], 0) != versions.get(row['id'], 0):
+                    continue
+                self._store(row['id'], {
+                    'location': row['location'],
+                    'items': row['items'],
+                    'exits': row['exits'],
+                })
+
+    def _store(self, location_id, scene):
+        self._scenes[location_id] = scene
+        self._scenes.move_to_end(location_id)
+        while len(self._scenes) > self.max_scenes:
+            self._scenes.popitem(last=False)
@@ -0,0 +1,286 @@
+"""
+Prozeduraler Welt-Generator für Skalierungs- und Lasttests.
+
+Erzeugt aus einem Seed reproduzierbar Welten beliebiger Größe im Format
+der Welt-Datei (wie worlds/example.json): Locations mit ERREICHT in beide
+Richtungen, Items per IST_IN, NPCs, ein Player mit Inventar (TRÄGT) und
+ein paar Interaktionen (ÖFFNET, KANN_ANZÜNDEN, BELEUCHTET). Namen und
+Synonyme sind deutsch, Adjektive werden nach Genus dekliniert.
+
+Die Welt-Datei lässt sich direkt mit GAME_BACKEND=memory spielen oder per
+WorldImporter (inkl. name_emb usw.) nach Neo4j schreiben.
+"""
+
+import random
+
+# (Nomen, Genus, Synonyme)
+ITEM_NOUNS = [
+    ('Fackel', 'f', ['Leuchte', 'Kienspan']),
+    ('Laterne', 'f', ['Lampe', 'Leuchte']),
+    ('Truhe', 'f', ['Kiste', 'Holztruhe']),
+    ('Schatulle', 'f', ['Kästchen', 'Dose']),
+    ('Schlüssel', 'm', ['Türschlüssel', 'Dietrich']),
+    ('Hammer', 'm', ['Schlägel', 'Fäustel']),
+    ('Beutel', 'm', ['Sack', 'Tasche']),
+    ('Krug', 'm', ['Kanne', 'Becher']),
+    ('Dolch', 'm', ['Messer', 'Klinge']),
+    ('Schild', 'm', ['Rundschild', 'Wappenschild']),
+    ('Buch', 'n', ['Foliant', 'Wälzer']),
+    ('Seil', 'n', ['Strick', 'Tau']),
+    ('Schwert', 'n', ['Klinge', 'Säbel']),
+    ('Amulett', 'n', ['Anhänger', 'Talisman']),
+    ('Brot', 'n', ['Laib', 'Fladen']),
+    ('Streichholz', 'n', ['Zündholz', 'Hölzchen']),
+]
+
+CONTAINER_NOUNS = ('Truhe', 'Schatulle')
+LIGHT_NOUNS = ('Fackel', 'Laterne')
+
+ADJECTIVES = ['alt', 'rostig', 'klein', 'schwer', 'golden', 'verbeult', 'morsch', 'glänzend', 'prächtig', 'schlicht']
+ADJECTIVE_ENDINGS = {'m': 'er', 'f': 'e', 'n': 'es'}
+
+# (Ort, Synonyme, dunkel)
+LOCATION_BASES = [
+    ('Taverne', ['Wirtshaus', 'Schenke'], False),
+    ('Marktplatz', ['Markt', 'Platz'], False),
+    ('Schmiede', ['Esse', 'Werkstatt'], False),
+    ('Mühle', ['Windmühle'], False),
+    ('Kapelle', ['Kirche', 'Gebetshaus'], False),
+    ('Brücke', ['Steg', 'Übergang'], False),
+    ('Lichtung', ['Waldwiese'], False),
+    ('Wald', ['Forst', 'Gehölz'], True),
+    ('Höhle', ['Grotte', 'Stollen'], True),
+    ('Gruft', ['Krypta', 'Grabkammer'], True),
+    ('Keller', ['Gewölbe'], True),
+    ('Turm', ['Wachturm', 'Bergfried'], False),
+]
+
+PLACE_NAMES = ['Rabenfels', 'Eichenau', 'Nebelbach', 'Wolfsgrund', 'Steinhagen', 'Finsterbrunn',
+               'Birkenhain', 'Moorwiesen', 'Kaltenberg', 'Dornfeld', 'Hasenheide', 'Erlenbruch']
+
+LOCATION_DETAILS = ['Der Wind pfeift durch die Ritzen.', 'Es riecht nach Rauch und altem Holz.',
+                    'Irgendwo tropft Wasser.', 'Krähen kreisen über dem Dach.', 'Alles ist mit Staub bedeckt.']
+
+# (Rolle, Genus, Beschreibung, Händler)
+NPC_ROLES = [
+    ('Wirt', 'm', 'Ein grummeliger Wirt, der stets zu wenig einschenkt.', True),
+    ('Händlerin', 'f', 'Eine Händlerin mit einem Karren voller Waren.', True),
+    ('Schmied', 'm', 'Ein Schmied mit rußgeschwärzten Händen.', True),
+    ('Wächterin', 'f', 'Eine Wächterin, die jeden Fremden misstrauisch mustert.', False),
+    ('Bettler', 'm', 'Ein Bettler, der mehr weiß, als er zugibt.', False),
+    ('Kräuterfrau', 'f', 'Eine Kräuterfrau mit einem Korb voller Wurzeln.', True),
+]
+
+NPC_NAMES = {
+    'm': ['Alrik', 'Gunther', 'Konrad', 'Odo', 'Ulf'],
+    'f': ['Berta', 'Hilde', 'Margarete', 'Wiebke', 'Irmgard'],
+}
+
+UMLAUTS = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss', ' ': '_'})
+
+
+def slug(text):
+    """Name → ID-Teil (klein, Umlaute ausgeschrieben)."""
+    return text.lower().translate(UMLAUTS)
+
+
+class WorldGenerator:
+    """
+    Seeded Generator für Welt-Dateien.
+
+    Gleicher Seed und gleiche Parameter ergeben dieselbe Welt, damit
+    Messungen bei 10, 10k oder 1M Nodes vergleichbar bleiben.
+    """
+
+    def __init__(self, locations=10, items_per_location=3, exit_fanout=3, inventory_size=2,
+                 npcs_per_location=0.2, seed=42):
+        """
+        Args:
+            locations (int): Anzahl Locations
+            items_per_location (int): Items pro Location (IST_IN)
+            exit_fanout (int): Durchschnittliche Anzahl Exits pro Location
+            inventory_size (int): Items im Player-Inventar (TRÄGT)
+            npcs_per_location (float): Durchschnittliche NPCs pro Location
+            seed (int): Seed für random.Random
+        """
+        if locations < 1:
+            raise ValueError('Mindestens eine Location nötig')
+        self.locations = locations
+        self.items_per_location = items_per_location
+        self.exit_fanout = exit_fanout
+        self.inventory_size = inventory_size
+        self.npcs_per_location = npcs_per_location
+        self.seed = seed
+
+    def _location(self, rng, i):
+        base, synonyms, dark = rng.choice(LOCATION_BASES)
+        place = rng.choice(PLACE_NAMES)
+        name = f"{base} von {place}" if rng.random() < 0.5 else f"{place}er {base}"
+        return {
+            'id': f"{slug(base)}_{i}",
+            'labels': ['Location'],
+            'properties': {
+                'name': name,
+                'description': f"{'Ein finsterer' if dark else 'Ein ruhiger'} Ort nahe {place}. "
+                               f"{rng.choice(LOCATION_DETAILS)}",
+                'synonyms': [base, *synonyms],
+                'is_dark': dark,
+                'requires_light': dark,
+                'is_locked': False,
+            },
+        }
+
+    def _item(self, rng, i, nouns=ITEM_NOUNS):
+        noun, genus, synonyms = rng.choice(nouns)
+        adjective = rng.choice(ADJECTIVES)
+        name = f"{adjective.capitalize()}{ADJECTIVE_ENDINGS[genus]} {noun}"
+        container = noun in CONTAINER_NOUNS
+        light_source = noun in LIGHT_NOUNS
+        return {
+            'id': f"{slug(noun)}_{i}",
+            'labels': ['Item'],
+            'properties': {
+                'name': name,
+                'description': f"{name}. {rng.choice(['Sieht benutzt aus.', 'Wirkt wertvoll.', 'Hat schon bessere Tage gesehen.'])}",
+                'synonyms': [noun, *synonyms],
+                'is_takeable': not container,
+                'is_usable': light_source or noun in ('Schlüssel', 'Hammer', 'Streichholz'),
+                'is_readable': noun == 'Buch',
+                'is_container': container,
+                'is_locked': rng.random() < 0.5 if container else None,
+                'is_lit': False if light_source else None,
+                'is_light_source': light_source,
+                'item_type': None,
+                'weight': round(rng.uniform(0.1, 20.0), 1),
+            },
+        }
+
+    def _npc(self, rng, i):
+        role, genus, description, trader = rng.choice(NPC_ROLES)
+        name = rng.choice(NPC_NAMES[genus])
+        return {
+            'id': f"{slug(role)}_{i}",
+            'labels': ['NPC'],
+            'properties': {
+                'name': f"{name} {'die' if genus == 'f' else 'der'} {role}",
+                'description': description,
+                'dialogue': f"Sei gegrüßt, Fremder. Ich bin {name}.",
+                'is_trader': trader,
+                'is_quest_giver': rng.random() < 0.2,
+            },
+        }
+
+    def generate(self):
+        """
+        Erzeugt die Welt.
+
+        Returns:
+            dict: Welt-Datei {nodes, relationships}
+        """
+        rng = random.Random(self.seed)
+        nodes = []
+        relationships = []
+
+        locations = [self._location(rng, i) for i in range(self.locations)]
+        nodes.extend(locations)
+
+        # Spannbaum hält die Welt zusammenhängend, zusätzliche Kanten bis zum Fan-out
+        edges = set()
+        for i in range(1, len(locations)):
+            edges.add((rng.randrange(i), i))
+        extra = max(0, (self.exit_fanout * len(locations)) // 2 - len(edges))
+        for _ in range(extra):
+            a, b = rng.randrange(len(locations)), rng.randrange(len(locations))
+            if a != b:
+                edges.add((min(a, b), max(a, b)))
+        for a, b in edges:
+            relationships.append({'from': locations[a]['id'], 'type': 'ERREICHT', 'to': locations[b]['id']})
+            relationships.append({'from': locations[b]['id'], 'type': 'ERREICHT', 'to': locations[a]['id']})
+
+        item_count = 0
+        keys, locked, light_sources, matches = [], [], [], []
+        for location in locations:
+            for _ in range(self.items_per_location):
+                item = self._item(rng, item_count)
+                item_count += 1
+                nodes.append(item)
+                relationships.append({'from': item['id'], 'type': 'IST_IN', 'to': location['id']})
+                noun = item['properties']['synonyms'][0]
+                if noun == 'Schlüssel':
+                    keys.append(item['id'])
+                elif item['properties']['is_locked']:
+                    locked.append(item['id'])
+                elif item['properties']['is_light_source']:
+                    light_sources.append(item['id'])
+                elif noun == 'Streichholz':
+                    matches.append(item['id'])
+
+            npcs = int(self.npcs_per_location) + (rng.random() < self.npcs_per_location % 1)
+            for _ in range(npcs):
+                npc = self._npc(rng, len(nodes))
+                nodes.append(npc)
+                relationships.append({'from': npc['id'], 'type': 'IST_IN', 'to': location['id']})
+
+        player = {
+            'id': 'player',
+            'labels': ['Player'],
+            'properties': {'name': 'Player', 'description': 'Hier könnte dein Name stehen!'},
+        }
+        nodes.append(player)
+        relationships.append({'from': 'player', 'type': 'IST_IN', 'to': locations[0]['id']})
+        portable = [noun for noun in ITEM_NOUNS if noun[0] not in CONTAINER_NOUNS]
+        for _ in range(self.inventory_size):
+            item = self._item(rng, item_count, portable)
+            item_count += 1
+            nodes.append(item)
+            relationships.append({'from': 'player', 'type': 'TRÄGT', 'to': item['id']})
+
+        # Interaktionen wie in der Beispielwelt
+        for key, chest in zip(keys, locked):
+            relationships.append({'from': key, 'type': 'ÖFFNET', 'to': chest})
+        for match, light in zip(matches, light_sources):
+            relationships.append({'from': match, 'type': 'KANN_ANZÜNDEN', 'to': light})
+        dark = [location['id'] for location in locations if location['properties']['is_dark']]
+        for light, location in zip(light_sources, dark):
+            relationships.append({'from': light, 'type': 'BELEUCHTET', 'to': location})
+
+        return {'nodes': nodes, 'relationships': relationships}
+
+    @staticmethod
+    def replay_commands(world, turns=100, seed=42):
+        """
+        Erzeugt ein Replay-Skript (eine Eingabe pro Zeile) für main.py --replay.
+
+        Läuft durch die Welt: Items an der aktuellen Location aufheben und
+        wieder ablegen, dann zu einem zufälligen Exit gehen.
+
+        Returns:
+            list[str]: Eingaben
+        """
+        rng = random.Random(seed)
+        names = {node['id']: node['properties']['name'] for node in world['nodes']}
+        exits, items = {}, {}
+        location = None
+        for rel in world['relationships']:
+            if rel['type'] == 'ERREICHT':
+                exits.setdefault(rel['from'], []).append(rel['to'])
+            elif rel['type'] == 'IST_IN' and rel['from'] == 'player':
+                location = rel['to']
+            elif rel['type'] == 'IST_IN':
+                items.setdefault(rel['to'], []).append(rel['from'])
+
+        takeable = {
+            node['id'] for node in world['nodes']
+            if 'Item' in node['labels'] and node['properties'].get('is_takeable')
+        }
+        commands = []
+        while len(commands) < turns and location is not None:
+            here = [item for item in items.get(location, []) if item in takeable]
+            if here and rng.random() < 0.5:
+                item = rng.choice(here)
+                commands.extend([f"nimm {names[item]}", f"leg {names[item]} ab"])
+            if not exits.get(location):
+                break
+            location = rng.choice(exits[location])
+            commands.append(f"geh {names[location]}")
+        return commands[:turns]
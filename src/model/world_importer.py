@@ -0,0 +1,224 @@
+"""
+Bulk-Import einer Welt-Datei nach Neo4j.
+
+Ersetzt das zellenweise Anlegen im Setup-Notebook (drei encode() und ein
+CREATE pro Entity nach reset_db()):
+- Namen, Beschreibungen und Synonyme werden in großen Batches encodet
+- Nodes und Relationships gehen per UNWIND in Blöcken von batch_size
+  Zeilen, eine Transaction pro Block
+- Embeddings werden nur neu berechnet, wenn sich der Text-Hash geändert
+  hat (Name, Beschreibung, Synonyme und Model/Backend)
+
+Welt-Datei wie beim MemoryBackend:
+    {"nodes": [{id, labels, properties}], "relationships": [{from, type, to}]}
+"""
+
+import re
+import json
+import time
+import hashlib
+import logging
+
+from model.embedding_codec import EMBEDDED_LABELS, EMBEDDING_FIELDS, encode_embedding, transport_dtype
+
+logger = logging.getLogger(__name__)
+
+IMPORT_LABELS = ('Location', 'Item', 'NPC', 'Player')
+
+# Defaults wie create_item / create_location im Setup-Notebook
+DEFAULT_PROPERTIES = {
+    'Item': {
+        'is_takeable': True,
+        'is_usable': False,
+        'is_readable': False,
+        'is_container': False,
+        'is_locked': None,
+        'is_lit': None,
+        'is_light_source': False,
+        'item_type': None,
+        'weight': None,
+    },
+    'Location': {
+        'is_dark': False,
+        'requires_light': False,
+        'is_locked': False,
+    },
+}
+
+REL_TYPE_PATTERN = re.compile(r'\w+')
+
+
+def load_world(path):
+    """Liest eine Welt-Datei (JSON)."""
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def text_hash(identity, properties):
+    """
+    Hash über alle Texte, aus denen Embeddings entstehen.
+
+    Args:
+        identity (str): Model, Revision und Backend (EmbeddingCache.identity)
+        properties (dict): Node-Properties mit name, description, synonyms
+
+    Returns:
+        str: SHA1 Hex-Digest
+    """
+    payload = [identity, properties.get('name'), properties.get('description'), properties.get('synonyms') or []]
+    return hashlib.sha1(json.dumps(payload, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+class WorldImporter:
+    """
+    Importiert eine Welt-Datei inkrementell in Neo4j.
+
+    Bestehende Nodes werden per MERGE auf id aktualisiert, der Spielstand
+    anderer Player bleibt erhalten. Positionen (IST_IN / TRÄGT) der Nodes
+    aus der Datei werden auf den Stand der Datei zurückgesetzt.
+    """
+
+    def __init__(self, backend, embedding_utils, batch_size=1000, encode_chunk=4096, dtype=None):
+        """
+        Args:
+            backend (Neo4jBackend): Ziel-DB
+            embedding_utils (EmbeddingUtils): Encoder
+            batch_size (int): Zeilen pro Transaction
+            encode_chunk (int): Entities pro encode_bulk()-Aufruf (begrenzt den Speicher)
+            dtype (str | None): Datentyp der _bin Properties (Default: EMBEDDING_TRANSPORT_DTYPE)
+        """
+        self.backend = backend
+        self.embedding_utils = embedding_utils
+        self.batch_size = batch_size
+        self.encode_chunk = encode_chunk
+        self.dtype = dtype or transport_dtype()
+
+    def _validate(self, world):
+        """
+        Prüft Labels, IDs und Relationships und gruppiert die Nodes.
+
+        Returns:
+            tuple[dict, dict]: (Label → Nodes, ID → Label)
+        """
+        by_label = {label: [] for label in IMPORT_LABELS}
+        node_labels = {}
+        for node in world.get('nodes', []):
+            labels = [label for label in node.get('labels', []) if label in IMPORT_LABELS]
+            if len(labels) != 1:
+                raise ValueError(f"Node '{node.get('id')}': genau ein Label aus {', '.join(IMPORT_LABELS)} erwartet")
+            if node['id'] in node_labels:
+                raise ValueError(f"Node '{node['id']}' ist doppelt")
+            node_labels[node['id']] = labels[0]
+            by_label[labels[0]].append(node)
+
+        for rel in world.get('relationships', []):
+            if not REL_TYPE_PATTERN.fullmatch(rel['type']):
+                raise ValueError(f"Ungültiger Relationship-Type: '{rel['type']}'")
+            for end in (rel['from'], rel['to']):
+                if end not in node_labels:
+                    raise ValueError(f"Relationship {rel['from']} -[{rel['type']}]-> {rel['to']}: '{end}' fehlt")
+        return by_label, node_labels
+
+    def _node_rows(self, label, nodes, stored_hashes):
+        """
+        Baut die Import-Rows eines Blocks, encodet nur geänderte Texte.
+
+        Returns:
+            tuple[list[dict], int]: (Rows, Anzahl neu embeddeter Nodes)
+        """
+        identity = self.embedding_utils.cache.identity
+        rows = []
+        stale = []
+        for node in nodes:
+            properties = {**DEFAULT_PROPERTIES.get(label, {}), **node.get('properties', {})}
+            properties.pop('id', None)
+            row = {'id': node['id'], 'properties': properties}
+            if label in EMBEDDED_LABELS:
+                node_hash = text_hash(identity, properties)
+                if stored_hashes.get(node['id']) != node_hash:
+                    properties['text_hash'] = node_hash
+                    stale.append(row)
+            rows.append(row)
+
+        if stale:
+            texts = []
+            for row in stale:
+                properties = row['properties']
+                synonyms = properties.get('synonyms') or []
+                texts.append([properties.get('name') or row['id'], properties.get('description') or '',
+                              ' '.join(synonyms) if synonyms else None])
+            flat = [text for entity_texts in texts for text in entity_texts if text is not None]
+            vectors = iter(self.embedding_utils.encode_bulk(flat))
+            for row, entity_texts in zip(stale, texts):
+                properties = row['properties']
+                properties['emb_dtype'] = self.dtype
+                for field, text in zip(EMBEDDING_FIELDS, entity_texts):
+                    vector = next(vectors) if text is not None else None
+                    # null entfernt veraltete Embeddings (z.B. gelöschte Synonyme)
+                    properties[field] = vector.tolist() if vector is not None else None
+                    properties[f'{field}_bin'] = encode_embedding(vector, self.dtype)
+        return rows, len(stale)
+
+    def run(self, world, prune=False):
+        """
+        Importiert die Welt.
+
+        Args:
+            world (dict): Welt-Datei (nodes, relationships)
+            prune (bool): Locations, Items und NPCs löschen, die nicht in
+                der Datei stehen
+
+        Returns:
+            dict: nodes, embedded, relationships, pruned, seconds
+        """
+        start = time.perf_counter()
+        by_label, node_labels = self._validate(world)
+
+        self.backend.ensure_id_constraints(IMPORT_LABELS)
+        stored_hashes = self.backend.text_hashes(EMBEDDED_LABELS)
+
+        embedded = 0
+        for label, nodes in by_label.items():
+            for chunk_start in range(0, len(nodes), self.encode_chunk):
+                rows, chunk_embedded = self._node_rows(
+                    label, nodes[chunk_start:chunk_start + self.encode_chunk], stored_hashes
+                )
+                self.backend.import_nodes(label, rows, self.batch_size)
+                embedded += chunk_embedded
+            logger.info("=== Import: %s %s Nodes ===", len(nodes), label)
+
+        # Positionen aus der Datei ersetzen den aktuellen Stand
+        relationships = world.get('relationships', [])
+        placed = {}
+        for rel in relationships:
+            if rel['type'] == 'IST_IN':
+                placed.setdefault(node_labels[rel['from']], set()).add(rel['from'])
+            elif rel['type'] == 'TRÄGT':
+                placed.setdefault(node_labels[rel['to']], set()).add(rel['to'])
+        for label, ids in placed.items():
+            self.backend.reset_positions(label, ids, self.batch_size)
+
+        groups = {}
+        for rel in relationships:
+            key = (rel['type'], node_labels[rel['from']], node_labels[rel['to']])
+            groups.setdefault(key, []).append({'from': rel['from'], 'to': rel['to']})
+        for (rel_type, from_label, to_label), rows in groups.items():
+            self.backend.import_relationships(rel_type, from_label, to_label, rows, self.batch_size)
+
+        pruned = 0
+        if prune:
+            for label in EMBEDDED_LABELS:
+                pruned += self.backend.prune_nodes(label, [node['id'] for node in by_label[label]])
+
+        if embedded:
+            self.backend.ensure_vector_indexes(self.embedding_utils.dimensions)
+
+        stats = {
+            'nodes': len(node_labels),
+            'embedded': embedded,
+            'relationships': len(relationships),
+            'pruned': pruned,
+            'seconds': time.perf_counter() - start,
+        }
+        logger.info("=== Import fertig: %s ===", stats)
+        return stats
@@ -1,191 +1,382 @@
 """
-Neo4j Game Model - DB-Zugriff für Spielwelt.
+Game Model - Zugriff auf die Spielwelt.
 
-Wrapper für Neo4j Cypher Queries. Verwaltet Connection und
-bietet typsichere Methoden für Location/Item/Inventory Queries.
+Typsichere Methoden für Location/Item/Inventory Queries. Die eigentliche
+Arbeit macht ein GameBackend: Neo4jBackend (Default) oder MemoryBackend,
+ausgewählt über GAME_BACKEND in der .env.
 """
 
 import os
+import logging
+import threading
 from dotenv import load_dotenv
-from neo4j import GraphDatabase
+
+from model.backend import GameBackend, DEFAULT_PLAYER_ID
+from model.embedding_codec import decode_embedding_row
+from utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+# Default-Welt für das In-Memory Backend
+DEFAULT_WORLD_FILE = os.path.join(os.path.dirname(__file__), '..', '..', 'worlds', 'example.json')
+
+
+def create_backend(name=None, world_file=None):
+    """
+    Erstellt das Backend aus Argumenten oder .env.
+
+    Args:
+        name (str | None): 'neo4j' oder 'memory' (Default: GAME_BACKEND, sonst neo4j)
+        world_file (str | None): Welt-Datei für 'memory' (Default: GAME_WORLD_FILE)
+
+    Returns:
+        GameBackend
+    """
+    load_dotenv()
+    name = name or os.getenv('GAME_BACKEND') or 'neo4j'
+
+    if name == 'memory':
+        from model.memory_backend import MemoryBackend
+
+        return MemoryBackend(world_file or os.getenv('GAME_WORLD_FILE') or DEFAULT_WORLD_FILE)
+    if name == 'neo4j':
+        from model.neo4j_backend import Neo4jBackend
+
+        return Neo4jBackend()
+    raise ValueError(f"Unbekanntes GAME_BACKEND: '{name}' (neo4j oder memory)")
+
+
+def entity_matching():
+    """
+    Liest den Matching-Modus aus der .env.
+
+    Returns:
+        str: 'local' (EntityIndex im Prozess, Default) oder 'vector'
+            (Top-k über die Neo4j Vector Indexes)
+    """
+    load_dotenv()
+    mode = os.getenv('ENTITY_MATCHING') or 'local'
+    if mode not in ('local', 'vector'):
+        raise ValueError(f"Unbekanntes ENTITY_MATCHING: '{mode}' (local oder vector)")
+    return mode
+
+
+class MutationCounter:
+    """
+    Zähler für Änderungen an Items und Inventaren.
+
+    Wird von allen Models eines Backends geteilt (GameModel.for_player),
+    damit auch Änderungen anderer Spieler die Szenen-Version ändern.
+    """
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def bump(self):
+        """
+        Nach dem Write aufrufen, nicht davor: sonst kann ein paralleler
+        Reader die alte Szene unter der neuen Version ablegen.
+        """
+        with self._lock:
+            self.value += 1
 
 
 class GameModel:
     """
     Model-Komponente im MVC-Pattern.
 
-    Kapselt alle Neo4j DB-Zugriffe. Single Source of Truth für
-    Spielwelt-State (Locations, Items, Inventory, Relationships).
+    Kapselt alle Zugriffe auf die Spielwelt. Single Source of Truth für
+    Spielwelt-State (Locations, Items, Inventory, Relationships). Alle
+    Methoden delegieren an das GameBackend, Spieler-bezogene mit der
+    player_id dieses Models.
     """
-    def __init__(self):
-        # .env laden
-        load_dotenv()
-
-        # DB driver erstellen
-        self.driver = GraphDatabase.driver(
-            uri=os.getenv('NEO4J_URI'),
-            auth=(
-                os.getenv('NEO4J_USER'),
-                os.getenv('NEO4J_PASSWORD')
-            ),
-            # notifications_min_severity='OFF'
-        )
+    def __init__(self, backend: GameBackend = None, player_id=DEFAULT_PLAYER_ID):
+        self.backend = backend or create_backend()
+        self.player_id = player_id
+        self._owns_backend = True
+        self._mutations = MutationCounter()
+        self._location = None
+        logger.info("=== GameModel Backend: %s ===", type(self.backend).__name__)
+
+    def for_player(self, player_id):
+        """
+        Model für einen weiteren Spieler auf demselben Backend.
+
+        Teilt Driver/Pool bzw. Graph, close() des neuen Models lässt das
+        Backend offen.
+
+        Args:
+            player_id (str): Player ID
+
+        Returns:
+            GameModel
+        """
+        model = GameModel.__new__(GameModel)
+        model.backend = self.backend
+        model.player_id = player_id
+        model._owns_backend = False
+        model._mutations = self._mutations
+        model._location = None
+        return model
 
     def close(self):
-        """Schließt Neo4j Driver Connection sauber."""
-        self.driver.close()
+        """Gibt die Verbindungen des Backends frei (nur wenn das Model es besitzt)."""
+        if self._owns_backend:
+            self.backend.close()
 
-    def _run_query(self, query, params=None):
+    @property
+    def scene_version(self):
         """
-        führt eine einzelne Query aus
+        Version der Szene des Players: jede Mutation über ein GameModel ändert sie.
 
-        args:
-            query (str): cypher query
-            params (dict): queryparameter
+        Moves ändern die Location (zurück an einer unveränderten Location
+        gilt wieder die alte Version), Take/Drop zählen den geteilten
+        MutationCounter hoch. Änderungen an der DB am Model vorbei (z.B.
+        Welt-Import während des Spiels) erfasst die Version nicht.
 
-        returns:
-            list: liste von dicts mit den ergebnissen
+        Returns:
+            tuple[str | None, int]: (Location ID, Mutationszähler)
         """
-        with self.driver.session() as session:
+        return self._location, self._mutations.value
 
-            result = session.run(query, params or {})
-            return [record.data() for record in result]
+    def _remember_location(self, rows):
+        """Merkt sich die Location aus einem Szenen-Read oder Move-Delta."""
+        if rows:
+            self._location = rows[0]['id']
 
+    def warm_up(self, connections=None):
+        """
+        Baut Verbindungen vor dem ersten Prompt auf (Neo4j: Pool-Connections).
+
+        Args:
+            connections (int | None): Anzahl Connections, Default aus
+                NEO4J_WARMUP_CONNECTIONS (2)
+        """
+        self.backend.warm_up(connections)
+
+    @METRICS.timed('model.current_location')
     def current_location(self):
         """
         Gibt aktuelle Player-Location zurück.
 
         Returns:
-            list[dict]: Location mit id, name, description, name_emb
-        """
-        query = """
-        MATCH (p:Player {id: 'player'})-[:IST_IN]->(location:Location)
-        RETURN 
-            location.id AS id, 
-            location.name AS name, 
-            location.description AS description,
-            location.name_emb AS name_emb
+            list[dict]: Location mit id, name, description
         """
-        return self._run_query(query)
+        location = self.backend.current_location(self.player_id)
+        self._remember_location(location)
+        return location
 
+    @METRICS.timed('model.location_items')
     def location_items(self):
         """
         Gibt Items an aktueller Location zurück.
 
         Returns:
-            list[dict]: Items mit id, name, description, name_emb
+            list[dict]: Items mit id, name, description
         """
-        query = """
-        MATCH (p:Player {id: 'player'})-[:IST_IN]->(loc:Location)
-        MATCH (item)-[:IST_IN]->(loc)
-        WHERE item <> p
-        RETURN 
-            item.id AS id, 
-            item.name AS name, 
-            item.description AS description,
-            item.name_emb AS name_emb
-        """
-        return self._run_query(query)
+        return self.backend.location_items(self.player_id)
 
+    @METRICS.timed('model.location_exits')
     def location_exits(self):
         """
         Gibt erreichbare Locations (Exits) zurück.
 
         Returns:
-            list[dict]: Locations mit id, name, description, name_emb
-        """
-        query = """
-        MATCH (p:Player {id: 'player'})-[:IST_IN]->(location:Location)
-        MATCH (location)-[:ERREICHT]->(exit:Location)
-        RETURN
-            exit.id AS id, 
-            exit.name AS name, 
-            exit.description AS description,
-            exit.name_emb AS name_emb
+            list[dict]: Locations mit id, name, description
         """
-        return self._run_query(query)
+        return self.backend.location_exits(self.player_id)
 
+    @METRICS.timed('model.player_inventory')
     def player_inventory(self):
         """
         Gibt Items im Player-Inventar zurück.
 
         Returns:
-            list[dict]: Items mit id, name, name_emb
+            list[dict]: Items mit id, name
         """
-        query = """
-        MATCH (p:Player {id: 'player'})-[:TRÄGT]->(inventory:Item)
-        RETURN 
-            inventory.id AS id,
-            inventory.name AS name,
-            inventory.name_emb AS name_emb
+        return self.backend.player_inventory(self.player_id)
+
+    @METRICS.timed('model.scene')
+    def scene(self):
         """
-        return self._run_query(query)
+        Gibt die komplette Szene des Players in einem Round-Trip zurück.
 
-    def move_player(self, to_location):
+        Location, Items, Exits und Inventar kommen bei Neo4j aus einem
+        einzigen Cypher-Statement (Pattern Comprehensions statt vier Queries).
+
+        Returns:
+            dict: Szene mit den Keys
+                - location: list[dict] mit id, name, description
+                - items: list[dict] mit id, name, description
+                - exits: list[dict] mit id, name, description
+                - inventory: list[dict] mit id, name
+
+            Ohne Embeddings, die holt der Controller bei Bedarf über
+            entity_embeddings(ids).
+        """
+        scene = self.backend.scene(self.player_id)
+        self._remember_location(scene['location'])
+        return scene
+
+    @METRICS.timed('model.entity_embeddings')
+    def entity_embeddings(self, ids=None):
+        """
+        Gibt die Embeddings von Locations, Items und NPCs zurück.
+
+        Wird einmalig beim Start in den EntityIndex geladen, danach nur noch
+        für Entities, die dort fehlen. Kompakt gespeicherte Embeddings
+        (<feld>_bin) werden per numpy.frombuffer dekodiert.
+
+        Args:
+            ids (list[str] | None): Nur diese Entities (None = alle)
+
+        Returns:
+            list[dict]: Entities mit id, name und name_emb, description_emb,
+                synonyms_emb als np.ndarray (oder None)
+        """
+        return [decode_embedding_row(row) for row in self.backend.entity_embeddings(ids)]
+
+    @METRICS.timed('model.entity_names')
+    def entity_names(self):
+        """
+        Gibt IDs und Namen aller Locations, Items und NPCs zurück (ohne Embeddings).
+
+        Für das Noun-Lexikon des Regel-Parsers, wenn der EntityIndex nicht
+        geladen wird (ENTITY_MATCHING=vector).
+
+        Returns:
+            list[dict]: Entities mit id, name
+        """
+        return self.backend.entity_names()
+
+    @METRICS.timed('model.neighbourhood')
+    def neighbourhood(self, location_id):
+        """
+        Gibt die Szenen einer Location und ihrer Exits (1-Hop über ERREICHT) zurück.
+
+        Wird vom ScenePrefetcher im Hintergrund genutzt.
+
+        Args:
+            location_id (str): Location ID
+
+        Returns:
+            list[dict]: Pro Location id, location, items, exits
+        """
+        return self.backend.neighbourhood(location_id)
+
+    @property
+    def supports_vector_matching(self):
+        """True wenn das Backend Top-k Matching über Vector Indexes kann."""
+        return self.backend.supports_vector_matching
+
+    def ensure_vector_indexes(self, dimensions):
+        """
+        Legt die Vector Indexes an und baut welche mit falscher Dimension neu.
+
+        Args:
+            dimensions (int): Dimension des Embedding-Models (MiniLM: 384)
+        """
+        self.backend.ensure_vector_indexes(dimensions)
+
+    @METRICS.timed('model.match_entities')
+    def match_entities(self, query_emb, candidates, top_k=5):
+        """
+        Matcht ein Noun-Embedding gegen die Kandidaten in der DB.
+
+        Nur IDs und Scores der Top-k kommen zurück, nicht die Embeddings
+        aller Kandidaten. Gleiches Format wie EmbeddingUtils.match_entities.
+
+        Args:
+            query_emb (np.ndarray): (dim,) Noun-Embedding, L2-normalisiert
+            candidates (list[dict]): Kandidaten mit id, name
+            top_k (int): Maximal zurückgegebene Entities
+
+        Returns:
+            list[dict]: Sortierte Entities [{target, name, sim}] (höchste zuerst)
+        """
+        names = {candidate['id']: candidate['name'] for candidate in candidates}
+        if not names:
+            return []
+        hits = self.backend.match_entities(query_emb, list(names), top_k)
+        return [
+            {'target': entity_id, 'name': names[entity_id], 'sim': sim}
+            for entity_id, sim in hits
+        ]
+
+    @METRICS.timed('model.move_player')
+    def move_player(self, to_location, with_scene=True):
         """
         Bewegt Player zu neuer Location.
 
+        Gibt im selben Statement die neue Szene (Location, Items, Exits)
+        zurück, damit der Controller keine Folge-Reads braucht.
+
         Args:
             to_location (str): Target Location ID
+            with_scene (bool): False wenn die Szene schon gecacht ist,
+                dann kommt nur die Location zurück
 
         Returns:
-            list[dict]: Neue Location mit id, name, description oder [] bei Fehler
+            dict: Szene-Delta mit location, items, exits oder {} bei Fehler
         """
-        query = """
-        MATCH (p:Player {id: 'player'})-[old:IST_IN]->(current:Location)
-        MATCH (current)-[:ERREICHT]->(target:Location {id: $to_location})
-        DELETE old
-        CREATE (p)-[:IST_IN]->(target)
-        RETURN
-            target.id AS id, 
-            target.name AS name, 
-            target.description AS description
-        """
-        params = {'to_location': to_location}
-        return self._run_query(query, params=params)
+        delta = self.backend.move_player(self.player_id, to_location, with_scene)
+        self._remember_location(delta.get('location'))
+        return delta
 
+    @METRICS.timed('model.take_item')
     def take_item(self, item):
         """
         Nimmt Item von Location in Inventar auf.
 
+        Gibt im selben Statement die geänderten Items der Location und
+        das neue Inventar zurück.
+
         Args:
             item (str): Item ID
 
         Returns:
-            list[dict]: Item mit name oder [] bei Fehler
-        """
-        query = """
-        MATCH (p:Player {id: 'player'})-[:IST_IN]->(loc:Location)
-        MATCH (i:Item {id: $item})-[old:IST_IN]->(loc)
-        DELETE old
-        CREATE (p)-[:TRÄGT]->(i)
-        RETURN i.name AS name
+            dict: Szene-Delta mit item, items, inventory oder {} bei Fehler
         """
+        try:
+            return self.backend.take_item(self.player_id, item)
+        finally:
+            self._mutations.bump()
 
-        params = {'item': item}
-        return self._run_query(query, params=params)
-
+    @METRICS.timed('model.drop_item')
     def drop_item(self, item):
         """
         Legt Item aus Inventar an aktueller Location ab.
 
+        Gibt im selben Statement die geänderten Items der Location und
+        das neue Inventar zurück.
+
         Args:
             item (str): Item ID
 
         Returns:
-            list[dict]: Item mit name oder [] bei Fehler
+            dict: Szene-Delta mit item, items, inventory oder {} bei Fehler
         """
-        query = """
-        MATCH (p:Player {id: 'player'})-[old:TRÄGT]->(i:Item {id: $item})
-        MATCH (p)-[:IST_IN]->(loc:Location)
-        DELETE old
-        CREATE (i)-[:IST_IN]->(loc)
-        RETURN i.name AS name
+        try:
+            return self.backend.drop_item(self.player_id, item)
+        finally:
+            self._mutations.bump()
+
+    @METRICS.timed('model.ensure_player')
+    def ensure_player(self, start_location):
         """
+        Legt den Player-Node an, falls er fehlt, und setzt ihn an die
+        Start-Location, falls er noch nirgends ist.
 
-        params = {'item': item}
-        return self._run_query(query, params=params)
+        Args:
+            start_location (str): Location ID
+        """
+        try:
+            self.backend.ensure_player(self.player_id, start_location)
+        finally:
+            self._mutations.bump()
 
+    @METRICS.timed('model.use_item')
     def use_item(self, item, target):
         """
         Benutzt Item auf Target (noch nicht implementiert).
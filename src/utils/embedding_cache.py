@@ -0,0 +1,274 @@
+"""
+Persistenter Embedding-Cache für EmbeddingUtils.
+
+Content-addressed: jeder Eintrag ist über sha1(model, revision, backend,
+text) adressiert. Pro (model, revision, backend) gibt es ein eigenes
+Verzeichnis mit
+    - meta.json     Model, Revision, Backend, Dimension
+    - vectors.f32   rohe float32 Vektoren (append-only, per memmap gelesen)
+    - index.tsv     key<TAB>zeile (append-only)
+    - <name>.npy    abgeleitete Arrays (z.B. die Command-Matrix) + Hash
+
+Davor sitzt ein In-Memory LRU mit fester Größe. Ein Model-, Revisions-
+oder Backend-Wechsel (torch/onnx/int8 liefern leicht andere Vektoren)
+landet automatisch in einem neuen Verzeichnis.
+"""
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'ragventure', 'embeddings')
+
+
+def model_revision(model_name):
+    """
+    Ermittelt die Revision des Models ohne es zu laden.
+
+    Reihenfolge: EMBEDDING_MODEL_REVISION aus .env, dann der Snapshot-Hash
+    aus dem lokalen Hugging Face Cache, sonst 'unknown'.
+
+    Args:
+        model_name (str): SentenceTransformer Model-Name
+
+    Returns:
+        str: Revision (Commit-Hash oder Branch)
+    """
+    revision = os.getenv('EMBEDDING_MODEL_REVISION')
+    if revision:
+        return revision
+
+    try:
+        from huggingface_hub import try_to_load_from_cache
+
+        repo_id = model_name if '/' in model_name else f'sentence-transformers/{model_name}'
+        path = try_to_load_from_cache(repo_id, 'config.json')
+        if isinstance(path, str):
+            # .../snapshots/<commit>/config.json
+            return os.path.basename(os.path.dirname(path))
+    except ImportError:
+        pass
+
+    return 'unknown'
+
+
+class EmbeddingCache:
+    """
+    Zweistufiger Cache: In-Memory LRU vor memory-mapped Vektoren auf Disk.
+
+    Thread-safe, damit Hintergrund-Loader und Server-Sessions ihn teilen
+    können.
+    """
+
+    def __init__(self, model_name, revision, cache_dir=None, max_entries=None, backend='torch'):
+
+        self.model_name = model_name
+        self.revision = revision
+        self.backend = backend
+        # torch behält die Adressen von vor der Backend-Auswahl
+        self._identity = f'{model_name}@{revision}' if backend == 'torch' else f'{model_name}@{revision}#{backend}'
+
+        cache_dir = cache_dir or os.getenv('EMBEDDING_CACHE_DIR') or DEFAULT_CACHE_DIR
+        namespace = hashlib.sha1(self._identity.encode('utf-8')).hexdigest()[:16]
+        self.path = os.path.join(cache_dir, namespace)
+
+        self.max_entries = int(max_entries or os.getenv('EMBEDDING_CACHE_SIZE') or 4096)
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.dim = None
+        self._rows = {}
+        self._mmap = None
+        self._mmap_rows = 0
+
+        self.hits = 0
+        self.misses = 0
+
+        self._open()
+
+    @property
+    def identity(self):
+        """Model, Revision und Backend, von denen die Vektoren abhängen."""
+        return self._identity
+
+    # ------------------------------------------------------------------
+    # Dateien
+
+    def _file(self, name):
+        return os.path.join(self.path, name)
+
+    def _open(self):
+        """Lädt meta.json und index.tsv, verwirft inkonsistente Caches."""
+        os.makedirs(self.path, exist_ok=True)
+
+        meta_path = self._file('meta.json')
+        if not os.path.exists(meta_path):
+            return
+
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+
+        if meta.get('model') != self.model_name or meta.get('revision') != self.revision \
+                or meta.get('backend', 'torch') != self.backend:
+            logger.info("=== Embedding Cache invalidiert: %s ===", meta)
+            self._reset()
+            return
+
+        self.dim = meta['dim']
+        n_vectors = self._vector_count()
+
+        index_path = self._file('index.tsv')
+        if os.path.exists(index_path):
+            with open(index_path, encoding='utf-8') as f:
+                for line in f:
+                    key, _, row = line.rstrip('\n').partition('\t')
+                    # Abgebrochene Writes: nur Zeilen mit vorhandenem Vektor
+                    if row and int(row) < n_vectors:
+                        self._rows[key] = int(row)
+
+    def _reset(self):
+        for name in os.listdir(self.path):
+            os.remove(self._file(name))
+        self.dim = None
+        self._rows = {}
+        self._mmap = None
+        self._mmap_rows = 0
+
+    def _vector_count(self):
+        vectors_path = self._file('vectors.f32')
+        if self.dim is None or not os.path.exists(vectors_path):
+            return 0
+        return os.path.getsize(vectors_path) // (self.dim * 4)
+
+    def _vectors(self):
+        """Memory-mapped Sicht auf vectors.f32, wird nach Appends neu gemappt."""
+        n_vectors = self._vector_count()
+        if self._mmap is None or self._mmap_rows != n_vectors:
+            self._mmap = np.memmap(
+                self._file('vectors.f32'), dtype=np.float32, mode='r',
+                shape=(n_vectors, self.dim)
+            )
+            self._mmap_rows = n_vectors
+        return self._mmap
+
+    # ------------------------------------------------------------------
+    # Einzelne Texte
+
+    def key(self, text):
+        """Content-Adresse eines Texts für dieses Model."""
+        if self.backend == 'torch':
+            raw = f'{self.model_name}\0{self.revision}\0{text}'
+        else:
+            raw = f'{self.model_name}\0{self.revision}\0{self.backend}\0{text}'
+        return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get_many(self, texts):
+        """
+        Sucht Texte in LRU und Disk-Cache.
+
+        Args:
+            texts (list[str]): Texte
+
+        Returns:
+            list[np.ndarray | None]: Vektor pro Text, None bei Miss
+        """
+        result = []
+        with self._lock:
+            for text in texts:
+                key = self.key(text)
+                vector = self._lru.get(key)
+
+                if vector is not None:
+                    self._lru.move_to_end(key)
+                elif key in self._rows:
+                    vector = np.array(self._vectors()[self._rows[key]])
+                    self._remember(key, vector)
+
+                if vector is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                result.append(vector)
+        return result
+
+    def put_many(self, texts, vectors):
+        """
+        Schreibt neue Vektoren in LRU und hängt sie an die Disk-Dateien an.
+
+        Args:
+            texts (list[str]): Texte
+            vectors (np.ndarray): (len(texts), dim) float32
+        """
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                with open(self._file('meta.json'), 'w', encoding='utf-8') as f:
+                    json.dump({
+                        'model': self.model_name, 'revision': self.revision,
+                        'backend': self.backend, 'dim': self.dim,
+                    }, f)
+
+            new_keys = []
+            new_vectors = []
+            for text, vector in zip(texts, vectors):
+                key = self.key(text)
+                self._remember(key, vector.copy())
+                if key not in self._rows:
+                    new_keys.append(key)
+                    new_vectors.append(vector)
+
+            if not new_keys:
+                return
+
+            row = self._vector_count()
+            # Erst Vektoren, dann Index - so zeigt der Index nie ins Leere
+            with open(self._file('vectors.f32'), 'ab') as f:
+                f.write(np.vstack(new_vectors).tobytes())
+            with open(self._file('index.tsv'), 'a', encoding='utf-8') as f:
+                for key in new_keys:
+                    f.write(f'{key}\t{row}\n')
+                    self._rows[key] = row
+                    row += 1
+
+    def _remember(self, key, vector):
+        self._lru[key] = vector
+        self._lru.move_to_end(key)
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Abgeleitete Arrays
+
+    def load_array(self, name, content_hash):
+        """
+        Lädt ein abgeleitetes Array, falls es zum content_hash passt.
+
+        Returns:
+            np.ndarray | None: Array (memory-mapped) oder None wenn veraltet
+        """
+        path = self._file(f'{name}.npy')
+        hash_path = self._file(f'{name}.hash')
+        if not os.path.exists(path) or not os.path.exists(hash_path):
+            return None
+
+        with open(hash_path, encoding='utf-8') as f:
+            if f.read().strip() != content_hash:
+                return None
+        return np.load(path, mmap_mode='r')
+
+    def save_array(self, name, content_hash, array):
+        """Speichert ein abgeleitetes Array zusammen mit seinem content_hash."""
+        with self._lock:
+            np.save(self._file(f'{name}.npy'), np.ascontiguousarray(array))
+            with open(self._file(f'{name}.hash'), 'w', encoding='utf-8') as f:
+                f.write(content_hash)
@@ -1,86 +1,350 @@
+import os
+import hashlib
 import logging
+import threading
 from typing import List
 
-from sentence_transformers import SentenceTransformer, util
+import numpy as np
 from model.command_templates import COMMAND_TEMPLATES
+from utils.embedding_cache import EmbeddingCache, model_revision
+from utils.encode_scheduler import EncodeScheduler
+from utils.entity_index import EntityIndex
+from utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = 'paraphrase-multilingual-MiniLM-L12-v2'
+
+# Inferenz-Backends, Auswahl über EMBEDDING_BACKEND
+# torch: SentenceTransformer wie bisher
+# onnx:  ONNX Runtime (sentence-transformers[onnx]), Datei über EMBEDDING_ONNX_FILE
+#        (z.B. onnx/model_qint8_avx512_vnni.onnx für das quantisierte Export)
+# int8:  torch mit dynamisch quantisierten Linear-Layern (qint8)
+ENCODER_BACKENDS = ('torch', 'onnx', 'int8')
+
+# Embedding-Felder die beim Noun-Matching zählen
+MATCH_FIELDS = ('name_emb', 'synonyms_emb')
+
+
+def encoder_backend():
+    """
+    Liest das Inferenz-Backend aus der .env.
+
+    Returns:
+        tuple[str, str | None]: (EMBEDDING_BACKEND, EMBEDDING_ONNX_FILE)
+    """
+    backend = (os.getenv('EMBEDDING_BACKEND') or 'torch').lower()
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"Unbekanntes EMBEDDING_BACKEND: '{backend}' ({', '.join(ENCODER_BACKENDS)})")
+    return backend, os.getenv('EMBEDDING_ONNX_FILE') or None
+
+
+def cache_backend(backend, onnx_file=None):
+    """Backend-Teil des Cache-Keys (ONNX-Varianten liefern unterschiedliche Vektoren)."""
+    return f'{backend}:{onnx_file}' if backend == 'onnx' and onnx_file else backend
+
 
 # Singleton damit der speicher nicht so schnell ausgeht :)
 
 class EmbeddingUtils:
     """
     Singleton für Embedding-basiertes Matching.
-    
-    Wird automatisch als Singleton behandelt - jeder Aufruf von 
+
+    Wird automatisch als Singleton behandelt - jeder Aufruf von
     EmbeddingUtils() gibt die gleiche Instanz zurück.
+
+    Alle Embeddings laufen über encode() und damit über den EmbeddingCache.
+    Cache-Misses gehen über den EncodeScheduler, der gleichzeitige Requests
+    (z.B. mehrerer Server-Sessions) zu einem Model-Batch zusammenfasst.
+    Das SentenceTransformer Model wird erst beim ersten Cache-Miss geladen.
     """
 
     _instance = None
 
     def __new__(cls):
-        
+
         if cls._instance is None:
             cls._instance = super().__new__(cls)
 
-            cls._instance.model = SentenceTransformer('paraphrase-multilingual-MiniLM-L12-v2')
-            cls._instance.util = util
-            
-            cls._instance.command_emb = {}
-            for templates in COMMAND_TEMPLATES:
-                cls._instance.command_emb[templates.command] = cls._instance.model.encode(templates.verbs)
-        
-            logging.basicConfig(
-                filename='parser_debug.log',
-                level=logging.INFO,
-                format='%(asctime)s - %(message)s'
+            cls._instance._model = None
+            cls._instance._model_lock = threading.Lock()
+
+            cls._instance.backend, cls._instance.onnx_file = encoder_backend()
+            cls._instance.cache = EmbeddingCache(
+                MODEL_NAME, model_revision(MODEL_NAME),
+                backend=cache_backend(cls._instance.backend, cls._instance.onnx_file)
             )
+            cls._instance.scheduler = EncodeScheduler(cls._instance._encode_batch)
+            cls._instance._build_command_matrix()
+            cls._instance._build_command_lexicon()
+            cls._instance.entity_index = EntityIndex()
 
         return cls._instance
 
-    def verb_to_command(self, verb):
+    @property
+    def model(self):
+        """SentenceTransformer, wird beim ersten Zugriff geladen."""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    self._model = self._load_model()
+        return self._model
+
+    def _load_model(self):
+        """Lädt den SentenceTransformer für das gewählte Backend."""
+        # sentence_transformers (und damit torch) erst bei Bedarf importieren
+        from sentence_transformers import SentenceTransformer
+
+        revision = None if self.cache.revision == 'unknown' else self.cache.revision
+
+        if self.backend == 'onnx':
+            model_kwargs = {'file_name': self.onnx_file} if self.onnx_file else None
+            model = SentenceTransformer(MODEL_NAME, revision=revision, backend='onnx', model_kwargs=model_kwargs)
+        else:
+            model = SentenceTransformer(MODEL_NAME, revision=revision)
+
+        if self.backend == 'int8':
+            import torch
+
+            # Gewichte der Linear-Layer als int8, Aktivierungen zur Laufzeit quantisiert
+            torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+        logger.info("=== Embedding Backend: %s ===", cache_backend(self.backend, self.onnx_file))
+        return model
+
+    @property
+    def dimensions(self):
+        """Dimension der Embeddings (aus der Command-Matrix, ohne das Model zu laden)."""
+        return int(self.command_matrix.shape[1])
+
+    def warm_up(self):
+        """
+        Lädt das Model und macht einen Forward-Pass am Cache vorbei.
+
+        Damit zahlt der erste Cache-Miss im Spiel weder Model-Loading noch
+        First-Call-Overhead (Lazy Init in torch/tokenizer).
+        """
+        self.model.encode(['warm up'], normalize_embeddings=True)
+        # am Lexikon vorbei, damit auch das Ranking einmal gelaufen ist
+        self._rank_commands(self.encode('nehmen'))
+
+    @METRICS.timed('embedding.forward')
+    def _encode_batch(self, texts):
+        """Ein Model-Forward-Pass für einen Scheduler-Batch (am Cache vorbei)."""
+        encoded = self.model.encode(texts, normalize_embeddings=True)
+        return np.asarray(encoded, dtype=np.float32)
+
+    @METRICS.timed('embedding.encode_bulk')
+    def encode_bulk(self, texts, batch_size=256):
+        """
+        Embedded viele Texte am Cache und Scheduler vorbei (Welt-Import).
+
+        Doppelte Texte werden nur einmal encodet, das Model sortiert nach
+        Länge und arbeitet in Batches von batch_size.
+
+        Args:
+            texts (list[str]): Texte
+            batch_size (int): Texte pro Forward-Pass
+
+        Returns:
+            np.ndarray: (len(texts), dim) float32, L2-normalisiert
+        """
+        unique = list(dict.fromkeys(texts))
+        if not unique:
+            return np.empty((0, self.dimensions), dtype=np.float32)
+        encoded = self.model.encode(unique, batch_size=batch_size, normalize_embeddings=True)
+        encoded = np.asarray(encoded, dtype=np.float32)
+        rows = {text: i for i, text in enumerate(unique)}
+        return encoded[[rows[text] for text in texts]]
+
+    @METRICS.timed('embedding.encode')
+    def encode(self, texts):
+        """
+        Embedded Texte normalisiert, Cache zuerst, Model nur für Misses.
+
+        Args:
+            texts (str | list[str]): Einzelner Text oder Liste
+
+        Returns:
+            np.ndarray: (dim,) bzw. (len(texts), dim) float32, L2-normalisiert
+        """
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+
+        vectors = self.cache.get_many(texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+
+        if missing:
+            missing_texts = [texts[i] for i in missing]
+            encoded = self.scheduler.encode(missing_texts)
+            self.cache.put_many(missing_texts, encoded)
+            for i, vector in zip(missing, encoded):
+                vectors[i] = vector
+
+        result = np.vstack(vectors).astype(np.float32, copy=False)
+        return result[0] if single else result
+
+    def _build_command_matrix(self):
+        """
+        Baut eine gestapelte, normalisierte Matrix aller Template-Verben.
+
+        Die Zeilen sind pro Command zusammenhängend abgelegt, damit das
+        Maximum pro Command mit einem einzigen reduceat berechnet werden kann.
+        Die Matrix wird mit dem Hash der Templates im Cache abgelegt und
+        bei jeder Template-Änderung neu gebaut.
+
+        Setzt:
+            command_matrix (np.ndarray): (n_verbs, dim) float32, L2-normalisiert
+            command_rows (np.ndarray): Zeile → Index in command_names
+            command_offsets (np.ndarray): Start-Zeile jedes Commands
+            command_names (list[str]): Command-Namen in Template-Reihenfolge
+            command_thresholds (np.ndarray): Threshold je Command
+        """
+        verbs = []
+        rows = []
+        offsets = []
+
+        for i, template in enumerate(COMMAND_TEMPLATES):
+            offsets.append(len(verbs))
+            verbs.extend(template.verbs)
+            rows.extend([i] * len(template.verbs))
+
+        templates_hash = hashlib.sha1(
+            '\0'.join(f'{t.command}:{"|".join(t.verbs)}' for t in COMMAND_TEMPLATES).encode('utf-8')
+        ).hexdigest()
+
+        matrix = self.cache.load_array('commands', templates_hash)
+        if matrix is None:
+            matrix = np.ascontiguousarray(self.encode(verbs))
+            self.cache.save_array('commands', templates_hash, matrix)
+
+        self.command_matrix = matrix
+        self.command_rows = np.asarray(rows, dtype=np.int32)
+        self.command_offsets = np.asarray(offsets, dtype=np.intp)
+        self.command_names = [t.command for t in COMMAND_TEMPLATES]
+        self.command_thresholds = np.asarray(
+            [t.threshold for t in COMMAND_TEMPLATES], dtype=np.float32
+        )
+
+    def _build_command_lexicon(self):
+        """
+        Baut das Verb-Lexikon: normalisierte Template-Form → Commands.
+
+        Trennbare Verben stehen in beiden Wortfolgen drin ("leg ab" und
+        "ab leg"), die zusammengeschriebene Form ("ablegen") steht als
+        eigenes Template-Verb in den Templates. Verben aus mehreren
+        Templates ("ziehen": go und use) zeigen auf alle Commands.
+
+        Setzt:
+            command_lexicon (dict[str, list[str]]): Verb → Commands in Template-Reihenfolge
+        """
+        lexicon = {}
+        for template in COMMAND_TEMPLATES:
+            for form in template.verbs:
+                words = form.lower().split()
+                for key in {' '.join(words), ' '.join(reversed(words))}:
+                    commands = lexicon.setdefault(key, [])
+                    if template.command not in commands:
+                        commands.append(template.command)
+        self.command_lexicon = lexicon
+
+    def _lexicon_lookup(self, verb):
+        """
+        Sucht ein Verb im Lexikon.
+
+        Neben der Form selbst wird die spaCy-Form mit vorangestellter
+        Partikel ("ab legen") auch zusammengeschrieben ("ablegen") gesucht.
+
+        Returns:
+            list[str] | None: Commands oder None wenn unbekannt
+        """
+        words = verb.lower().split()
+        keys = [' '.join(words)]
+        if len(words) == 2:
+            keys.append(''.join(words))
+        for key in keys:
+            commands = self.command_lexicon.get(key)
+            if commands:
+                return commands
+        return None
+
+    @METRICS.timed('embedding.verb_to_command')
+    def verb_to_command(self, verb, top_k=None):
         """
-        Matcht Verb zu Command via Cosine Similarity.
+        Matcht Verb zu Command, zuerst über das Lexikon, sonst via Cosine Similarity.
+
+        Steht das Verb wörtlich in den Templates, kommen die Commands ohne
+        Model-Aufruf aus dem Lexikon (sim 1.0, bei mehreren Templates
+        mehrdeutig). Sonst ein Matrix-Vektor-Produkt über alle
+        Template-Verben, danach Maximum pro Command (Segment-Max) und Top-k
+        Auswahl. Commands unter ihrem CommandTemplate.threshold werden
+        verworfen.
 
         Args:
             verb (str): Geparster Verb-String aus Parser
+            top_k (int | None): Maximal zurückgegebene Commands (None = alle)
 
         Returns:
             list[dict]: Sortierte Commands [{command, sim}] (höchste zuerst)
                 - command: ActionCommand-String (go/take/drop)
                 - sim: Cosine Similarity (0.0-1.0)
         """
-        logging.info(f"=== Verb Input: '{verb}' ===")
-        result =  []
+        logger.debug("=== Verb Input: '%s' ===", verb)
 
         if verb is None:
-            result.append({
-                'command': None,
-                'sim': 0.0
-            })
-            return result 
+            return [{'command': None, 'sim': 0.0}]
+
+        commands = self._lexicon_lookup(verb)
+        if commands is not None:
+            result = [{'command': command, 'sim': 1.0} for command in commands][:top_k]
+            logger.debug("=== Verb Output (Lexikon): %s ===", result)
+            return result
+
+        result = self._rank_commands(self.encode(verb), top_k)
 
-        verb_emb = self.model.encode(verb)
+        logger.debug("=== Verb Output: %s ===", result)
+        return result
+
+    def _rank_commands(self, verb_emb, top_k=None):
+        """
+        Rankt Commands für ein bereits normalisiertes Verb-Embedding.
+
+        Args:
+            verb_emb (np.ndarray): (dim,) float32, L2-normalisiert
+            top_k (int | None): Maximal zurückgegebene Commands
 
-        for command, command_emb in self.command_emb.items():
+        Returns:
+            list[dict]: [{command, sim}] absteigend sortiert
+        """
+        sims = self.command_matrix @ verb_emb
+        command_sims = np.maximum.reduceat(sims, self.command_offsets)
 
-            similarities = self.util.cos_sim(verb_emb, command_emb)
-            max_sim = similarities.max().item()
+        passed = np.flatnonzero(command_sims >= self.command_thresholds)
+        if top_k is not None and top_k < len(passed):
+            part = np.argpartition(-command_sims[passed], top_k - 1)[:top_k]
+            passed = passed[part]
+        order = passed[np.argsort(-command_sims[passed], kind='stable')]
 
-            result.append({
-                'command': command,
-                'sim': max_sim
-            })
+        return [
+            {'command': self.command_names[i], 'sim': float(command_sims[i])}
+            for i in order
+        ]
 
-        result.sort(key=lambda x: x['sim'], reverse=True)
-        logging.info(f"=== Verb Output: {result} ===")
-        return result
-    
-    def match_entities(self, query_text: str, states: dict):
+    @METRICS.timed('embedding.match_entities')
+    def match_entities(self, query_text: str, states: dict, top_k=None):
         """
         Matcht Noun zu Entity (Item/Location) via Cosine Similarity.
 
+        Die Kandidaten werden über den residenten EntityIndex gematcht
+        (ein Matrix-Vektor-Produkt über die Kandidaten-Zeilen). Kandidaten
+        die noch nicht im Index sind, werden aus ihrem name_emb nachgetragen,
+        ohne name_emb wird der Name encodet. Der Controller lädt fehlende
+        Embeddings vorher per GameModel.entity_embeddings(ids) nach.
+
         Args:
             query_text (str): Geparster Noun-String aus Parser
-            states (list[dict]): Kandidaten-Liste mit name_emb Property
+            states (list[dict]): Kandidaten-Liste mit id, name (und name_emb)
+            top_k (int | None): Maximal zurückgegebene Entities (None = alle)
 
         Returns:
             list[dict]: Sortierte Entities [{target, name, sim}] (höchste zuerst)
@@ -90,25 +354,31 @@ class EmbeddingUtils:
         """
         candidates = [x for x in states]
 
-        logging.info(f"=== Noun Import: '{query_text}' | Candidates: {candidates} ===")
-        result = []
-
-        # Query embedden
-        query_emb = self.model.encode(query_text)
+        logger.debug("=== Noun Input: '%s' | Candidates: %s ===", query_text, len(candidates))
 
-        # Einzeln mit kandidaten vergleichen
+        names = {}
+        unembedded = []
         for candidate in candidates:
+            names[candidate['id']] = candidate['name']
+            if candidate['id'] not in self.entity_index:
+                if candidate.get('name_emb') is not None:
+                    self.entity_index.upsert(candidate['id'], candidate)
+                else:
+                    unembedded.append(candidate)
 
-            similarities = self.util.cos_sim(query_emb, candidate['name_emb'])
-            max_sim = similarities.max().item()
+        # Welten ohne gespeicherte Embeddings (z.B. Welt-Datei im MemoryBackend)
+        if unembedded:
+            vectors = self.encode([c['name'] for c in unembedded])
+            for candidate, vector in zip(unembedded, vectors):
+                self.entity_index.upsert(candidate['id'], {'name_emb': vector})
 
-            result.append({
-                'target': candidate['id'],
-                'name': candidate['name'],
-                'sim': max_sim
-            })
+        # Query embedden und gegen alle Kandidaten-Zeilen matchen
+        query_emb = self.encode(query_text)
+        hits = self.entity_index.search(query_emb, list(names), fields=MATCH_FIELDS, top_k=top_k)
 
-        # Nach similarity sortieren
-        result.sort(key=lambda x: x['sim'], reverse=True)
-        logging.info(f"=== Noun Output: {result} ===")
+        result = [
+            {'target': entity_id, 'name': names[entity_id], 'sim': sim}
+            for entity_id, sim in hits
+        ]
+        logger.debug("=== Noun Output: %s ===", result)
         return result
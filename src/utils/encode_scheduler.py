@@ -0,0 +1,188 @@
+"""
+Micro-Batching Scheduler für Embedding-Inferenz.
+
+Mehrere Sessions rufen encode() gleichzeitig mit einzelnen Texten auf.
+Statt jeden Text einzeln durch den Transformer zu schicken, sammelt ein
+Dispatcher-Thread die wartenden Texte und encoded sie in einem Batch.
+Ein Batch wird abgeschickt, sobald max_batch_size Texte warten oder der
+älteste Request max_wait_ms gewartet hat - so bleibt die zusätzliche
+Latenz für einen einzelnen Spieler auf wenige Millisekunden begrenzt.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import Counter, deque
+from concurrent.futures import Future
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class EncodeScheduler:
+    """
+    Sammelt encode-Requests und führt sie als Batches aus.
+
+    submit() gibt ein concurrent.futures.Future zurück (in asyncio per
+    asyncio.wrap_future awaitbar), encode() wartet blockierend darauf.
+    Gleiche Texte innerhalb eines Batches werden nur einmal encoded.
+    """
+
+    def __init__(self, encode_fn, max_batch_size=None, max_wait_ms=None):
+        """
+        Args:
+            encode_fn (callable): list[str] → np.ndarray (len(texts), dim)
+            max_batch_size (int | None): Texte pro Batch, Default aus
+                ENCODE_MAX_BATCH_SIZE (64)
+            max_wait_ms (float | None): Maximale Wartezeit des ältesten
+                Requests, Default aus ENCODE_MAX_WAIT_MS (2)
+        """
+        self.encode_fn = encode_fn
+        self.max_batch_size = max_batch_size or int(os.getenv('ENCODE_MAX_BATCH_SIZE') or 64)
+        if max_wait_ms is None:
+            max_wait_ms = float(os.getenv('ENCODE_MAX_WAIT_MS') or 2)
+        self.max_wait = max_wait_ms / 1000
+
+        self._pending = deque()
+        self._pending_texts = 0
+        self._cond = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+        # Metriken
+        self.max_queue_depth = 0
+        self.batches = 0
+        self.texts = 0
+        self.batch_sizes = Counter()
+        self.encode_seconds = 0.0
+
+    def close(self):
+        """Stoppt den Dispatcher, wartende Requests werden noch abgearbeitet."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def submit(self, texts):
+        """
+        Reiht Texte zum Encoden ein.
+
+        Args:
+            texts (list[str]): Texte
+
+        Returns:
+            Future: Ergebnis np.ndarray (len(texts), dim) float32
+        """
+        future = Future()
+        texts = list(texts)
+        if not texts:
+            future.set_result(np.empty((0, 0), dtype=np.float32))
+            return future
+
+        with self._cond:
+            if self._closed:
+                raise RuntimeError('EncodeScheduler ist geschlossen')
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='encode-scheduler', daemon=True)
+                self._thread.start()
+
+            self._pending.append((texts, future, time.perf_counter()))
+            self._pending_texts += len(texts)
+            self.max_queue_depth = max(self.max_queue_depth, self._pending_texts)
+            self._cond.notify()
+        return future
+
+    def encode(self, texts):
+        """Wie submit(), wartet aber auf das Ergebnis."""
+        return self.submit(texts).result()
+
+    @property
+    def queue_depth(self):
+        """Anzahl Texte, die gerade auf einen Batch warten."""
+        with self._cond:
+            return self._pending_texts
+
+    def stats(self):
+        """
+        Metriken seit dem Start.
+
+        Returns:
+            dict: queue_depth, max_queue_depth, batches, texts,
+                avg_batch_size, batch_sizes (Größe → Anzahl),
+                avg_encode_ms, encodes_per_s (Texte pro Sekunde Model-Zeit)
+        """
+        with self._cond:
+            return {
+                'queue_depth': self._pending_texts,
+                'max_queue_depth': self.max_queue_depth,
+                'batches': self.batches,
+                'texts': self.texts,
+                'avg_batch_size': self.texts / self.batches if self.batches else 0.0,
+                'batch_sizes': dict(sorted(self.batch_sizes.items())),
+                'avg_encode_ms': self.encode_seconds * 1000 / self.batches if self.batches else 0.0,
+                'encodes_per_s': self.texts / self.encode_seconds if self.encode_seconds else 0.0,
+            }
+
+    def _next_batch(self):
+        """
+        Wartet auf Requests und nimmt einen Batch aus der Queue.
+
+        Returns:
+            list | None: [(texts, future, enqueued)] oder None nach close()
+        """
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            if not self._pending:
+                return None
+
+            # Auf weitere Requests warten, bis der Batch voll ist oder der
+            # älteste Request seine Wartezeit ausgeschöpft hat
+            deadline = self._pending[0][2] + self.max_wait
+            while self._pending_texts < self.max_batch_size and not self._closed:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+
+            # Ganze Requests bis max_batch_size (ein zu großer Request geht allein)
+            batch = [self._pending.popleft()]
+            size = len(batch[0][0])
+            while self._pending and size + len(self._pending[0][0]) <= self.max_batch_size:
+                request = self._pending.popleft()
+                batch.append(request)
+                size += len(request[0])
+            self._pending_texts -= size
+            return batch
+
+    def _run(self):
+        """Dispatcher-Loop (läuft im Scheduler-Thread)."""
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            # Duplikate über alle Requests nur einmal encoden
+            unique = list(dict.fromkeys(text for texts, _, _ in batch for text in texts))
+            start = time.perf_counter()
+            try:
+                vectors = np.asarray(self.encode_fn(unique), dtype=np.float32)
+            except Exception as e:
+                logger.exception("=== EncodeScheduler: Batch mit %s Texten fehlgeschlagen ===", len(unique))
+                for _, future, _ in batch:
+                    future.set_exception(e)
+                continue
+            elapsed = time.perf_counter() - start
+
+            rows = {text: i for i, text in enumerate(unique)}
+            for texts, future, _ in batch:
+                future.set_result(vectors[[rows[text] for text in texts]])
+
+            with self._cond:
+                self.batches += 1
+                self.texts += len(unique)
+                self.batch_sizes[len(unique)] += 1
+                self.encode_seconds += elapsed
@@ -0,0 +1,161 @@
+"""
+Resident Vektor-Index für Entity-Embeddings.
+
+Hält name_emb, description_emb und synonyms_emb aller Locations, Items
+und NPCs in einer zusammenhängenden, normalisierten float32 Matrix.
+Matching über eine Kandidatenmenge ist damit ein einziges Matrix-Vektor-
+Produkt über die Kandidaten-Zeilen plus argpartition für Top-k.
+"""
+
+import threading
+
+import numpy as np
+
+
+EMBEDDING_FIELDS = ('name_emb', 'description_emb', 'synonyms_emb')
+
+
+class EntityIndex:
+    """
+    In-Process Index: Entity-ID → Zeilen in einer float32 Matrix.
+
+    Jede Entity belegt eine Zeile pro vorhandenem Embedding-Feld. Zeilen
+    werden inkrementell per upsert()/remove() gepflegt, frei gewordene
+    Zeilen wiederverwendet, die Matrix wächst durch Verdoppeln.
+    """
+
+    def __init__(self, capacity=256):
+
+        self.capacity = capacity
+        self.dim = None
+
+        self._matrix = None
+        self._fields = None
+        self._rows = {}
+        self._free = []
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __contains__(self, entity_id):
+        return entity_id in self._rows
+
+    def load(self, entities):
+        """
+        Füllt den Index aus DB-Rows.
+
+        Args:
+            entities (list[dict]): Rows mit id und den EMBEDDING_FIELDS
+        """
+        for entity in entities:
+            self.upsert(entity['id'], entity)
+
+    def upsert(self, entity_id, embeddings):
+        """
+        Fügt eine Entity ein oder ersetzt ihre Vektoren.
+
+        Args:
+            entity_id (str): Entity ID
+            embeddings (dict): Feld → Vektor (Liste oder Array), fehlende
+                oder None-Felder werden übersprungen
+        """
+        vectors = []
+        fields = []
+        for field_id, field in enumerate(EMBEDDING_FIELDS):
+            vector = embeddings.get(field)
+            if vector is not None:
+                vectors.append(np.asarray(vector, dtype=np.float32))
+                fields.append(field_id)
+
+        if not vectors:
+            return
+
+        vectors = np.vstack(vectors)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1, norms)
+
+        with self._lock:
+            self._remove(entity_id)
+            rows = self._allocate(len(vectors), vectors.shape[1])
+            self._matrix[rows] = vectors
+            self._fields[rows] = fields
+            self._rows[entity_id] = rows
+
+    def remove(self, entity_id):
+        """Entfernt eine Entity, ihre Zeilen werden wiederverwendet."""
+        with self._lock:
+            self._remove(entity_id)
+
+    def _remove(self, entity_id):
+        rows = self._rows.pop(entity_id, None)
+        if rows is not None:
+            self._fields[rows] = -1
+            self._free.extend(rows.tolist())
+
+    def _allocate(self, n, dim):
+        """Gibt n freie Zeilen zurück, vergrößert die Matrix bei Bedarf."""
+        if self._matrix is None:
+            self.dim = dim
+            self._matrix = np.zeros((self.capacity, dim), dtype=np.float32)
+            self._fields = np.full(self.capacity, -1, dtype=np.int8)
+
+        rows = [self._free.pop() for _ in range(min(n, len(self._free)))]
+        missing = n - len(rows)
+
+        if self._size + missing > self.capacity:
+            while self._size + missing > self.capacity:
+                self.capacity *= 2
+            matrix = np.zeros((self.capacity, self.dim), dtype=np.float32)
+            matrix[:self._size] = self._matrix[:self._size]
+            fields = np.full(self.capacity, -1, dtype=np.int8)
+            fields[:self._size] = self._fields[:self._size]
+            self._matrix, self._fields = matrix, fields
+
+        rows.extend(range(self._size, self._size + missing))
+        self._size += missing
+        return np.asarray(rows, dtype=np.intp)
+
+    def search(self, query_emb, entity_ids, fields=EMBEDDING_FIELDS, top_k=None):
+        """
+        Sucht die ähnlichsten Entities innerhalb einer Kandidatenmenge.
+
+        Args:
+            query_emb (np.ndarray): (dim,) Query-Vektor, L2-normalisiert
+            entity_ids (list[str]): Kandidaten (unbekannte IDs werden ignoriert)
+            fields (tuple[str]): Welche Embedding-Felder zählen
+            top_k (int | None): Maximal zurückgegebene Entities
+
+        Returns:
+            list[tuple[str, float]]: (id, sim) absteigend, max über die Felder
+        """
+        field_ids = [EMBEDDING_FIELDS.index(f) for f in fields]
+
+        with self._lock:
+            ids = [i for i in entity_ids if i in self._rows]
+            if not ids:
+                return []
+
+            row_lists = [self._rows[i] for i in ids]
+            rows = np.concatenate(row_lists)
+            owner = np.repeat(np.arange(len(ids)), [len(r) for r in row_lists])
+            mask = np.isin(self._fields[rows], field_ids)
+            rows, owner = rows[mask], owner[mask]
+            if len(rows) == 0:
+                return []
+
+            sims = self._matrix[rows] @ np.asarray(query_emb, dtype=np.float32)
+
+        # Max pro Kandidat (Zeilen sind pro Kandidat zusammenhängend)
+        starts = np.flatnonzero(np.r_[True, owner[1:] != owner[:-1]])
+        entity_sims = np.maximum.reduceat(sims, starts)
+        entity_owner = owner[starts]
+
+        if top_k is not None and top_k < len(entity_sims):
+            picked = np.argpartition(-entity_sims, top_k - 1)[:top_k]
+        else:
+            picked = np.arange(len(entity_sims))
+        picked = picked[np.argsort(-entity_sims[picked], kind='stable')]
+
+        return [(ids[entity_owner[i]], float(entity_sims[i])) for i in picked]
@@ -0,0 +1,163 @@
+"""
+Zentrales Logging-Setup für alle Entry Points.
+
+Die Module loggen über logging.getLogger(__name__) mit %-Platzhaltern,
+formatiert wird erst, wenn ein Record den Level-Check passiert hat.
+Geschrieben wird in einem Hintergrund-Thread (QueueHandler →
+QueueListener), der Game Loop wartet nie auf die Log-Datei.
+
+Konfiguration über .env:
+    LOG_FILE      Ziel-Datei (Default: parser_debug.log, '-' für stderr)
+    LOG_LEVEL     Root-Level (Default: INFO)
+    LOG_LEVELS    Level pro Modul, z.B. "utils.smart_parser=DEBUG,model=WARNING"
+    LOG_SAMPLE    Anteil behaltener DEBUG/INFO Records pro Modul,
+                  z.B. "utils.embedding_utils=0.1" (WARNING und höher immer)
+    LOG_FORMAT    text (Default) oder json (ein Objekt pro Zeile)
+
+Embeddings werden nie geloggt: numpy-Arrays und *_emb Felder in den
+Log-Argumenten ersetzt der Handler durch einen Platzhalter.
+"""
+
+import os
+import json
+import queue
+import atexit
+import random
+import logging
+import logging.handlers
+
+import numpy as np
+from dotenv import load_dotenv
+
+TEXT_FORMAT = '%(asctime)s - %(levelname)s - %(name)s - %(message)s'
+
+# Argumente, die sicher unformatiert in den Hintergrund-Thread dürfen
+IMMUTABLE_TYPES = (str, int, float, bool, type(None))
+
+_listener = None
+
+
+def _module_settings(value, convert):
+    """Parst "modul=wert,modul=wert" zu {modul: wert}."""
+    settings = {}
+    for entry in (value or '').split(','):
+        if '=' not in entry:
+            continue
+        module, setting = entry.split('=', 1)
+        settings[module.strip()] = convert(setting.strip())
+    return settings
+
+
+def _redact(value):
+    """Ersetzt Vektoren durch einen Platzhalter (flach in dicts und Listen)."""
+    if isinstance(value, np.ndarray):
+        return f'<vector {value.shape}>'
+    if isinstance(value, dict):
+        return {
+            key: f'<vector {len(v) if hasattr(v, "__len__") else "?"}>'
+            if str(key).endswith(('_emb', '_emb_bin')) and v is not None else _redact(v)
+            for key, v in value.items()
+        }
+    if isinstance(value, list):
+        return [_redact(v) for v in value]
+    return value
+
+
+class SamplingFilter(logging.Filter):
+    """Behält pro Modul nur einen Anteil der DEBUG/INFO Records."""
+
+    def __init__(self, rates):
+        super().__init__()
+        # längster Präfix zuerst, "model.world_model" vor "model"
+        self.rates = sorted(rates.items(), key=lambda item: -len(item[0]))
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        for module, rate in self.rates:
+            if record.name == module or record.name.startswith(module + '.'):
+                return random.random() < rate
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Ein JSON-Objekt pro Record (ts, level, logger, message, exc)."""
+
+    def format(self, record):
+        entry = {
+            'ts': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class BackgroundQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler, der das Formatieren dem Listener-Thread überlässt.
+
+    Der Standard-QueueHandler formatiert schon im aufrufenden Thread.
+    Hier bleiben msg und args unformatiert, solange die Argumente
+    unveränderlich sind; veränderliche Objekte (dicts, Listen) werden
+    vorher redigiert und formatiert, damit der Listener keinen späteren
+    Zustand sieht.
+    """
+
+    def prepare(self, record):
+        args = record.args
+        if args and not (isinstance(args, tuple) and all(isinstance(arg, IMMUTABLE_TYPES) for arg in args)):
+            try:
+                if isinstance(args, tuple):
+                    record.msg = record.msg % tuple(_redact(arg) for arg in args)
+                else:
+                    record.msg = record.msg % _redact(args)  # logger.info('%(key)s', mapping)
+                record.args = None
+            except (TypeError, ValueError):
+                pass  # der Handler im Listener meldet den Formatfehler
+        if record.exc_info:
+            return super().prepare(record)
+        return record
+
+
+def setup_logging():
+    """
+    Richtet das Logging einmalig ein (weitere Aufrufe sind No-ops).
+
+    Returns:
+        logging.handlers.QueueListener: Laufender Listener (stop() flusht)
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    load_dotenv()
+
+    log_file = os.getenv('LOG_FILE') or 'parser_debug.log'
+    if log_file == '-':
+        target = logging.StreamHandler()
+    else:
+        target = logging.FileHandler(log_file, encoding='utf-8')
+    if os.getenv('LOG_FORMAT', 'text').lower() == 'json':
+        target.setFormatter(JsonFormatter())
+    else:
+        target.setFormatter(logging.Formatter(TEXT_FORMAT))
+
+    log_queue = queue.SimpleQueue()
+    handler = BackgroundQueueHandler(log_queue)
+    rates = _module_settings(os.getenv('LOG_SAMPLE'), float)
+    if rates:
+        handler.addFilter(SamplingFilter(rates))
+
+    root = logging.getLogger()
+    root.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+    root.addHandler(handler)
+    for module, level in _module_settings(os.getenv('LOG_LEVELS'), str.upper).items():
+        logging.getLogger(module).setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, target, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+    return _listener
@@ -0,0 +1,231 @@
+"""
+Latenz-Histogramme für State-Handler, Model-, Parser- und Embedding-Aufrufe.
+
+Spans messen mit perf_counter und landen in festen Buckets (ein bisect +
+zwei Additionen unter einem Lock, ~1 µs pro Span), damit die Messung auch
+im Betrieb an bleiben kann. Export auf Anfrage als Prometheus-Textformat
+oder JSON (main.py --metrics FILE, GameServer: SERVER_METRICS_PORT).
+
+Wartezeit auf den Spieler (Eingabe, Auswahl) wird als eigener Span mit
+exclusive=True gemessen und aus den umschließenden Spans herausgerechnet.
+Die offenen Spans liegen in einer ContextVar, damit das auch über
+run_in_executor mit copy_context() hinweg funktioniert (AsyncGameController).
+"""
+
+import os
+import json
+import time
+import bisect
+import inspect
+import threading
+import functools
+import contextvars
+from contextlib import contextmanager
+from dotenv import load_dotenv
+
+# Sekunden, grob logarithmisch von 50 µs bis 10 s
+BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+
+class Histogram:
+    """Kumulierbare Bucket-Counts, Summe und Anzahl eines Spans."""
+
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # letzter Bucket: +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        i = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += seconds
+            self.count += 1
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: count, sum, buckets (obere Grenze → kumulierte Anzahl), p50, p95, p99
+        """
+        with self._lock:
+            counts = list(self.counts)
+            total, count = self.sum, self.count
+
+        cumulative = []
+        running = 0
+        for n in counts:
+            running += n
+            cumulative.append(running)
+        bounds = [*self.buckets, float('inf')]
+        return {
+            'count': count,
+            'sum': total,
+            'buckets': dict(zip(('+Inf' if b == float('inf') else str(b) for b in bounds), cumulative)),
+            **{f'p{q}': self._quantile(bounds, cumulative, count, q / 100) for q in (50, 95, 99)},
+        }
+
+    @staticmethod
+    def _quantile(bounds, cumulative, count, q):
+        """Obere Bucket-Grenze, unter der q aller Werte liegen (None ohne Werte)."""
+        if not count:
+            return None
+        rank = q * count
+        for bound, n in zip(bounds, cumulative):
+            if n >= rank:
+                return bound
+        return bounds[-1]
+
+
+class Metrics:
+    """
+    Registry der Span-Histogramme (Name → Histogram).
+
+    Abschaltbar über METRICS_ENABLED=0, dann kosten span() und timed()
+    nur noch den Aufruf selbst.
+    """
+
+    def __init__(self, enabled=None):
+        if enabled is None:
+            load_dotenv()
+            enabled = os.getenv('METRICS_ENABLED', '1').lower() not in ('0', 'false', 'no')
+        self.enabled = enabled
+        self.histograms = {}
+        self._lock = threading.Lock()
+        self._open = contextvars.ContextVar('open_spans', default=None)
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, Histogram())
+        return histogram
+
+    def _open_spans(self):
+        spans = self._open.get()
+        if spans is None:
+            spans = []
+            self._open.set(spans)
+        return spans
+
+    @contextmanager
+    def span(self, name, exclusive=False):
+        """
+        Misst die Dauer des with-Blocks als Span `name`.
+
+        Args:
+            name (str): Span-Name, z.B. 'controller.parse' oder 'model.scene'
+            exclusive (bool): Dauer aus allen umschließenden Spans des Kontexts
+                herausrechnen (Wartezeit auf den Spieler)
+        """
+        if not self.enabled:
+            yield
+            return
+
+        spans, frame, start = self._enter()
+        try:
+            yield
+        finally:
+            self._exit(name, spans, frame, start, exclusive)
+
+    def _enter(self):
+        spans = self._open_spans()
+        frame = [0.0]  # herausgerechnete Zeit verschachtelter exclusive Spans
+        spans.append(frame)
+        return spans, frame, time.perf_counter()
+
+    def _exit(self, name, spans, frame, start, exclusive=False):
+        elapsed = time.perf_counter() - start
+        # per Identität, list.remove würde gleiche Frames verwechseln
+        for i in range(len(spans) - 1, -1, -1):
+            if spans[i] is frame:
+                del spans[i]
+                break
+        self.histogram(name).observe(elapsed - frame[0])
+        if exclusive:
+            for outer in spans:
+                outer[0] += elapsed
+
+    def timed(self, name):
+        """
+        Decorator: jeder Aufruf ist ein Span `name`.
+
+        Coroutinen werden nur gemessen, nicht in die offenen Spans
+        eingetragen (parallele Tasks würden sich sonst gegenseitig stören).
+        """
+        def decorator(fn):
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    if not self.enabled:
+                        return await fn(*args, **kwargs)
+                    start = time.perf_counter()
+                    try:
+                        return await fn(*args, **kwargs)
+                    finally:
+                        self.histogram(name).observe(time.perf_counter() - start)
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return fn(*args, **kwargs)
+                # ohne contextmanager, spart den Generator pro Aufruf
+                spans, frame, start = self._enter()
+                try:
+                    return fn(*args, **kwargs)
+                finally:
+                    self._exit(name, spans, frame, start)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+
+    def to_json(self):
+        """Alle Histogramme als JSON-String (Sekunden)."""
+        return json.dumps(
+            {name: histogram.snapshot() for name, histogram in sorted(self.histograms.items())},
+            indent=2,
+        )
+
+    def to_prometheus(self):
+        """Alle Histogramme als eine Prometheus-Metrik mit Label span."""
+        lines = [
+            '# HELP ragventure_span_seconds Dauer von State-Handlern und Model-, Parser- und Embedding-Aufrufen',
+            '# TYPE ragventure_span_seconds histogram',
+        ]
+        for name, histogram in sorted(self.histograms.items()):
+            snapshot = histogram.snapshot()
+            for le, n in snapshot['buckets'].items():
+                lines.append(f'ragventure_span_seconds_bucket{{span="{name}",le="{le}"}} {n}')
+            lines.append(f'ragventure_span_seconds_sum{{span="{name}"}} {snapshot["sum"]}')
+            lines.append(f'ragventure_span_seconds_count{{span="{name}"}} {snapshot["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """Schreibt die Histogramme, .json als JSON, sonst im Prometheus-Format."""
+        content = self.to_json() if path.endswith('.json') else self.to_prometheus()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def format(self):
+        """Kurze Text-Tabelle (Anzahl, Mittelwert, p50/p95/p99 in ms)."""
+        lines = [f"{'Span':<32}{'Anzahl':>8}{'Ø ms':>10}{'p50':>9}{'p95':>9}{'p99':>9}"]
+        for name, histogram in sorted(self.histograms.items()):
+            s = histogram.snapshot()
+            if not s['count']:
+                continue
+            quantiles = ''.join(f"{s[q] * 1000:>9.2f}" if s[q] != float('inf') else f"{'>10s':>9}"
+                                for q in ('p50', 'p95', 'p99'))
+            lines.append(f"{name:<32}{s['count']:>8}{s['sum'] / s['count'] * 1000:>10.2f}{quantiles}")
+        return '\n'.join(lines)
+
+
+# Prozessweite Registry, wie EmbeddingUtils ein Singleton
+METRICS = Metrics()
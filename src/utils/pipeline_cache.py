@@ -0,0 +1,94 @@
+"""
+Ergebnis-Cache für die komplette Eingabe-Pipeline (Parse + Match).
+
+Spieler wiederholen sich ständig ("nimm fackel", "geh zum marktplatz").
+Solange sich die Welt nicht geändert hat, führt dieselbe Eingabe zum
+selben Ergebnis - spaCy, Encodes und Szenen-Read können dann entfallen.
+Der Key enthält die Szenen-Version des GameModels (Location + Zähler
+für Take/Drop), die sich bei jeder Mutation ändert. Einträge einer
+veralteten Version werden nie mehr getroffen und fallen per LRU raus.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+
+import model.game_state as gs
+
+
+def normalize_input(text):
+    """Kleinschreibung und einfache Leerzeichen ("Nimm  Fackel " → "nimm fackel")."""
+    return ' '.join(text.lower().split())
+
+
+class PipelineCache:
+    """
+    LRU-Cache (normalisierte Eingabe, Szenen-Version) → (Parse, Action).
+
+    Gespeichert wird der Zustand nach MATCH: eine aufgelöste Action oder
+    die Auswahl-Listen (good_commands / good_targets) für REQUEST.
+    """
+
+    def __init__(self, max_entries=None):
+        """
+        Args:
+            max_entries (int | None): Maximale Einträge, Default aus
+                PIPELINE_CACHE_SIZE (256)
+        """
+        self.max_entries = int(max_entries or os.getenv('PIPELINE_CACHE_SIZE') or 256)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, text, version):
+        """
+        Sucht das Ergebnis einer Eingabe.
+
+        Args:
+            text (str): Roh-Eingabe
+            version (tuple): Aktuelle Szenen-Version (GameModel.scene_version)
+
+        Returns:
+            tuple[gs.Parse, gs.Action] | None: Kopien oder None bei Miss
+        """
+        key = (normalize_input(text), version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        parse, action = entry
+        return self._copy(parse, action, input=text)
+
+    def put(self, text, version, parse, action):
+        """
+        Legt das Ergebnis von MATCH ab.
+
+        Args:
+            text (str): Roh-Eingabe
+            version (tuple): Szenen-Version vor dem Szenen-Read in MATCH
+            parse (gs.Parse): Verb, Noun und Auswahl-Listen
+            action (gs.Action): Aufgelöster Command und/oder Target
+        """
+        key = (normalize_input(text), version)
+        entry = self._copy(parse, action, input=None)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    @staticmethod
+    def _copy(parse, action, input):
+        """Flache Kopien, damit der Controller die Einträge nicht verändert."""
+        parse = replace(
+            parse, input=input,
+            good_commands=list(parse.good_commands),
+            good_targets=list(parse.good_targets),
+        )
+        return parse, gs.Action(command=action.command, target=action.target)
@@ -0,0 +1,112 @@
+"""
+Regel-/Lexikon-Parser als schnelle erste Stufe vor spaCy.
+
+Die meisten Spieleingaben sind kurze Imperative ("nimm die Fackel",
+"leg den Schlüssel ab"). Die lassen sich ohne NLP-Model über ein Lexikon
+der Template-Verben und der Entity-Namen auflösen.
+"""
+
+import re
+
+# Wörter die nie Verb oder Noun sind
+STOPWORDS = {
+    'der', 'die', 'das', 'den', 'dem', 'des', 'ein', 'eine', 'einen', 'einem', 'einer',
+    'zu', 'zum', 'zur', 'in', 'im', 'ins', 'an', 'am', 'auf', 'nach', 'mit', 'von', 'vom',
+    'und', 'oder', 'bitte', 'mal', 'doch', 'jetzt', 'dann', 'ich', 'du', 'mir', 'mich',
+}
+
+TOKEN_PATTERN = re.compile(r"[\wäöüÄÖÜß'-]+")
+
+
+class RuleParser:
+    """
+    Lexikon-Parser: Template-Verben → Verb, Entity-Namen → Noun.
+
+    Ein Ergebnis gilt als sicher, wenn sowohl Verb als auch Noun im
+    Lexikon gefunden wurden. Sonst entscheidet die nächste Parser-Stufe.
+    """
+
+    def __init__(self, templates):
+
+        # "leg ab" → ('leg', 'ab'), "nimm" → ('nimm', None)
+        self.verbs = {}
+        for template in templates:
+            for form in template.verbs:
+                words = form.lower().split()
+                self.verbs[(words[0], words[1] if len(words) > 1 else None)] = form
+        self.verb_heads = {head for head, _ in self.verbs}
+
+        self.entity_words = set()
+
+    def set_entity_names(self, names):
+        """
+        Baut das Noun-Lexikon aus Entity-Namen (z.B. "Flackernde Fackel").
+
+        Args:
+            names (list[str]): Entity-Namen und/oder IDs
+        """
+        words = set()
+        for name in names:
+            for word in TOKEN_PATTERN.findall(name.lower()):
+                word = word.removesuffix("'s")
+                if len(word) > 2 and word not in STOPWORDS:
+                    words.add(word)
+        self.entity_words = words
+
+    def is_known_verb(self, verb):
+        """Prüft ob ein (gelemmatisierter) Verb-String im Lexikon steht."""
+        if not verb:
+            return False
+        words = verb.lower().split()
+        return words[-1] in self.verb_heads or words[0] in self.verb_heads
+
+    def is_known_noun(self, noun):
+        """Prüft ob ein Noun im Entity-Lexikon steht."""
+        return bool(noun) and noun.lower() in self.entity_words
+
+    def parse(self, input_text):
+        """
+        Parst einen Imperativ über die Lexika.
+
+        Args:
+            input_text (str): User-Input
+
+        Returns:
+            tuple[dict, bool]: ({verb, noun, adjects, raw}, sicher)
+        """
+        result = {'verb': None, 'noun': None, 'adjects': None, 'raw': input_text}
+        tokens = TOKEN_PATTERN.findall(input_text)
+        lower = [t.lower() for t in tokens]
+
+        # Verb: erstes Token das ein Template-Verb beginnt, Partikel/Zweitwort
+        # darf irgendwo dahinter stehen ("leg die Fackel ab")
+        verb_at = None
+        for i, word in enumerate(lower):
+            if word not in self.verb_heads:
+                continue
+            for rest in reversed(lower[i + 1:]):
+                if (word, rest) in self.verbs:
+                    result['verb'] = self.verbs[(word, rest)]
+                    break
+            else:
+                result['verb'] = self.verbs.get((word, None))
+            if result['verb']:
+                verb_at = i
+                break
+
+        # Noun: letztes Token aus dem Entity-Lexikon (wie spaCy: letztes NOUN)
+        known_noun = False
+        for i in reversed(range(len(tokens))):
+            if i != verb_at and lower[i] in self.entity_words:
+                result['noun'] = tokens[i]
+                known_noun = True
+                break
+
+        # Fallback: großgeschriebenes Wort (deutsche Nomen) - nicht sicher
+        if result['noun'] is None:
+            for i in reversed(range(len(tokens))):
+                if i != verb_at and tokens[i][:1].isupper() and lower[i] not in STOPWORDS:
+                    result['noun'] = tokens[i]
+                    break
+
+        return result, bool(result['verb']) and known_noun
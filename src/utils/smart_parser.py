@@ -2,33 +2,119 @@
 spaCy-basierter NLP Parser für deutsche Texteingaben.
 
 Extrahiert Verb und Noun aus natürlicher Sprache für Command-Matching.
-Nutzt de_dep_news_trf Model (Transformer-basiert).
+Arbeitet als Kaskade: zuerst Regel-/Lexikon-Parser, dann das kleine
+spaCy Model (de_core_news_sm), erst zuletzt der Transformer
+(de_dep_news_trf). Die Reihenfolge ist über PARSER_TIERS einstellbar.
 """
 
-import spacy
+import os
+import time
 import logging
+import threading
 from dotenv import load_dotenv
 
+from model.command_templates import COMMAND_TEMPLATES
+from utils.rule_parser import RuleParser
+from utils.metrics import METRICS
+
+logger = logging.getLogger(__name__)
+
 load_dotenv(dotenv_path='../.env')
 
+# Parser-Stufen → spaCy Model (rule braucht keins)
+SPACY_MODELS = {
+    'sm': 'de_core_news_sm',
+    'trf': 'de_dep_news_trf',
+}
+
+DEFAULT_TIERS = 'rule,sm,trf'
+
+# Token-Attribute die _extract() liest (children kommt vom Parser über dep).
+# token.tag, weil der attribute_ruler der deutschen Models POS aus TAG mappt.
+REQUIRED_ATTRS = {'token.pos', 'token.dep', 'token.lemma', 'token.tag'}
+
+
 class SmartParserUtils:
     """
     NLP Parser für User-Input.
 
-    Lädt spaCy Model (de_dep_news_trf) und extrahiert ROOT-Verb und
-    erstes NOUN aus Sätzen. Loggt zu parser_debug.log.
+    Probiert die Parser-Stufen der Reihe nach und nimmt das erste sichere
+    Ergebnis. Die spaCy Models werden beim ersten Bedarf geladen (warm_up()
+    lädt alle vorab). Loggt Trefferquote und Latenz pro Stufe (DEBUG),
+    Tokens pro Eingabe nur mit LOG_LEVELS=utils.smart_parser=DEBUG.
     """
 
-    def __init__(self):
+    def __init__(self, tiers=None):
+
+        self.tiers = tiers or (os.getenv('PARSER_TIERS') or DEFAULT_TIERS).split(',')
+
+        self.rule_parser = RuleParser(COMMAND_TEMPLATES)
+        self._models = {}
+        self._models_lock = threading.Lock()
+
+        self.stats = {tier: {'docs': 0, 'hits': 0, 'seconds': 0.0} for tier in self.tiers}
+
+    @property
+    def parsing_model(self):
+        """Das Transformer-Model (letzte Stufe)."""
+        return self._model('trf')
+
+    def _model(self, tier):
+        """Lädt das (getrimmte) spaCy Model einer Stufe beim ersten Zugriff."""
+        if tier not in self._models:
+            with self._models_lock:
+                if tier not in self._models:
+                    # spaCy erst hier importieren - der Import allein kostet Sekunden
+                    import spacy
+
+                    nlp = spacy.load(SPACY_MODELS[tier])
+                    removed = self._trim_pipeline(nlp)
+                    logger.info("=== spaCy %s: %s (entfernt: %s) ===", SPACY_MODELS[tier], nlp.pipe_names, removed)
+                    self._models[tier] = nlp
+        return self._models[tier]
+
+    @staticmethod
+    def _trim_pipeline(nlp):
+        """
+        Entfernt alle Pipeline-Komponenten, die parse() nicht braucht.
+
+        Behalten wird was laut Pipe-Metadaten (assigns/requires) eines der
+        REQUIRED_ATTRS setzt, transitiv dessen Voraussetzungen, die
+        Embedding-Komponenten (tok2vec/transformer) auf die eine behaltene
+        Komponente hört, und Komponenten ohne Metadaten (z.B. attribute_ruler).
 
-        self.parsing_model = spacy.load("de_dep_news_trf")
+        Returns:
+            list[str]: Namen der entfernten Komponenten
+        """
+        needed = set(REQUIRED_ATTRS)
+        keep = set()
+        changed = True
+        while changed:
+            changed = False
+            for name in nlp.pipe_names:
+                if name in keep:
+                    continue
+                meta = nlp.get_pipe_meta(name)
+                if not meta.assigns or needed & set(meta.assigns):
+                    keep.add(name)
+                    needed |= set(meta.requires)
+                    changed = True
 
-        logging.basicConfig(
-            filename='parser_debug.log',
-            level=logging.INFO,
-            format='%(asctime)s - %(message)s'
-        )
+        for name in nlp.pipe_names:
+            listeners = getattr(nlp.get_pipe(name), 'listening_components', [])
+            if keep & set(listeners):
+                keep.add(name)
 
+        removed = [name for name in nlp.pipe_names if name not in keep]
+        for name in removed:
+            nlp.remove_pipe(name)
+        return removed
+
+    def set_entity_names(self, names):
+        """Gibt dem Regel-Parser die Namen aller Entities der Welt."""
+        self.rule_parser.set_entity_names(names)
+
+    @METRICS.timed('parser.parse')
     def parse(self, input_text):
         """
         Parst User-Input zu Verb und Noun.
@@ -42,13 +128,90 @@ class SmartParserUtils:
                 - noun: Erstes gefundenes NOUN
                 - raw: Original-Input
         """
-        if not input_text or not input_text.strip():
-            return [{'verb': None, 'noun': None, 'adjects': None, 'raw': input_text}]
-    
-        input_syntax = self.parsing_model(input_text)
+        return self.parse_many([input_text], batch_size=1, n_process=1)[:1]
 
+    @METRICS.timed('parser.parse_many')
+    def parse_many(self, texts, batch_size=None, n_process=None):
+        """
+        Parst viele Eingaben auf einmal (Replay, Server).
+
+        Jede Stufe bekommt nur die Texte, bei denen die vorherige Stufe
+        unsicher war; die spaCy-Stufen laufen über nlp.pipe.
+
+        Args:
+            texts (list[str]): User-Inputs
+            batch_size (int): Texte pro nlp.pipe Batch (Default: PARSER_BATCH_SIZE)
+            n_process (int): Prozesse für nlp.pipe (Default: PARSER_N_PROCESS)
+
+        Returns:
+            list[dict]: Ein {verb, noun, adjects, raw} pro Text, gleiche Reihenfolge
+        """
+        batch_size = batch_size or int(os.getenv('PARSER_BATCH_SIZE') or 32)
+        n_process = n_process or int(os.getenv('PARSER_N_PROCESS') or 1)
+
+        results = [
+            {'verb': None, 'noun': None, 'adjects': None, 'raw': text}
+            for text in texts
+        ]
+        pending = [i for i, text in enumerate(texts) if text and text.strip()]
+
+        for n, tier in enumerate(self.tiers):
+            if not pending:
+                break
+
+            start = time.perf_counter()
+            parsed = self._parse_tier(tier, [texts[i] for i in pending], batch_size, n_process)
+            elapsed = time.perf_counter() - start
+
+            stats = self.stats[tier]
+            stats['docs'] += len(pending)
+            stats['seconds'] += elapsed
+
+            # Letzte Stufe nimmt was sie hat
+            unsure = []
+            for i, (result, confident) in zip(pending, parsed):
+                if confident or n == len(self.tiers) - 1:
+                    results[i] = result
+                    stats['hits'] += 1
+                else:
+                    unsure.append(i)
+
+            logger.debug("=== Parser Tier: %s (%s/%s in %.1f ms) ===", tier, len(pending) - len(unsure), len(pending), elapsed * 1000)
+            pending = unsure
+
+        logger.debug("=== Parsing Output: %s ===", results)
+        return results
+
+    def _parse_tier(self, tier, texts, batch_size, n_process):
+        """
+        Führt eine Parser-Stufe für mehrere Texte aus.
+
+        Returns:
+            list[tuple[dict, bool]]: (Ergebnis, sicher) pro Text
+        """
+        if tier == 'rule':
+            return [self.rule_parser.parse(text) for text in texts]
+
+        docs = self._model(tier).pipe(texts, batch_size=batch_size, n_process=n_process)
+        parsed = []
+        for text, doc in zip(texts, docs):
+            results = self._extract(doc, text)
+            found = bool(results['verb']) and bool(results['noun'])
+
+            # Das kleine Model verwechselt gern Verb/Noun - nur akzeptieren,
+            # wenn wenigstens eins davon im Lexikon steht
+            if tier != 'trf':
+                found = found and (
+                    self.rule_parser.is_known_verb(results['verb'])
+                    or self.rule_parser.is_known_noun(results['noun'])
+                )
+            parsed.append((results, found))
+        return parsed
+
+    def _extract(self, input_syntax, input_text):
+        """Extrahiert ROOT-Verb (mit Partikeln) und NOUN aus einem spaCy Doc."""
         verb = []
-        
+
         results = {
             'verb': None,
             'noun': None,
@@ -56,10 +219,12 @@ class SmartParserUtils:
             'raw': input_text
         }
 
-        # Detailliertes Logging des Spacy Doc
-        logging.info(f"=== Parsing Input: '{input_text}' ===")
-        for token in input_syntax:
-            logging.info(f"  Token: '{token.text:15}' | POS: {token.pos_:8} | DEP: {token.dep_:10} | Lemma: {token.lemma_:15} | Head: {token.head.text}")
+        # Detailliertes Logging des Spacy Doc, nur wenn DEBUG an ist
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("=== Parsing Input: '%s' ===", input_text)
+            for token in input_syntax:
+                logger.debug("  Token: '%-15s' | POS: %-8s | DEP: %-10s | Lemma: %-15s | Head: %s",
+                             token.text, token.pos_, token.dep_, token.lemma_, token.head.text)
 
         # Command bauen
         for token in input_syntax:
@@ -67,7 +232,7 @@ class SmartParserUtils:
             # Hauptverb finden
             if token.dep_ == "ROOT" and token.pos_ == "VERB":
                 verb = [token.lemma_]
-        
+
                 for child in token.children:
                     if child.dep_ in ['oc', 'svp']:
                         verb.insert(0, child.lemma_)
@@ -77,7 +242,34 @@ class SmartParserUtils:
                 results['noun'] = token.text
 
         results['verb'] = ' '.join(verb) or None
-        
-        logging.info(f"=== Parsing Output: {results} ===")
-        return [results]
- 
\ No newline at end of file
+        return results
+
+    def tier_stats(self):
+        """
+        Trefferquote und mittlere Latenz pro Parser-Stufe.
+
+        Returns:
+            dict: tier → {docs, hits, hit_rate, share, avg_ms (pro Dokument)}
+                - hit_rate: hits / docs, Anteil der Eingaben, die die Stufe
+                  erreicht und sicher aufgelöst hat
+                - share: Anteil der Stufe an allen aufgelösten Eingaben
+        """
+        total = sum(s['hits'] for s in self.stats.values()) or 1
+        return {
+            tier: {
+                'docs': s['docs'],
+                'hits': s['hits'],
+                'hit_rate': s['hits'] / s['docs'] if s['docs'] else 0.0,
+                'share': s['hits'] / total,
+                'avg_ms': s['seconds'] / s['docs'] * 1000 if s['docs'] else 0.0,
+            }
+            for tier, s in self.stats.items()
+        }
+
+    def warm_up(self):
+        """Lädt alle Stufen und parst einmal, damit der erste echte Befehl keinen First-Call-Overhead zahlt."""
+        for tier in self.tiers:
+            if tier in SPACY_MODELS:
+                self._model(tier)('nimm die Fackel')
+        self.parse('nimm die Fackel')
+        logger.info("=== Parser Tiers: %s ===", self.tier_stats())
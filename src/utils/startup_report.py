@@ -0,0 +1,66 @@
+"""
+Messung der Startup-Phasen.
+
+Sammelt die Dauer jeder Phase (Imports, DB warm-up, Model-Loading im
+Hintergrund, Warten auf den Spieler, ...) und gibt sie für
+--startup-report als Tabelle aus.
+"""
+
+import time
+import threading
+from contextlib import contextmanager
+
+
+class StartupReport:
+    """
+    Thread-safe Sammlung von (Phase, Thread, Start, Dauer).
+
+    Phasen aus Hintergrund-Threads überlappen sich mit dem Haupt-Thread,
+    deshalb wird neben der Dauer auch der Start relativ zu t0 gezeigt.
+    """
+
+    def __init__(self):
+        self.t0 = time.perf_counter()
+        self.phases = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name, waiting=False):
+        """
+        Misst die Dauer des with-Blocks als Phase `name`.
+
+        Args:
+            name (str): Phasen-Name
+            waiting (bool): Phase wartet auf den Spieler (z.B. Welcome-Screen)
+                und zählt nicht zur Startup-Zeit
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter(), waiting)
+
+    def add(self, name, start, end, waiting=False):
+        """Trägt eine bereits gemessene Phase nach."""
+        with self._lock:
+            self.phases.append((
+                name, threading.current_thread().name, start - self.t0, end - start, waiting
+            ))
+
+    def format(self):
+        """Gibt den Report als Text-Tabelle zurück."""
+        lines = [f"{'Phase':<32}{'Thread':<16}{'Start (s)':>10}{'Dauer (s)':>11}"]
+        with self._lock:
+            phases = sorted(self.phases, key=lambda p: p[2])
+        for name, thread, start, duration, waiting in phases:
+            name = f'{name} *' if waiting else name
+            lines.append(f"{name:<32}{thread[:15]:<16}{start:>10.3f}{duration:>11.3f}")
+        lines.append(f"{'Startup ohne Wartezeit (*)':<48}{self.startup_time():>21.3f}")
+        return '\n'.join(lines)
+
+    def startup_time(self):
+        """Zeit bis zum ersten Prompt abzüglich der Wartezeit auf den Spieler."""
+        with self._lock:
+            end = max((p[2] + p[3] for p in self.phases), default=0.0)
+            waited = sum(p[3] for p in self.phases if p[4])
+        return end - waited
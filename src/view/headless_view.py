@@ -0,0 +1,72 @@
+"""
+Headless View für Replays und Benchmarks.
+
+Gleiche Schnittstelle wie GameView, aber ohne Terminal-Rendering:
+Inputs kommen aus einer Liste (z.B. Zeilen einer Replay-Datei), die
+Panel-Inhalte werden nur gemerkt.
+"""
+
+from model.game_state import DialogState
+
+
+class HeadlessView:
+    """
+    View-Ersatz ohne Rich.
+
+    get_input() liefert die nächste Zeile der Replay-Inputs, danach 'quit'.
+    update_*() merken den letzten Stand, refresh() tut nichts.
+    """
+
+    def __init__(self, inputs):
+        self.inputs = iter(inputs)
+        self.exhausted = False
+        self.last_input = None
+
+        self.location = []
+        self.items = []
+        self.exits = []
+        self.inventory = []
+        self.messages = []
+
+    @classmethod
+    def from_file(cls, path):
+        """
+        Liest Replay-Inputs aus einer Textdatei.
+
+        Eine Zeile = eine Eingabe (Befehl oder Auswahl für eine REQUEST-
+        Rückfrage). Leerzeilen und Zeilen mit '#' am Anfang werden übersprungen.
+        """
+        with open(path, encoding='utf-8') as f:
+            lines = [line.strip() for line in f]
+        return cls([line for line in lines if line and not line.startswith('#')])
+
+    def show_welcome(self):
+        pass
+
+    def update_location(self, location):
+        self.location = location
+
+    def update_items(self, items):
+        self.items = items
+
+    def update_exits(self, exits):
+        self.exits = exits
+
+    def update_inventory(self, inventory):
+        self.inventory = inventory
+
+    def update_dialog(self, dialog=None):
+        """Merkt Nachrichten und Rückfragen (nur wenn ein Dialog übergeben wird)."""
+        if dialog and dialog.type in (DialogState.MESSAGE, DialogState.REQUEST):
+            self.messages.append(dialog.message)
+
+    def refresh(self):
+        pass
+
+    def get_input(self):
+        """Nächste Replay-Zeile, 'quit' wenn alle Inputs verbraucht sind."""
+        self.last_input = next(self.inputs, None)
+        if self.last_input is None:
+            self.exhausted = True
+            self.last_input = 'quit'
+        return self.last_input
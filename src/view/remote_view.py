@@ -0,0 +1,115 @@
+"""
+Remote View für den GameServer.
+
+Gleiche Schnittstelle wie GameView, rendert die Panels aber als Klartext
+und schickt sie über die TCP-Verbindung einer Session. Der Game Loop
+läuft in einem eigenen Thread, Socket-I/O bleibt im asyncio Event Loop.
+"""
+
+import queue
+
+from model.game_state import DialogState
+
+
+class RemoteView:
+    """
+    View-Komponente einer Server-Session.
+
+    update_*() merken die Panels, refresh() schreibt sie als Text an den
+    Client. get_input() blockiert den Session-Thread, bis der Server eine
+    Zeile des Clients per feed() übergibt.
+    """
+
+    def __init__(self, loop, writer):
+        self.loop = loop
+        self.writer = writer
+        self.inputs = queue.Queue()
+        # Client weg: jede weitere Eingabe ist 'quit', get_input() blockiert nie wieder
+        self.closed = False
+
+        self.location = ''
+        self.items = ''
+        self.exits = ''
+        self.inventory = ''
+        self.dialog = '...'
+
+    def _send(self, text):
+        """Schreibt Text threadsafe über den Event Loop an den Client."""
+        if self.writer.is_closing():
+            return
+        self.loop.call_soon_threadsafe(self.writer.write, text.encode('utf-8'))
+
+    def feed(self, line):
+        """Übergibt eine Client-Zeile (None = Verbindung getrennt)."""
+        if line is None:
+            self.closed = True
+        self.inputs.put(line)
+
+    def show_welcome(self):
+        self._send('Willkommen beim RagVenture\n')
+
+    def update_location(self, location):
+        self.location = f"== {location[0]['name']} ==\n{location[0]['description']}"
+
+    def update_items(self, items):
+        if items:
+            self.items = 'Items: ' + ', '.join(item['name'] for item in items)
+        else:
+            self.items = 'Keine Gegenstände zu sehen'
+
+    def update_exits(self, exits):
+        if exits:
+            self.exits = 'Exits: ' + ', '.join(exit['name'] for exit in exits)
+        else:
+            self.exits = 'Keine Ausgänge zu sehen'
+
+    def update_inventory(self, inventory):
+        if inventory:
+            self.inventory = 'Inventar: ' + ', '.join(item['name'] for item in inventory)
+        else:
+            self.inventory = 'Nichts dabei'
+
+    def update_dialog(self, dialog=None):
+        """Wie GameView.update_dialog, Auswahlen nummeriert in einer Zeile."""
+        content = '...'
+
+        if dialog:
+            content = ''
+
+            if dialog.type == DialogState.MESSAGE:
+                content = dialog.message
+
+            elif dialog.type == DialogState.REQUEST:
+                choices = []
+                for i, choice in enumerate(dialog.choices, 1):
+                    if isinstance(choice, dict) and 'command' in choice:
+                        choices.append(f"({i}) {choice['command']}")
+                    elif isinstance(choice, dict) and 'name' in choice:
+                        choices.append(f"({i}) {choice['name']}")
+                    else:
+                        choices.append(f"({i}) {choice}")
+                choices.append('(0) abbrechen')
+                content = dialog.message + '\n' + ' | '.join(choices)
+
+        self.dialog = content
+
+    def refresh(self):
+        """Schickt alle Panels als Textblock an den Client."""
+        self._send('\n'.join([
+            '', self.location, self.items, self.exits, self.inventory, '', self.dialog, ''
+        ]))
+
+    def get_input(self):
+        """
+        Wartet auf die nächste Zeile des Clients.
+
+        Gibt 'quit' zurück, wenn die Verbindung getrennt wurde - bei jedem
+        weiteren Aufruf, nicht nur einmal (z.B. wenn der Controller nach
+        dem 'quit' noch auf eine Auswahl wartet).
+        """
+        # noch gepufferte Zeilen vor dem Trennen werden weiter abgearbeitet
+        if self.closed and self.inputs.empty():
+            return 'quit'
+        self._send('>>> ')
+        line = self.inputs.get()
+        return 'quit' if line is None else line
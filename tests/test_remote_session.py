@@ -0,0 +1,103 @@
+"""
+Server-Sessions: getrennte Verbindungen und ungültige Auswahlen.
+
+Aufruf (aus dem Repo-Root):
+    python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import model.game_state as gs
+from view.remote_view import RemoteView
+from controller.game_controller import GameController
+
+
+class FakeLoop:
+    def call_soon_threadsafe(self, fn, *args):
+        fn(*args)
+
+
+class FakeWriter:
+    def __init__(self):
+        self.sent = []
+
+    def is_closing(self):
+        return False
+
+    def write(self, data):
+        self.sent.append(data.decode('utf-8'))
+
+
+def request_controller(view):
+    """Controller im REQUEST-State mit zwei Targets zur Auswahl (ohne Models)."""
+    controller = GameController.__new__(GameController)
+    controller.view = view
+    controller.state = gs.GameState()
+    controller.state.running = True
+    controller.state.action.command = gs.ActionCommands.TAKE
+    controller.state.parse.good_targets = [
+        {'target': 'fackel', 'name': 'Fackel', 'sim': .9},
+        {'target': 'fass', 'name': 'Fass', 'sim': .8},
+    ]
+    controller.state.set_state(gs.LoopState.REQUEST)
+    return controller
+
+
+def run_with_timeout(fn, timeout=2):
+    """Führt fn in einem Thread aus, False wenn es blockiert."""
+    worker = threading.Thread(target=fn, daemon=True)
+    worker.start()
+    worker.join(timeout)
+    return not worker.is_alive()
+
+
+class DisconnectTest(unittest.TestCase):
+
+    def test_disconnect_during_choice_ends_session(self):
+        view = RemoteView(FakeLoop(), FakeWriter())
+        controller = request_controller(view)
+        view.feed(None)
+
+        def session():
+            while controller.state.running:
+                controller._step()
+
+        self.assertTrue(run_with_timeout(session), 'Session-Thread blockiert nach Disconnect')
+        self.assertEqual(controller.state.loop_state, gs.LoopState.PARSE)
+
+    def test_disconnect_is_sticky(self):
+        view = RemoteView(FakeLoop(), FakeWriter())
+        view.feed('nimm fackel')
+        view.feed(None)
+
+        inputs = []
+        self.assertTrue(run_with_timeout(lambda: inputs.extend(view.get_input() for _ in range(3))))
+        self.assertEqual(inputs, ['nimm fackel', 'quit', 'quit'])
+
+
+class ChoiceTest(unittest.TestCase):
+
+    def test_out_of_range_choice_reprompts(self):
+        writer = FakeWriter()
+        view = RemoteView(FakeLoop(), writer)
+        controller = request_controller(view)
+        for line in ('9', '-1', '2'):
+            view.feed(line)
+
+        def until_action():
+            while controller.state.loop_state == gs.LoopState.REQUEST:
+                controller._step()
+
+        self.assertTrue(run_with_timeout(until_action))
+        self.assertEqual(controller.state.loop_state, gs.LoopState.ACTION)
+        self.assertEqual(controller.state.action.target, 'fass')
+        self.assertEqual(sum('Bitte Zahl eingeben' in text for text in writer.sent), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
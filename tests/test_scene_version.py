@@ -0,0 +1,79 @@
+"""
+Szenen-Version: ein Read während eines Writes darf nicht als aktuell gelten.
+
+Aufruf (aus dem Repo-Root):
+    python -m unittest discover -s tests
+"""
+
+import os
+import sys
+import threading
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import model.game_state as gs
+from model.world_model import GameModel
+from utils.pipeline_cache import PipelineCache
+
+
+class BlockingBackend:
+    """Backend, dessen take_item() wartet, bis der Test es freigibt."""
+
+    def __init__(self):
+        self.items = [{'id': 'fackel', 'name': 'Fackel'}]
+        self.write_started = threading.Event()
+        self.release_write = threading.Event()
+
+    def scene(self, player_id):
+        return {
+            'location': [{'id': 'taverne', 'name': 'Taverne', 'description': ''}],
+            'items': list(self.items),
+            'exits': [],
+            'inventory': [],
+        }
+
+    def take_item(self, player_id, item):
+        self.write_started.set()
+        self.release_write.wait(2)
+        self.items = []
+        return {'item': [{'id': item, 'name': 'Fackel'}], 'items': [], 'inventory': []}
+
+
+class SceneVersionTest(unittest.TestCase):
+
+    def test_read_during_write_is_invalidated(self):
+        backend = BlockingBackend()
+        model = GameModel(backend)
+        model.scene()
+
+        writer = threading.Thread(target=model.take_item, args=('fackel',))
+        writer.start()
+        self.assertTrue(backend.write_started.wait(2))
+
+        # paralleler Reader (Prefetcher, andere Session) während des Writes
+        version = model.scene_version
+        stale = model.scene()
+        cache = PipelineCache()
+        cache.put('nimm fackel', version, gs.Parse(verb='nimm', noun='fackel'),
+                  gs.Action(command=gs.ActionCommands.TAKE, target='fackel'))
+
+        backend.release_write.set()
+        writer.join(2)
+
+        self.assertEqual(stale['items'][0]['id'], 'fackel')
+        self.assertNotEqual(model.scene_version, version)
+        self.assertIsNone(cache.get('nimm fackel', model.scene_version))
+
+    def test_failed_write_still_invalidates(self):
+        model = GameModel(BlockingBackend())
+        model.backend.take_item = lambda player_id, item: 1 / 0
+        version = model.scene_version
+
+        with self.assertRaises(ZeroDivisionError):
+            model.take_item('fackel')
+        self.assertNotEqual(model.scene_version, version)
+
+
+if __name__ == '__main__':
+    unittest.main()